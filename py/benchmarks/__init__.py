@@ -0,0 +1 @@
+"""Snake Game Benchmarks Package."""
@@ -0,0 +1,448 @@
+"""Benchmarks for the engine, the Python interface and the training loop.
+
+Three groups of benchmarks are run and written to a single JSON file:
+
+* ``engine.*`` - C++ microbenchmarks from the ``snake_benchmark`` executable
+  (steps/sec for several board sizes and snake lengths), if it has been built.
+* ``python.*`` - Python-level hot paths on fixed, seeded scenarios.
+* ``training.*`` - an end-to-end timing of a single training generation.
+
+Passing ``--baseline`` compares the new results with a previous run and exits
+with a non-zero status if any benchmark got slower than ``--threshold``.
+Games are reset with a fixed seed, so scenarios that play the game place the
+same food on every run.
+"""
+
+import argparse
+import json
+import mmap
+import platform
+import random
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+current_file_path = Path(__file__).resolve()
+project_root = current_file_path.parent.parent.parent
+for path in (project_root, project_root / "py" / "interface"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import numpy as np  # noqa: E402, I001
+import posix_ipc  # noqa: E402
+from heuristicController import SnakeHeuristicAI  # noqa: E402
+from SnakeGameController import Direction, FoodType, GameState, SnakeGameController, SnakeGameData  # noqa: E402
+
+from py import snake_lib as snakelib  # noqa: E402
+from py.training.config import Config  # noqa: E402
+from py.training.neural import Neural  # noqa: E402
+from py.training.worker import Worker  # noqa: E402
+
+SEED = 1234
+ENGINE_BENCHMARK = project_root / "build" / "src" / "benchmarks" / "snake_benchmark"
+BENCHMARK_SHM_NAME = "/snake_game_benchmark_shm"
+
+BENCHMARK_FRAME_HISTORY = 8
+# Offsets of the frame fields and of the body as laid out by the engine.
+SHM_FIELD_OFFSETS = (0, 4, 6, 8, 10, 11, 12, 16, 18, 24, 28, 32, 80, 84)
+SHM_FRAMES_OFFSET = 4096
+
+
+def measure(name, operation, min_time, repeat=5):
+    """Time an operation and return its best per-call time over several rounds.
+
+    The number of calls per round is calibrated so that every round takes at
+    least ``min_time / repeat`` seconds.
+
+    Args:
+        name (str): Benchmark name.
+        operation (callable): Function called without arguments.
+        min_time (float): Approximate total time to spend measuring, in seconds.
+        repeat (int): Number of measured rounds.
+
+    Returns:
+        dict: Benchmark result with ``seconds_per_op`` and ``ops_per_sec``.
+
+    """
+    round_time = min_time / repeat
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_time:
+            break
+        calls *= 2
+
+    best = elapsed / calls
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        best = min(best, (time.perf_counter() - start) / calls)
+
+    return {"name": name, "operations": calls, "seconds_per_op": best, "ops_per_sec": 1.0 / best}
+
+
+def serpentine_body(width, height, length):
+    """Build a snake body laid out row by row in a serpentine, head first.
+
+    Args:
+        width (int): Board width.
+        height (int): Board height.
+        length (int): Snake length, at most ``width * height``.
+
+    Returns:
+        list: Body coordinates, head first.
+
+    """
+    cells = [(x if y % 2 == 0 else width - 1 - x, y) for y in range(height) for x in range(width)]
+    return cells[:length][::-1]
+
+
+def make_game_data(width, height, length, rng):
+    """Build a seeded game snapshot for the heuristic controller.
+
+    Args:
+        width (int): Board width.
+        height (int): Board height.
+        length (int): Snake length.
+        rng (random.Random): Seeded random generator used to place the food.
+
+    Returns:
+        SnakeGameData: A playing game snapshot.
+
+    """
+    body = serpentine_body(width, height, length)
+    occupied = set(body)
+    free = [(x, y) for y in range(height) for x in range(width) if (x, y) not in occupied]
+    head = body[0]
+    direction = Direction.RIGHT if len(body) < 2 or head[0] > body[1][0] else Direction.LEFT
+    if len(body) > 1 and head[1] != body[1][1]:
+        direction = Direction.DOWN
+
+    return SnakeGameData(
+        version=1,
+        board_width=width,
+        board_height=height,
+        score=(length - 3) * 10,
+        speed=1,
+        game_state=GameState.PLAYING,
+        food_position=rng.choice(free),
+        food_type=FoodType.APPLE,
+        snake_head=head,
+        snake_length=length,
+        tick=0,
+        snake_body=body,
+        neural_vector=[0.0] * 12,
+        snake_direction=direction,
+    )
+
+
+def shm_frame_size(width, height):
+    """Bytes of a frame slot sized for a board, as laid out by the engine.
+
+    Args:
+        width (int): Board width.
+        height (int): Board height.
+
+    Returns:
+        int: Distance between two frame slots.
+
+    """
+    return (SHM_FIELD_OFFSETS[-1] + 4 * width * height + 3) // 4 * 4
+
+
+def write_shm_header(memory, width, height, capacity=BENCHMARK_FRAME_HISTORY):
+    """Write the header of a shared memory region whose frames are sized for a board.
+
+    Args:
+        memory (mmap.mmap): Mapped shared memory region.
+        width (int): Board width.
+        height (int): Board height.
+        capacity (int): Number of slots in the ring.
+
+    """
+    layout = SnakeGameController
+    frame_size = shm_frame_size(width, height)
+    header_size = (layout.SHM_HEADER.size + 2 * len(SHM_FIELD_OFFSETS) + 7) // 8 * 8
+    layout.SHM_HEADER.pack_into(
+        memory,
+        0,
+        layout.SHM_MAGIC,
+        layout.LAYOUT_VERSION,
+        header_size,
+        0,
+        0,
+        SHM_FRAMES_OFFSET + capacity * frame_size,
+        header_size,
+        SHM_FRAMES_OFFSET,
+        capacity,
+        frame_size,
+        width * height,
+        0,
+        width,
+        height,
+        len(SHM_FIELD_OFFSETS),
+    )
+    struct.pack_into(f"<{len(SHM_FIELD_OFFSETS)}H", memory, layout.SHM_HEADER.size, *SHM_FIELD_OFFSETS)
+
+
+def write_shm_frame(memory, data, capacity=BENCHMARK_FRAME_HISTORY):
+    """Publish a game snapshot as the newest frame of a shared memory ring using the engine's layout.
+
+    Args:
+        memory (mmap.mmap): Mapped shared memory region with a header written by ``write_shm_header``.
+        data (SnakeGameData): Snapshot to write; its version selects the ring slot.
+        capacity (int): Number of slots in the ring.
+
+    """
+    layout = SnakeGameController
+    offset = SHM_FRAMES_OFFSET + (data.version % capacity) * shm_frame_size(data.board_width, data.board_height)
+    struct.pack_into(
+        "<IHHHBBHHBxHHxxII12fB",
+        memory,
+        offset,
+        data.version,
+        data.board_width,
+        data.board_height,
+        data.score,
+        data.speed,
+        data.game_state,
+        *data.food_position,
+        data.food_type,
+        *data.snake_head,
+        data.snake_length,
+        data.tick,
+        *data.neural_vector,
+        data.snake_direction,
+    )
+    body = [coordinate for segment in data.snake_body for coordinate in segment]
+    struct.pack_into(f"<{len(body)}H", memory, offset + SHM_FIELD_OFFSETS[-1], *body)
+    layout.SHM_COUNTERS.pack_into(memory, layout.SHM_COUNTERS_OFFSET, 0, data.version)
+
+
+def run_engine_benchmarks(executable, steps):
+    """Run the C++ engine microbenchmarks.
+
+    Args:
+        executable (Path): Path to the ``snake_benchmark`` executable.
+        steps (int): Maximum operations per engine benchmark.
+
+    Returns:
+        list: Benchmark results, or an empty list if the executable is missing.
+
+    """
+    if not executable.exists():
+        print(f"Skipping engine benchmarks: {executable} not found (build the project first).")
+        return []
+
+    output = subprocess.run(  # noqa: S603
+        [str(executable), "--steps", str(steps)], check=True, capture_output=True, text=True
+    )
+    return json.loads(output.stdout)
+
+
+def bench_step_game(min_time):
+    game = snakelib.Game(20, 20, ipc=False)
+    game.reset(SEED)
+    rng = random.Random(SEED)
+    directions = [snakelib.Direction.UP, snakelib.Direction.DOWN, snakelib.Direction.LEFT, snakelib.Direction.RIGHT]
+    moves = [rng.choice(directions) for _ in range(4096)]
+    state = {"move": 0}
+
+    def step():
+        result = game.step_game(moves[state["move"]])
+        state["move"] = (state["move"] + 1) % len(moves)
+        if result.is_game_over:
+            game.reset(SEED)
+
+    return measure("python.step_game[20x20]", step, min_time)
+
+
+def bench_snapshot(min_time):
+    game = snakelib.Game(20, 20, ipc=False)
+    game.reset(SEED)
+    snapshot = game.snapshot()
+
+    def round_trip():
+        game.snapshot_into(snapshot)
+        game.restore(snapshot)
+
+    return [
+        measure("python.snapshot_restore[20x20]", round_trip, min_time),
+        measure("python.clone[20x20]", game.clone, min_time),
+    ]
+
+
+def bench_neural(min_time):
+    random.seed(SEED)
+    np.random.seed(SEED)
+    config = Config()
+    first = Neural(config.INPUT_SIZE, config.HIDDEN_SIZE, config.OUTPUT_SIZE, config.WEIGHT_RANGE)
+    second = Neural(config.INPUT_SIZE, config.HIDDEN_SIZE, config.OUTPUT_SIZE, config.WEIGHT_RANGE)
+    inputs = [random.random() for _ in range(config.INPUT_SIZE)]
+
+    return [
+        measure("python.neural.predict", lambda: first.predict(inputs), min_time),
+        measure("python.neural.merge", lambda: first.merge(second), min_time),
+        measure(
+            "python.neural.merge_mutate",
+            lambda: first.merge(second).mutate(config.MUTATION_RATE, config.MUTATION_VARIANCE),
+            min_time,
+        ),
+    ]
+
+
+def bench_read_data(min_time):
+    data = make_game_data(20, 20, 150, random.Random(SEED))
+    size = SHM_FRAMES_OFFSET + BENCHMARK_FRAME_HISTORY * shm_frame_size(data.board_width, data.board_height)
+    shm = posix_ipc.SharedMemory(BENCHMARK_SHM_NAME, posix_ipc.O_CREAT, size=size)
+    try:
+        memory = mmap.mmap(shm.fd, size)
+        write_shm_header(memory, data.board_width, data.board_height)
+        for version in range(1, BENCHMARK_FRAME_HISTORY + 1):
+            data.version = version
+            write_shm_frame(memory, data)
+
+        controller = SnakeGameController(shm_name=BENCHMARK_SHM_NAME)
+        controller.memory = memory
+
+        def read():
+            controller.last_version = 0
+            controller.read_data()
+
+        def read_frames():
+            controller.read_frames(since_version=0)
+
+        results = [
+            measure("python.controller.read_data[len=150]", read, min_time),
+            measure(f"python.controller.read_frames[{BENCHMARK_FRAME_HISTORY}x len=150]", read_frames, min_time),
+        ]
+        memory.close()
+        return results
+    finally:
+        shm.close_fd()
+        shm.unlink()
+
+
+def bench_heuristic(min_time):
+    rng = random.Random(SEED)
+    results = []
+    for length in (5, 50, 150):
+        data = make_game_data(20, 20, length, rng)
+        ai = SnakeHeuristicAI()
+        name = f"python.heuristic.get_next_move[20x20,len={length}]"
+        results.append(measure(name, lambda ai=ai, data=data: ai.get_next_move(data), min_time))
+    return results
+
+
+def bench_generation(population, repeat):
+    config = Config()
+    best = None
+    for _ in range(repeat):
+        random.seed(SEED)
+        np.random.seed(SEED)
+        worker = Worker(config, pop_size=population, hidden_size=config.HIDDEN_SIZE)
+        start = time.perf_counter()
+        worker.run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        "name": f"training.generation[pop={population}]",
+        "operations": 1,
+        "seconds_per_op": best,
+        "ops_per_sec": 1.0 / best,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change of every benchmark against a baseline.
+
+    Args:
+        results (list): New benchmark results.
+        baseline (dict): Previously written benchmark file.
+        threshold (float): Relative slowdown above which a benchmark counts as a regression.
+
+    Returns:
+        int: Number of regressions.
+
+    """
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = 0
+
+    print(f"{'Benchmark':<48} {'Baseline':>12} {'Current':>12} {'Change':>8}")
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None:
+            print(f"{result['name']:<48} {'-':>12} {result['seconds_per_op'] * 1e6:>10.2f}us {'new':>8}")
+            continue
+
+        change = result["seconds_per_op"] / old["seconds_per_op"] - 1.0
+        marker = ""
+        if change > threshold:
+            regressions += 1
+            marker = "  REGRESSION"
+        print(
+            f"{result['name']:<48} {old['seconds_per_op'] * 1e6:>10.2f}us "
+            f"{result['seconds_per_op'] * 1e6:>10.2f}us {change:>+7.1%}{marker}"
+        )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the snake engine, interface and training benchmarks.")
+    parser.add_argument("--output", default="benchmark_results.json", help="file to write the results to")
+    parser.add_argument("--baseline", help="previous results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds spent on each Python benchmark")
+    parser.add_argument("--engine-steps", type=int, default=200_000, help="maximum operations per engine benchmark")
+    parser.add_argument("--engine-binary", default=str(ENGINE_BENCHMARK), help="path to the snake_benchmark executable")
+    parser.add_argument("--population", type=int, default=50, help="population size of the timed generation")
+    parser.add_argument("--skip-engine", action="store_true", help="do not run the C++ engine benchmarks")
+    parser.add_argument("--skip-training", action="store_true", help="do not time a training generation")
+    args = parser.parse_args()
+
+    results = []
+    if not args.skip_engine:
+        results.extend(run_engine_benchmarks(Path(args.engine_binary), args.engine_steps))
+
+    results.append(bench_step_game(args.min_time))
+    results.extend(bench_snapshot(args.min_time))
+    results.extend(bench_neural(args.min_time))
+    results.extend(bench_read_data(args.min_time))
+    results.extend(bench_heuristic(args.min_time))
+
+    if not args.skip_training:
+        results.append(bench_generation(args.population, repeat=3))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Wrote {len(results)} benchmark results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return 1 if compare(results, baseline, args.threshold) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,13 @@
 """Controller for interfacing with the C++ Snake Game engine via IPC."""
 
 import mmap
+import os
 import socket
 import struct
+import time
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import posix_ipc
 
@@ -51,6 +53,8 @@ class IpcCommands(IntEnum):
     RESTART_GAME = 6
     QUIT_GAME = 7
     CHANGE_BOARD_SIZE = 8
+    SET_TICK_RATE = 9
+    RETURN_TO_MENU = 10
 
 
 @dataclass
@@ -68,6 +72,7 @@ class SnakeGameData:
         food_type (FoodType): Type of the food item.
         snake_head (Tuple[int, int]): (x, y) coordinates of the snake's head.
         snake_length (int): Current length of the snake.
+        tick (int): Number of ticks simulated in the current game.
         snake_body (List[Tuple[int, int]]): List of (x, y) coordinates for body segments.
         neural_vector (List[int]): Sensor inputs for neural network.
         snake_direction (Direction): Current movement direction.
@@ -84,21 +89,124 @@ class SnakeGameData:
     food_type: FoodType
     snake_head: Tuple[int, int]
     snake_length: int
+    tick: int
     snake_body: List[Tuple[int, int]]
     neural_vector: List[int]
     snake_direction: Direction
 
 
+@dataclass
+class EngineStats:
+    """Engine health counters published after the game state in shared memory.
+
+    All counters are cumulative since the engine started.
+
+    Attributes:
+        ticks (int): Ticks simulated.
+        late_ticks (int): Ticks that finished after the next tick was due.
+        skipped_ticks (int): Tick deadlines the engine dropped without simulating them.
+        shm_writes (int): Frames written to shared memory.
+        commands_processed (int): Socket commands applied by the game loop.
+        commands_overwritten (int): Commands replaced by a newer one before being applied.
+        command_latency_total_us (int): Sum of receive-to-apply command latencies in microseconds.
+        command_latency_max_us (int): Largest receive-to-apply command latency in microseconds.
+        tick_duration_histogram (List[int]): Tick processing times bucketed by ``TICK_HISTOGRAM_BOUNDS_US``.
+
+    """
+
+    ticks: int
+    late_ticks: int
+    skipped_ticks: int
+    shm_writes: int
+    commands_processed: int
+    commands_overwritten: int
+    command_latency_total_us: int
+    command_latency_max_us: int
+    tick_duration_histogram: List[int]
+
+    @property
+    def command_latency_avg_us(self) -> float:
+        """Average receive-to-apply command latency in microseconds."""
+        if not self.commands_processed:
+            return 0.0
+        return self.command_latency_total_us / self.commands_processed
+
+
+@dataclass
+class SharedMemoryLayout:
+    """Layout of the engine's shared memory region, as described by its header.
+
+    Attributes:
+        generation (int): Layout generation the description belongs to.
+        region_size (int): Size of the region in bytes.
+        stats_offset (int): Offset of the engine stats.
+        frames_offset (int): Offset of the first frame slot.
+        frame_count (int): Number of slots in the frame ring.
+        frame_size (int): Bytes from one frame slot to the next.
+        body_capacity (int): Body coordinates that fit in a frame.
+        frame (struct.Struct): Fixed fields of a frame slot, in the order of their offsets.
+        positions (Dict[str, int]): Index of the first value of every field in ``frame``.
+        sequence_offset (int): Offset of the sequence number in a frame slot.
+        body_offset (int): Offset of the snake body in a frame slot.
+
+    """
+
+    generation: int
+    region_size: int
+    stats_offset: int
+    frames_offset: int
+    frame_count: int
+    frame_size: int
+    body_capacity: int
+    frame: struct.Struct
+    positions: Dict[str, int]
+    sequence_offset: int
+    body_offset: int
+
+
 class SnakeGameController:
     """Interface for communicating with the C++ Snake Game engine via Shared Memory and IPC Sockets.
 
     This controller allows reading game state (via shared memory) and sending commands
-    (via a UNIX domain socket).
+    (via a UNIX domain socket). The engine keeps a ring of its latest frames in shared
+    memory, so a reader slower than the engine can still fetch every recent tick with
+    ``read_frames``. The region starts with a header giving the offsets of the stats,
+    of the frames and of every frame field, which the reader follows instead of a
+    fixed layout; frames hold exactly as many body coordinates as the board has cells.
     """
 
     SHM_NAME = "/snake_game_shm"
     SOCKET_PATH = "/tmp/snake_game.sock"
 
+    SHM_MAGIC = 0x454B4E53
+    LAYOUT_VERSION = 5
+    SHM_HEADER = struct.Struct("<IHHIIQIIIIIIHHH")
+    SHM_COUNTERS = struct.Struct("<II")
+    SHM_COUNTERS_OFFSET = 8
+    FRAME_FIELDS = (
+        ("sequence", "I"),
+        ("board_width", "H"),
+        ("board_height", "H"),
+        ("score", "H"),
+        ("speed", "B"),
+        ("game_state", "B"),
+        ("food_position", "2H"),
+        ("food_type", "B"),
+        ("snake_head", "2H"),
+        ("snake_length", "I"),
+        ("tick", "I"),
+        ("neural_vector", "12f"),
+        ("snake_direction", "B"),
+    )
+    FRAME_SEQUENCE = struct.Struct("<I")
+    BODY_COORDINATE = "H"
+    MIN_BOARD_DIMENSION = 5
+    MAX_BOARD_DIMENSION = 1024
+    ENGINE_STATS_FORMAT = struct.Struct("<8Q8Q")
+    VERSION_MODULUS = 1 << 32
+    TICK_HISTOGRAM_BOUNDS_US = (10, 50, 100, 500, 1000, 5000, 10000)
+    READY_POLL_INTERVAL = 0.002
+
     def __init__(self, shm_name: str = SHM_NAME, socket_path: str = SOCKET_PATH):
         """Initialize the controller with paths to shared memory and socket.
 
@@ -111,6 +219,7 @@ class SnakeGameController:
         self.socket_path = socket_path
         self.shm: Optional[posix_ipc.SharedMemory] = None
         self.memory: Optional[mmap.mmap] = None
+        self.layout: Optional[SharedMemoryLayout] = None
         self.last_version = 0
 
     def connect(self) -> bool:
@@ -119,136 +228,316 @@ class SnakeGameController:
         Returns:
             bool: True if connection successful, False otherwise.
 
+        """
+        error = self._open()
+        if error is not None:
+            if error:
+                print(error)
+            return False
+        print(f"Connected to shared memory: {self.shm_name}")
+        return True
+
+    def wait_until_ready(self, pid: Optional[int] = None, timeout: float = 5.0) -> bool:
+        """Connect once the engine accepts commands.
+
+        The engine publishes its process ID in the shared memory header after its
+        command socket starts listening. A region left behind by an earlier engine
+        is unlinked when the next one starts, so it is dropped and opened again.
+
+        Args:
+            pid (Optional[int]): Process ID of the engine to wait for; any engine if None.
+            timeout (float): Seconds to wait.
+
+        Returns:
+            bool: True if connected to a ready engine, False on timeout.
+
+        """
+        deadline = time.monotonic() + timeout
+        error = ""
+        while True:
+            if self.memory is None:
+                error = self._open()
+            if self.memory is not None:
+                engine_pid = self.SHM_HEADER.unpack_from(self.memory, 0)[11]
+                if engine_pid and (pid is None or engine_pid == pid):
+                    print(f"Connected to shared memory: {self.shm_name}")
+                    return True
+                if os.fstat(self.shm.fd).st_nlink == 0:
+                    self.disconnect()
+
+            if time.monotonic() >= deadline:
+                print(error or f"No engine became ready in {self.shm_name} within {timeout:g} s")
+                return False
+            time.sleep(self.READY_POLL_INTERVAL)
+
+    def _open(self) -> Optional[str]:
+        """Map the shared memory region without reporting anything.
+
+        Returns:
+            Optional[str]: None if the region is mapped, otherwise why it is not;
+            an empty string if the region does not exist.
+
         """
         try:
             self.shm = posix_ipc.SharedMemory(self.shm_name, flags=0)
             self.memory = mmap.mmap(self.shm.fd, self.shm.size)
-            print(f"Connected to shared memory: {self.shm_name}")
-            return True
+            magic, layout_version = self.SHM_HEADER.unpack_from(self.memory, 0)[:2]
+            if magic != self.SHM_MAGIC or layout_version != self.LAYOUT_VERSION:
+                self.disconnect()
+                return f"Unsupported shared memory layout in {self.shm_name} (version {layout_version})"
+            return None
         except posix_ipc.ExistentialError:
-            return False
+            return ""
         except Exception as e:
-            print(f"Connection error: {e}")
-            return False
+            self.disconnect()
+            return f"Connection error: {e}"
 
     def disconnect(self):
         """Close the shared memory connection and release resources."""
         if self.memory:
             self.memory.close()
             self.memory = None
+        self.layout = None
         if hasattr(self, "shm") and self.shm:
             self.shm.close_fd()
             self.shm = None
 
     def read_data(self) -> Optional[SnakeGameData]:
-        """Read the current game state from shared memory.
+        """Read the newest game state from shared memory.
 
         Returns:
-            Optional[SnakeGameData]: Parsed game data object, or None if reading fails.
+            Optional[SnakeGameData]: Parsed game data object, or None if there is no
+            frame newer than the last one read or reading fails.
 
         """
-        if not self.memory:
+        layout = self._read_layout()
+        if layout is None:
             return None
 
-        try:
-            self.memory.seek(0)
-            is_writing = struct.unpack("?", self.memory.read(1))[0]
+        version = self.SHM_COUNTERS.unpack_from(self.memory, self.SHM_COUNTERS_OFFSET)[1]
+        if version == 0 or version == self.last_version:
+            return None
 
-            if is_writing:
-                return None
+        data = self._read_frame(layout, version)
+        if data is not None:
+            self.last_version = version
+        return data
 
-            self.memory.read(3)
-            version = struct.unpack("I", self.memory.read(4))[0]
+    def read_frames(self, since_version: Optional[int] = None) -> List[SnakeGameData]:
+        """Read every frame published after a version, oldest first.
 
-            if version == self.last_version:
-                return None
+        Frames that the engine has already overwritten in its ring, or discarded
+        when the board size changed, are missing from the result; gaps show up in
+        the ``version`` of the returned frames.
+
+        Args:
+            since_version (Optional[int]): Version of the last frame already seen;
+                defaults to the newest frame returned by ``read_data`` or ``read_frames``.
+
+        Returns:
+            List[SnakeGameData]: The newer frames still held in shared memory.
 
-            board_width = struct.unpack("B", self.memory.read(1))[0]
-            board_height = struct.unpack("B", self.memory.read(1))[0]
-            score = struct.unpack("H", self.memory.read(2))[0]
-            speed = struct.unpack("B", self.memory.read(1))[0]
-            game_state = GameState(struct.unpack("B", self.memory.read(1))[0])
+        """
+        layout = self._read_layout()
+        if layout is None:
+            return []
+
+        version = self.SHM_COUNTERS.unpack_from(self.memory, self.SHM_COUNTERS_OFFSET)[1]
+        since = self.last_version if since_version is None else since_version
+        count = min((version - since) % self.VERSION_MODULUS, layout.frame_count)
 
-            food_x = struct.unpack("B", self.memory.read(1))[0]
-            food_y = struct.unpack("B", self.memory.read(1))[0]
-            food_position = (food_x, food_y)
+        frames = []
+        for age in range(count - 1, -1, -1):
+            frame_version = (version - age) % self.VERSION_MODULUS
+            data = self._read_frame(layout, frame_version) if frame_version else None
+            if data is not None:
+                frames.append(data)
 
-            food_type = FoodType(struct.unpack("B", self.memory.read(1))[0])
+        if frames:
+            self.last_version = frames[-1].version
+        return frames
 
-            snake_head_x = struct.unpack("B", self.memory.read(1))[0]
-            snake_head_y = struct.unpack("B", self.memory.read(1))[0]
-            snake_head = (snake_head_x, snake_head_y)
+    def read_stats(self) -> Optional[EngineStats]:
+        """Read the engine health counters from shared memory.
 
-            self.memory.read(1)
-            snake_length = struct.unpack("H", self.memory.read(2))[0]
-            self.memory.read(2)
+        Returns:
+            Optional[EngineStats]: Current counters, or None if not connected or the
+            engine does not publish them.
 
-            neural_vector = []
-            for _ in range(12):
-                value = struct.unpack("<f", self.memory.read(4))[0]
-                neural_vector.append(value)
+        """
+        layout = self._read_layout()
+        if layout is None:
+            return None
 
-            snake_direction = Direction(struct.unpack("B", self.memory.read(1))[0])
+        values = self.ENGINE_STATS_FORMAT.unpack_from(self.memory, layout.stats_offset)
+        return EngineStats(*values[:8], tick_duration_histogram=list(values[8:]))
 
-            snake_body = []
-            for _ in range(min(snake_length, 2048)):
-                x = struct.unpack("B", self.memory.read(1))[0]
-                y = struct.unpack("B", self.memory.read(1))[0]
-                snake_body.append((x, y))
+    def _read_layout(self) -> Optional[SharedMemoryLayout]:
+        """Return the current layout of the region, reading the header again if it changed.
 
-            self.last_version = version
+        Returns:
+            Optional[SharedMemoryLayout]: The layout, or None if not connected, the engine
+            is changing the layout, or the region cannot be mapped in full.
+
+        """
+        if not self.memory:
+            return None
 
+        generation = self.SHM_COUNTERS.unpack_from(self.memory, self.SHM_COUNTERS_OFFSET)[0]
+        if self.layout is not None and self.layout.generation == generation:
+            return self.layout
+        if generation % 2:
+            return None
+
+        layout = self._parse_header()
+        if self.SHM_COUNTERS.unpack_from(self.memory, self.SHM_COUNTERS_OFFSET)[0] != generation:
+            return None
+
+        if layout.region_size > len(self.memory):
+            if self.shm is None:
+                return None
+            self.memory.close()
+            self.memory = mmap.mmap(self.shm.fd, layout.region_size)
+
+        self.layout = layout
+        return layout
+
+    def _parse_header(self) -> SharedMemoryLayout:
+        """Describe the region from its header.
+
+        Returns:
+            SharedMemoryLayout: The layout; the caller checks that it was not changed while reading.
+
+        """
+        header = self.SHM_HEADER.unpack_from(self.memory, 0)
+        generation, _, region_size, stats_offset, frames_offset, frame_count, frame_size, body_capacity = header[3:11]
+        offsets = struct.unpack_from(f"<{header[14]}H", self.memory, self.SHM_HEADER.size)
+
+        # The fixed fields are unpacked with one struct, built in the order of their offsets.
+        fields = sorted(zip(offsets, self.FRAME_FIELDS, strict=False))
+        frame_format = "<"
+        positions = {}
+        end = 0
+        index = 0
+        for offset, (name, code) in fields:
+            frame_format += f"{offset - end}x{code}" if offset > end else code
+            positions[name] = index
+            index += int(code[:-1] or 1)
+            end = offset + struct.calcsize(f"<{code}")
+
+        return SharedMemoryLayout(
+            generation=generation,
+            region_size=region_size,
+            stats_offset=stats_offset,
+            frames_offset=frames_offset,
+            frame_count=frame_count,
+            frame_size=frame_size,
+            body_capacity=body_capacity,
+            frame=struct.Struct(frame_format),
+            positions=positions,
+            sequence_offset=offsets[0],
+            body_offset=offsets[len(self.FRAME_FIELDS)],
+        )
+
+    def _read_frame(self, layout: SharedMemoryLayout, version: int) -> Optional[SnakeGameData]:
+        """Read one frame of the ring if it still holds the given version.
+
+        Args:
+            layout (SharedMemoryLayout): Current layout of the region.
+            version (int): Version of the frame.
+
+        Returns:
+            Optional[SnakeGameData]: The frame, or None if its slot is being written,
+            already holds a newer frame, or the layout changed while reading.
+
+        """
+        offset = layout.frames_offset + (version % layout.frame_count) * layout.frame_size
+        values = layout.frame.unpack_from(self.memory, offset)
+        at = layout.positions
+        length = min(values[at["snake_length"]], layout.body_capacity)
+        body = struct.unpack_from(f"<{2 * length}{self.BODY_COORDINATE}", self.memory, offset + layout.body_offset)
+
+        sequence = self.FRAME_SEQUENCE.unpack_from(self.memory, offset + layout.sequence_offset)[0]
+        generation = self.SHM_COUNTERS.unpack_from(self.memory, self.SHM_COUNTERS_OFFSET)[0]
+        if values[at["sequence"]] != version or sequence != version or generation != layout.generation:
+            return None
+
+        try:
             return SnakeGameData(
                 version=version,
-                board_width=board_width,
-                board_height=board_height,
-                score=score,
-                speed=speed,
-                game_state=game_state,
-                food_position=food_position,
-                food_type=food_type,
-                snake_head=snake_head,
-                snake_length=snake_length,
-                snake_body=snake_body,
-                neural_vector=neural_vector,
-                snake_direction=snake_direction,
+                board_width=values[at["board_width"]],
+                board_height=values[at["board_height"]],
+                score=values[at["score"]],
+                speed=values[at["speed"]],
+                game_state=GameState(values[at["game_state"]]),
+                food_position=values[at["food_position"] : at["food_position"] + 2],
+                food_type=FoodType(values[at["food_type"]]),
+                snake_head=values[at["snake_head"] : at["snake_head"] + 2],
+                snake_length=values[at["snake_length"]],
+                tick=values[at["tick"]],
+                snake_body=list(zip(body[::2], body[1::2], strict=True)),
+                neural_vector=list(values[at["neural_vector"] : at["neural_vector"] + 12]),
+                snake_direction=Direction(values[at["snake_direction"]]),
             )
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _pack_tick_rate(value) -> Optional[bytes]:
+        try:
+            rate = int(value)
+        except (TypeError, ValueError):
+            print("Invalid tick rate argument: must be an integer.")
+            return None
+
+        if not 0 <= rate <= 255:
+            print("Invalid tick rate argument: must be in range 0-255.")
+            return None
+
+        return struct.pack("B", rate)
 
-        except Exception:
+    @classmethod
+    def _pack_board_size(cls, width, height) -> Optional[bytes]:
+        try:
+            width = int(width)
+            height = int(height)
+        except (TypeError, ValueError):
+            print("Invalid board size arguments: must be integers.")
             return None
 
+        low, high = cls.MIN_BOARD_DIMENSION, cls.MAX_BOARD_DIMENSION
+        if not (low <= width <= high and low <= height <= high):
+            print(f"Invalid board size arguments: must be in range {low}-{high}.")
+            return None
+
+        return struct.pack("<HH", width, height)
+
     def send_command(self, command: IpcCommands, *args) -> bool:
         """Send a command to the game engine via socket.
 
         Args:
             command (IpcCommands): The command to send.
-            *args: Additional arguments (e.g., board size for CHANGE_BOARD_SIZE).
+            *args: Additional arguments (e.g., board size for CHANGE_BOARD_SIZE,
+                tick rate multiplier for SET_TICK_RATE where 0 means unlimited).
 
         Returns:
             bool: True if command was sent and acknowledged, False otherwise.
 
         """
+        # The payload is checked before connecting, so the engine never sees a command without its payload.
+        payload = b""
+        if command == IpcCommands.CHANGE_BOARD_SIZE and len(args) == 2:
+            payload = self._pack_board_size(*args)
+        elif command == IpcCommands.SET_TICK_RATE and len(args) == 1:
+            payload = self._pack_tick_rate(args[0])
+        if payload is None:
+            return False
+
         try:
             sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             sock.settimeout(1.0)
             sock.connect(self.socket_path)
-            sock.send(struct.pack("B", command.value))
-
-            if command == IpcCommands.CHANGE_BOARD_SIZE and len(args) == 2:
-                try:
-                    width = int(args[0])
-                    height = int(args[1])
-                except (TypeError, ValueError):
-                    print("Invalid board size arguments: must be integers.")
-                    sock.close()
-                    return False
-
-                if not (0 <= width <= 255 and 0 <= height <= 255):
-                    print("Invalid board size arguments: must be in range 0-255.")
-                    sock.close()
-                    return False
-
-                sock.send(struct.pack("BB", width, height))
+            sock.sendall(struct.pack("B", command.value) + payload)
             ack = sock.recv(1)
             sock.close()
 
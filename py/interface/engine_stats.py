@@ -0,0 +1,56 @@
+"""Print the engine health counters of a running game as JSON lines."""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+from dataclasses import asdict
+
+from SnakeGameController import SnakeGameController
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the snake engine health counters from shared memory.")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    parser.add_argument("--count", type=int, default=0, help="number of samples to print (0 runs until interrupted)")
+    args = parser.parse_args()
+
+    controller = SnakeGameController()
+    with contextlib.redirect_stdout(sys.stderr):
+        connected = controller.connect()
+    if not connected:
+        print("Engine is not running.", file=sys.stderr)
+        return 1
+
+    samples = 0
+    previous = None
+    try:
+        while not args.count or samples < args.count:
+            stats = controller.read_stats()
+            if stats is None:
+                print("Engine does not publish stats.", file=sys.stderr)
+                return 1
+
+            sample = asdict(stats)
+            sample["timestamp"] = time.time()
+            sample["command_latency_avg_us"] = stats.command_latency_avg_us
+            sample["tick_histogram_bounds_us"] = list(SnakeGameController.TICK_HISTOGRAM_BOUNDS_US)
+            if previous is not None:
+                sample["ticks_per_sec"] = (stats.ticks - previous.ticks) / args.interval
+            print(json.dumps(sample), flush=True)
+
+            previous = stats
+            samples += 1
+            if not args.count or samples < args.count:
+                time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.disconnect()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
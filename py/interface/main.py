@@ -1,5 +1,6 @@
 """Snake Game Viewer - Main interface for the Snake game with AI support."""
 
+import argparse
 import os
 import subprocess
 import sys
@@ -11,14 +12,10 @@ project_root = current_file_path.parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-import numpy as np  # noqa: E402, I001
-import pygame  # noqa: E402
-from heuristicController import SnakeHeuristicAI  # noqa: E402
+import pygame  # noqa: E402, I001
 from SnakeGameController import Direction, FoodType, GameState, IpcCommands  # noqa: E402
 from SnakeGameController import SnakeGameController as Controller  # noqa: E402
 
-from py.snakeAgent import SnakeAgent  # noqa: E402
-
 if os.name != "posix":
     print("[SYSTEM] This program is only supported on Linux systems.")
     sys.exit(1)
@@ -29,6 +26,7 @@ if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
 
 cpp_game_path = project_root / "build" / "src" / "app" / "snake_game"
 assets_path = current_file_path.parent / "assets"
+models_dir = current_file_path.parent.parent / "training" / "models"
 
 DEFAULT_WINDOW_WIDTH = 1024
 DEFAULT_WINDOW_HEIGHT = 768
@@ -40,12 +38,27 @@ OFFSET_X = 0
 OFFSET_Y = 0
 
 AVAILABLE_MAP_SIZES = [(10, 10), (20, 20), (30, 30), (40, 40), (20, 10), (10, 20)]
+SIM_SPEEDS = [("1x", 1), ("10x", 10), ("MAX", 0)]
+DISPLAY_FPS = 60
+ENGINE_START_TIMEOUT = 5.0
 
 game_process = None
 current_process_size = (20, 20)
 
 GRAPHICS = {}
 FONTS = {}
+SPRITE_CACHE = {}
+TEXT_CACHE = {}
+TEXT_CACHE_LIMIT = 1024
+SCENE = {
+    "static": None,
+    "board_size": None,
+    "surface": None,
+    "sprites": {},
+    "overlays": [],
+    "state": None,
+    "valid": False,
+}
 
 
 def update_fonts():
@@ -54,6 +67,7 @@ def update_fonts():
     FONTS["large"] = pygame.font.SysFont(None, int(base_scale * 0.06))
     FONTS["medium"] = pygame.font.SysFont(None, int(base_scale * 0.04))
     FONTS["small"] = pygame.font.SysFont(None, int(base_scale * 0.025))
+    TEXT_CACHE.clear()
 
 
 def update_layout(map_width, map_height):
@@ -77,6 +91,9 @@ def update_layout(map_width, map_height):
     OFFSET_Y = (SCREEN_HEIGHT - board_pixel_h) // 2
 
     load_images()
+    SPRITE_CACHE.clear()
+    SCENE["static"] = None
+    SCENE["valid"] = False
 
 
 def load_images():  # noqa: C901
@@ -127,8 +144,51 @@ def load_images():  # noqa: C901
     }
 
 
-def restart_game_process():
-    global game_process, cpp_game_path, current_process_size
+def parse_engine_args(argv):
+    """Translate the viewer's command line into arguments for the C++ game.
+
+    Args:
+        argv (list): Command line arguments, without the program name.
+
+    Returns:
+        list: Arguments passed to the game executable.
+
+    """
+    parser = argparse.ArgumentParser(description="Snake Game Viewer.")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded episode file instead of a live game")
+    parser.add_argument("--episode", type=int, default=0, help="index of the episode to play back")
+    parser.add_argument("--record", metavar="FILE", help="record every played episode to FILE")
+    parser.add_argument(
+        "--late-ticks",
+        choices=("skip", "catch-up"),
+        default="skip",
+        help="whether the game skips or catches up ticks it could not run on time",
+    )
+    args = parser.parse_args(argv)
+
+    engine_args = []
+    if args.replay:
+        engine_args += ["--replay", str(Path(args.replay).resolve()), "--episode", str(args.episode)]
+    if args.record:
+        engine_args += ["--record", str(Path(args.record).resolve()), "--record-food"]
+    engine_args += ["--late-ticks", args.late_ticks]
+    return engine_args
+
+
+engine_args = parse_engine_args(sys.argv[1:])
+
+
+def start_game_process():
+    """Start the C++ game, stopping the previous one if it is still running.
+
+    The game is not ready yet when this returns; wait for it with
+    ``SnakeGameController.wait_until_ready(game_process.pid)``.
+
+    Returns:
+        bool: True if the game was started.
+
+    """
+    global game_process, current_process_size
     if game_process:
         try:
             game_process.terminate()
@@ -138,22 +198,92 @@ def restart_game_process():
 
     try:
         current_process_size = (20, 20)
-        print(f"[SYSTEM] Restarting C++ game with size {current_process_size[0]}x{current_process_size[1]}...")
+        print(f"[SYSTEM] Starting C++ game with size {current_process_size[0]}x{current_process_size[1]}...")
         game_process = subprocess.Popen(  # noqa: S603
-            [str(cpp_game_path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            [str(cpp_game_path), *engine_args], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
-        time.sleep(0.5)
         return True
     except Exception as e:
         print(f"Error starting game: {e}")
         return False
 
 
-restart_game_process()
+def connect_to_game():
+    """Start the C++ game and connect to it once it accepts commands.
+
+    Returns:
+        Controller | None: The connected controller, or None if the game did not start.
+
+    """
+    if not start_game_process():
+        return None
+    controller = Controller()
+    if not controller.wait_until_ready(game_process.pid, ENGINE_START_TIMEOUT):
+        return None
+    return controller
+
+
+def find_models():
+    """List the saved models, newest name first.
+
+    Returns:
+        list: File names of the JSON and binary models in ``models_dir``.
+
+    """
+    if not models_dir.exists():
+        return []
+    return sorted((f.name for pattern in ("*.json", "*.bin") for f in models_dir.glob(pattern)), reverse=True)
+
+
+def get_sprite(name, angle):
+    key = (name, angle, CELL_SIZE)
+    sprite = SPRITE_CACHE.get(key)
+    if sprite is None:
+        sprite = pygame.transform.rotate(GRAPHICS[name], angle)
+        SPRITE_CACHE[key] = sprite
+    return sprite
+
+
+def get_overlay(color):
+    key = ("overlay", color, SCREEN_WIDTH, SCREEN_HEIGHT)
+    overlay = SPRITE_CACHE.get(key)
+    if overlay is None:
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill(color)
+        SPRITE_CACHE[key] = overlay
+    return overlay
+
+
+def cache_text(key, build):
+    surf = TEXT_CACHE.get(key)
+    if surf is None:
+        if len(TEXT_CACHE) >= TEXT_CACHE_LIMIT:
+            TEXT_CACHE.clear()
+        surf = build()
+        TEXT_CACHE[key] = surf
+    return surf
+
 
+def render_text(font, text, color):
+    return cache_text((text, font, color), lambda: FONTS[font].render(text, True, color))
 
-def draw_text_with_bg(screen, text_surf, x, y, align="topleft", bg_color=(0, 0, 0, 150)):
-    rect = text_surf.get_rect()
+
+def get_text_box(font, text, color, bg_color=(0, 0, 0, 150)):
+    def build():
+        text_surf = render_text(font, text, color)
+        padding = 6
+        box = pygame.Surface(text_surf.get_rect().inflate(padding * 2, padding * 2).size, pygame.SRCALPHA)
+        box.fill(bg_color)
+        box.blit(text_surf, (padding, padding))
+        return box
+
+    return cache_text(("box", text, font, color, bg_color), build)
+
+
+def make_text_box(font, text, color, x, y, align="topleft", bg_color=(0, 0, 0, 150)):
+    padding = 6
+    box = get_text_box(font, text, color, bg_color)
+    rect = box.get_rect().inflate(-padding * 2, -padding * 2)
     if align == "topleft":
         rect.topleft = (x, y)
     elif align == "bottomright":
@@ -161,22 +291,29 @@ def draw_text_with_bg(screen, text_surf, x, y, align="topleft", bg_color=(0, 0,
     elif align == "center":
         rect.center = (x, y)
 
-    padding = 6
     bg_rect = rect.inflate(padding * 2, padding * 2)
-    s = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-    s.fill(bg_color)
-    screen.blit(s, bg_rect.topleft)
+    return box, bg_rect
+
 
-    screen.blit(text_surf, rect)
+def draw_text_with_bg(screen, font, text, color, x, y, align="topleft", bg_color=(0, 0, 0, 150)):
+    box, bg_rect = make_text_box(font, text, color, x, y, align, bg_color)
+    screen.blit(box, bg_rect.topleft)
     return bg_rect.height
 
 
-def draw_legend(screen, font, lines):
+def make_legend(font, lines):
+    overlays = []
     start_y = SCREEN_HEIGHT - 10
     for line in lines:
-        text_surf = font.render(line, True, (220, 220, 220))
-        h = draw_text_with_bg(screen, text_surf, SCREEN_WIDTH - 10, start_y, align="bottomright")
-        start_y -= h + 4
+        box, bg_rect = make_text_box(font, line, (220, 220, 220), SCREEN_WIDTH - 10, start_y, align="bottomright")
+        overlays.append((line, box, bg_rect))
+        start_y -= bg_rect.height + 4
+    return overlays
+
+
+def draw_legend(screen, font, lines):
+    for _, box, bg_rect in make_legend(font, lines):
+        screen.blit(box, bg_rect.topleft)
 
 
 def draw_board(screen, width, height):
@@ -204,34 +341,35 @@ def draw_board(screen, width, height):
     pygame.draw.rect(screen, (100, 100, 100), (OFFSET_X, OFFSET_Y, board_px_w, board_px_h), 2)
 
 
-def draw_snake(screen, snake_head, snake_body, snake_dir):  # noqa: C901
+def build_static_scene(width, height):
+    static = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    if GRAPHICS.get("background"):
+        static.blit(GRAPHICS["background"], (0, 0))
+    else:
+        static.fill((20, 20, 20))
+    draw_board(static, width, height)
+    return static
+
+
+def cell_rect(cell):
+    return pygame.Rect(OFFSET_X + cell[0] * CELL_SIZE, OFFSET_Y + cell[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+
+def get_snake_sprites(snake_head, snake_body, snake_dir):  # noqa: C901
+    """Map every visible snake cell to the ``(sprite, angle)`` it is drawn with."""
     body_without_head = [part for part in snake_body if part != snake_head]
     segments = [snake_head] + body_without_head
     tail_pos = segments[-1] if segments else None
-
-    img_head = GRAPHICS.get("head")
-    img_body = GRAPHICS.get("body")
-    img_corner = GRAPHICS.get("corner")
-    img_tail = GRAPHICS.get("tail")
-
-    if img_body and not img_corner:
-        img_corner = img_body
+    sprites = {}
 
     for i in range(1, len(segments)):
         segment = segments[i]
         if segment == tail_pos and i != len(segments) - 1:
             continue
 
-        px = OFFSET_X + segment[0] * CELL_SIZE
-        py = OFFSET_Y + segment[1] * CELL_SIZE
-
         prev_seg = segments[i - 1]
         next_seg = segments[i + 1] if i + 1 < len(segments) else None
 
-        if not img_body:
-            pygame.draw.rect(screen, (0, 255, 0), (px, py, CELL_SIZE, CELL_SIZE))
-            continue
-
         if next_seg is None:
             dx = prev_seg[0] - segment[0]
             dy = prev_seg[1] - segment[1]
@@ -244,65 +382,161 @@ def draw_snake(screen, snake_head, snake_body, snake_dir):  # noqa: C901
                 angle = -90
             elif dx == -1:
                 angle = 90
-            img_to_draw = img_tail if img_tail else img_body
-            rotated = pygame.transform.rotate(img_to_draw, angle)
-            screen.blit(rotated, (px, py))
+            sprites[segment] = ("tail", angle)
+        elif prev_seg[0] == segment[0] == next_seg[0] or prev_seg[1] == segment[1] == next_seg[1]:
+            angle = 0
+            if prev_seg[1] == segment[1]:
+                angle = 90
+            sprites[segment] = ("body", angle)
         else:
-            if prev_seg[0] == segment[0] == next_seg[0] or prev_seg[1] == segment[1] == next_seg[1]:
-                angle = 0
-                if prev_seg[1] == segment[1]:
-                    angle = 90
-                rotated = pygame.transform.rotate(img_body, angle)
-                screen.blit(rotated, (px, py))
-            else:
-                rel_prev = (prev_seg[0] - segment[0], prev_seg[1] - segment[1])
-                rel_next = (next_seg[0] - segment[0], next_seg[1] - segment[1])
-                corner_sum = (rel_prev[0] + rel_next[0], rel_prev[1] + rel_next[1])
+            rel_prev = (prev_seg[0] - segment[0], prev_seg[1] - segment[1])
+            rel_next = (next_seg[0] - segment[0], next_seg[1] - segment[1])
+            corner_sum = (rel_prev[0] + rel_next[0], rel_prev[1] + rel_next[1])
+            angle = 0
+            if corner_sum == (1, 1):
                 angle = 0
-                if corner_sum == (1, 1):
-                    angle = 0
-                elif corner_sum == (-1, 1):
-                    angle = -90
-                elif corner_sum == (-1, -1):
-                    angle = 180
-                elif corner_sum == (1, -1):
-                    angle = 90
-                rotated = pygame.transform.rotate(img_corner, angle)
-                screen.blit(rotated, (px, py))
-
-    px = OFFSET_X + snake_head[0] * CELL_SIZE
-    py = OFFSET_Y + snake_head[1] * CELL_SIZE
-    if img_head:
-        angle = 0
-        if snake_dir == Direction.DOWN:
-            angle = 180
-        elif snake_dir == Direction.LEFT:
-            angle = 90
-        elif snake_dir == Direction.RIGHT:
-            angle = -90
-        rotated = pygame.transform.rotate(img_head, angle)
-        screen.blit(rotated, (px, py))
-    else:
-        pygame.draw.rect(screen, (0, 200, 0), (px, py, CELL_SIZE, CELL_SIZE))
+            elif corner_sum == (-1, 1):
+                angle = -90
+            elif corner_sum == (-1, -1):
+                angle = 180
+            elif corner_sum == (1, -1):
+                angle = 90
+            sprites[segment] = ("corner", angle)
+
+    angle = 0
+    if snake_dir == Direction.DOWN:
+        angle = 180
+    elif snake_dir == Direction.LEFT:
+        angle = 90
+    elif snake_dir == Direction.RIGHT:
+        angle = -90
+    sprites[snake_head] = ("head", angle)
+    return sprites
+
+
+def get_scene_sprites(data):
+    sprites = get_snake_sprites(data.snake_head, data.snake_body, data.snake_direction)
+    sprites[data.food_position] = ("food", data.food_type)
+    return sprites
+
+
+def draw_cell(screen, cell, sprite):
+    kind, variant = sprite
+    px = OFFSET_X + cell[0] * CELL_SIZE
+    py = OFFSET_Y + cell[1] * CELL_SIZE
+
+    if kind == "food":
+        food_img = GRAPHICS.get("foods", {}).get(variant)
+        if food_img:
+            screen.blit(food_img, (px, py))
+        else:
+            colors = [(255, 0, 0), (200, 0, 0), (255, 255, 0), (128, 0, 128), (255, 165, 0)]
+            c = colors[int(variant)] if int(variant) < len(colors) else (255, 255, 255)
+            pygame.draw.rect(screen, c, (px, py, CELL_SIZE, CELL_SIZE))
+        return
+
+    if kind == "head":
+        if not GRAPHICS.get("head"):
+            pygame.draw.rect(screen, (0, 200, 0), (px, py, CELL_SIZE, CELL_SIZE))
+            return
+    elif not GRAPHICS.get("body"):
+        pygame.draw.rect(screen, (0, 255, 0), (px, py, CELL_SIZE, CELL_SIZE))
+        return
+    elif not GRAPHICS.get(kind):
+        kind = "body"
+
+    screen.blit(get_sprite(kind, variant), (px, py))
+
+
+def draw_snake(screen, snake_head, snake_body, snake_dir):
+    for cell, sprite in get_snake_sprites(snake_head, snake_body, snake_dir).items():
+        draw_cell(screen, cell, sprite)
+
+
+def render_scene(screen, data, overlays):  # noqa: C901
+    """Draw the board, snake and overlays, repainting only what changed since the last frame.
+
+    The background and board tiles are prerendered once per layout into ``SCENE["static"]``.
+    ``SCENE["surface"]`` holds that plus the current snake and food, and is patched cell by
+    cell from the sprite diff against the previous frame. Overlays are composited on top of it.
+    A full repaint (and ``display.flip``) only happens after a layout, board size or state change.
+
+    Args:
+        screen: The display surface.
+        data (SnakeGameData): The game state to render.
+        overlays (list): ``(key, surface, rect)`` boxes drawn above the board (HUD, legend).
+
+    Returns:
+        list | None: Dirty rectangles to pass to ``pygame.display.update``, or None if the
+        whole screen was redrawn.
+
+    """
+    board_size = (data.board_width, data.board_height)
+    sprites = get_scene_sprites(data)
+
+    if SCENE["static"] is None or SCENE["board_size"] != board_size:
+        SCENE["static"] = build_static_scene(*board_size)
+        SCENE["board_size"] = board_size
+        SCENE["valid"] = False
+
+    if not SCENE["valid"] or SCENE["state"] != data.game_state or data.game_state != GameState.PLAYING:
+        scene = SCENE["static"].copy()
+        for cell, sprite in sprites.items():
+            draw_cell(scene, cell, sprite)
+        screen.blit(scene, (0, 0))
+        for _, box, rect in overlays:
+            screen.blit(box, rect.topleft)
+
+        SCENE.update(surface=scene, sprites=sprites, overlays=overlays, state=data.game_state, valid=True)
+        return None
+
+    scene = SCENE["surface"]
+    static = SCENE["static"]
+    previous = SCENE["sprites"]
+    dirty = []
+
+    for cell in previous.keys() | sprites.keys():
+        sprite = sprites.get(cell)
+        if previous.get(cell) == sprite:
+            continue
+        rect = cell_rect(cell)
+        scene.blit(static, rect, rect)
+        if sprite is not None:
+            draw_cell(scene, cell, sprite)
+        dirty.append(rect)
+
+    new_keys = {key for key, _, _ in overlays}
+    old_keys = set()
+    for key, _, rect in SCENE["overlays"]:
+        old_keys.add(key)
+        if key not in new_keys:
+            dirty.append(rect)
+
+    for rect in dirty:
+        screen.blit(scene, rect, rect)
+
+    for key, box, rect in overlays:
+        if key not in old_keys or rect.collidelist(dirty) != -1:
+            screen.blit(scene, rect, rect)
+            screen.blit(box, rect.topleft)
+            dirty.append(rect)
+
+    SCENE.update(sprites=sprites, overlays=overlays)
+    return dirty
 
 
 def main():  # noqa: C901
     global SCREEN_WIDTH, SCREEN_HEIGHT, current_process_size
-    controller = Controller()
-
-    for _ in range(20):
-        if controller.connect():
-            break
-        time.sleep(0.1)
-    else:
-        print("Failed to connect to the C++ game")
+    if not start_game_process():
         return 1
 
     aiMode = False
     algoMode = False
     network = None
     heuristic_bot = None
+    bot_label = "ALGO"
 
+    # The window opens while the game starts up.
     pygame.display.init()
     pygame.font.init()
 
@@ -318,16 +552,18 @@ def main():  # noqa: C901
     update_fonts()
     update_layout(current_process_size[0], current_process_size[1])
 
+    controller = Controller()
+    if not controller.wait_until_ready(game_process.pid, ENGINE_START_TIMEOUT):
+        print("Failed to connect to the C++ game")
+        pygame.quit()
+        return 1
+
     clock = pygame.time.Clock()
     running = True
 
-    models_dir = Path(__file__).parent.parent / "training" / "models"
-    available_models = []
-    if models_dir.exists():
-        available_models = [f.name for f in models_dir.glob("*.json")]
-        available_models.sort(reverse=True)
-
-    current_model_name = available_models[0] if available_models else "No models"
+    # Models are only looked up once a menu entry that uses them is opened.
+    available_models = None
+    current_model_name = None
 
     menu_selection = 0
     menu_sub_state = 0
@@ -338,6 +574,13 @@ def main():  # noqa: C901
     should_render = True
     last_ai_decision_version = -1
 
+    sim_speed_idx = 0
+    ticks_per_sec = 0.0
+    tick_window = (time.perf_counter(), 0)
+    dropped_frames = 0
+    last_rendered_tick = None
+    last_render_time = 0.0
+
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -364,14 +607,23 @@ def main():  # noqa: C901
                 elif event.key == pygame.K_t:
                     controller.send_command(IpcCommands.START_GAME)
                 elif event.key == pygame.K_r:
-                    w, h = current_process_size
-                    if restart_game_process():
+                    # The game is only restarted if it no longer answers.
+                    if not controller.send_command(IpcCommands.RETURN_TO_MENU):
                         controller.disconnect()
-                        time.sleep(0.5)
-                        controller = Controller()
-                        controller.connect()
-                        last_ai_decision_version = -1
-                        data = None
+                        controller = connect_to_game()
+                        if controller is None:
+                            print("Failed to restart the C++ game")
+                            return 1
+                    last_ai_decision_version = -1
+                    data = None
+                    sim_speed_idx = 0
+                elif event.key == pygame.K_f:
+                    if data and data.game_state != GameState.MENU and (aiMode or algoMode):
+                        next_idx = (sim_speed_idx + 1) % len(SIM_SPEEDS)
+                        if controller.send_command(IpcCommands.SET_TICK_RATE, SIM_SPEEDS[next_idx][1]):
+                            sim_speed_idx = next_idx
+                            dropped_frames = 0
+                            tick_window = (time.perf_counter(), data.tick)
                 elif event.key == pygame.K_ESCAPE:
                     if menu_sub_state != 0:
                         menu_sub_state = 0
@@ -390,7 +642,7 @@ def main():  # noqa: C901
                         controller.send_command(cmd)
 
                 if data and data.game_state == GameState.MENU:
-                    MENU_ITEMS_COUNT = 7
+                    MENU_ITEMS_COUNT = 8
 
                     if menu_sub_state == 0:
                         if event.key in [pygame.K_w, pygame.K_UP]:
@@ -398,6 +650,10 @@ def main():  # noqa: C901
                         elif event.key in [pygame.K_s, pygame.K_DOWN]:
                             menu_selection = (menu_selection + 1) % MENU_ITEMS_COUNT
                         elif event.key in [pygame.K_RETURN, pygame.K_KP_ENTER]:
+                            if menu_selection in (1, 3, 4) and available_models is None:
+                                available_models = find_models()
+                                current_model_name = available_models[0] if available_models else "No models"
+
                             if menu_selection == 0:
                                 aiMode, algoMode = False, False
                                 controller.send_command(IpcCommands.START_GAME)
@@ -405,23 +661,39 @@ def main():  # noqa: C901
                                 aiMode, algoMode = True, False
                                 full_path = models_dir / current_model_name
                                 try:
+                                    from py.snakeAgent import SnakeAgent
+
                                     network = SnakeAgent(str(full_path))
                                     controller.send_command(IpcCommands.START_GAME)
                                 except Exception:
                                     aiMode = False
                             elif menu_selection == 2:
                                 aiMode, algoMode = False, True
+                                from heuristicController import SnakeHeuristicAI
+
                                 heuristic_bot = SnakeHeuristicAI()
+                                bot_label = "ALGO"
                                 controller.send_command(IpcCommands.START_GAME)
                             elif menu_selection == 3:
-                                menu_sub_state = 1
+                                aiMode, algoMode = False, True
+                                from searchController import SnakeSearchAI
+
+                                full_path = models_dir / current_model_name
+                                try:
+                                    heuristic_bot = SnakeSearchAI(str(full_path))
+                                except Exception:
+                                    heuristic_bot = SnakeSearchAI()
+                                bot_label = "SEARCH"
+                                controller.send_command(IpcCommands.START_GAME)
                             elif menu_selection == 4:
+                                menu_sub_state = 1
+                            elif menu_selection == 5:
                                 menu_sub_state = 2
                                 if current_process_size in AVAILABLE_MAP_SIZES:
                                     map_menu_idx = AVAILABLE_MAP_SIZES.index(current_process_size)
                                 else:
                                     map_menu_idx = 0
-                            elif menu_selection == 5:
+                            elif menu_selection == 6:
                                 is_fullscreen = not is_fullscreen
                                 if is_fullscreen:
                                     screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
@@ -440,7 +712,7 @@ def main():  # noqa: C901
                                 else:
                                     update_layout(current_process_size[0], current_process_size[1])
 
-                            elif menu_selection == 6:
+                            elif menu_selection == 7:
                                 controller.send_command(IpcCommands.QUIT_GAME)
                                 running = False
 
@@ -470,6 +742,7 @@ def main():  # noqa: C901
 
         packets_read = 0
         data_updated = False
+        new_data = None
         while True:
             if packets_read > 200:
                 break
@@ -485,9 +758,18 @@ def main():  # noqa: C901
         if data is None:
             time.sleep(0.001)
             continue
-        if data_updated:
+        if data_updated and (data.game_state != GameState.MENU or SCENE["state"] != GameState.MENU):
             should_render = True
 
+        if data_updated and data.game_state == GameState.PLAYING:
+            now = time.perf_counter()
+            window_start, window_tick = tick_window
+            if data.tick < window_tick:
+                tick_window = (now, data.tick)
+            elif now - window_start >= 0.5:
+                ticks_per_sec = (data.tick - window_tick) / (now - window_start)
+                tick_window = (now, data.tick)
+
         if data.game_state == GameState.PLAYING and data_updated:
             if aiMode or algoMode:
                 if data.version != last_ai_decision_version:
@@ -500,7 +782,7 @@ def main():  # noqa: C901
                         if hasattr(data, "neural_vector") and data.neural_vector:
                             outputs = network.move(data.neural_vector)
                             if outputs is not None:
-                                calculated_direction = np.argmax(outputs)
+                                calculated_direction = max(range(len(outputs)), key=outputs.__getitem__)
 
                     if calculated_direction is not None:
                         cmd = IpcCommands.NONE
@@ -526,11 +808,17 @@ def main():  # noqa: C901
 
                     last_ai_decision_version = data.version
 
-        if should_render:
-            if GRAPHICS.get("background"):
-                screen.blit(GRAPHICS["background"], (0, 0))
-            else:
-                screen.fill((20, 20, 20))
+        frame_due = time.perf_counter() - last_render_time >= 1.0 / DISPLAY_FPS
+        if should_render and frame_due:
+            last_render_time = time.perf_counter()
+            dirty_rects = None
+            if data.game_state not in [GameState.PLAYING, GameState.GAME_OVER]:
+                if GRAPHICS.get("background"):
+                    screen.blit(GRAPHICS["background"], (0, 0))
+                else:
+                    screen.fill((20, 20, 20))
+                SCENE["state"] = data.game_state
+                SCENE["valid"] = False
 
             if data.game_state == GameState.MENU:
                 if menu_sub_state == 0:
@@ -539,34 +827,36 @@ def main():  # noqa: C901
                         "Start Game (Manual)",
                         "AI Mode",
                         "Algorithm Mode",
+                        "Search Mode",
                         "AI Settings",
                         "Map Size",
                         current_screen_text,
                         "Quit Game",
                     ]
 
-                    t = FONTS["large"].render("Snake Game Launcher", True, (0, 255, 0))
+                    t = render_text("large", "Snake Game Launcher", (0, 255, 0))
                     screen.blit(t, (SCREEN_WIDTH // 2 - t.get_width() // 2, SCREEN_HEIGHT * 0.1))
 
-                    m_info = FONTS["small"].render(f"Model: {current_model_name}", True, (100, 255, 255))
+                    model_label = current_model_name or "newest"
+                    m_info = render_text("small", f"Model: {model_label}", (100, 255, 255))
                     screen.blit(m_info, (SCREEN_WIDTH // 2 - m_info.get_width() // 2, SCREEN_HEIGHT * 0.18))
 
                     cur_w, cur_h = current_process_size
-                    size_info = FONTS["small"].render(f"Map: {cur_w}x{cur_h}", True, (200, 200, 200))
+                    size_info = render_text("small", f"Map: {cur_w}x{cur_h}", (200, 200, 200))
                     screen.blit(size_info, (SCREEN_WIDTH // 2 - size_info.get_width() // 2, SCREEN_HEIGHT * 0.22))
 
                     menu_start_y = SCREEN_HEIGHT * 0.35
                     for i, opt in enumerate(menu_options):
                         col = (255, 255, 0) if i == menu_selection else (255, 255, 255)
                         prefix = "> " if i == menu_selection else "   "
-                        surf = FONTS["medium"].render(prefix + opt, True, col)
+                        surf = render_text("medium", prefix + opt, col)
                         text_x = SCREEN_WIDTH // 2 - 200
                         screen.blit(surf, (text_x, menu_start_y + i * (SCREEN_HEIGHT * 0.06)))
 
-                    draw_legend(screen, FONTS["small"], ["[ENTER] Select", "[W / S] Navigate", "[Q] Quit"])
+                    draw_legend(screen, "small", ["[ENTER] Select", "[W / S] Navigate", "[Q] Quit"])
 
                 elif menu_sub_state == 1:
-                    t = FONTS["large"].render("Select Model", True, (0, 200, 255))
+                    t = render_text("large", "Select Model", (0, 200, 255))
                     screen.blit(t, (SCREEN_WIDTH // 2 - t.get_width() // 2, SCREEN_HEIGHT * 0.1))
                     list_start_y = SCREEN_HEIGHT * 0.25
                     for i, m_file in enumerate(available_models):
@@ -580,12 +870,12 @@ def main():  # noqa: C901
                         prefix = "> " if is_selected else "  "
                         suffix = " [ACTIVE]" if is_active else ""
                         text_str = f"{prefix}{m_file}{suffix}"
-                        surf = FONTS["medium"].render(text_str, True, color)
+                        surf = render_text("medium", text_str, color)
                         screen.blit(surf, (SCREEN_WIDTH // 2 - 350, list_start_y + i * (SCREEN_HEIGHT * 0.045)))
-                    draw_legend(screen, FONTS["small"], ["[ENTER] Select Model", "[W / S] Navigate", "[ESC] Back"])
+                    draw_legend(screen, "small", ["[ENTER] Select Model", "[W / S] Navigate", "[ESC] Back"])
 
                 elif menu_sub_state == 2:
-                    t = FONTS["large"].render("Select Map Size", True, (255, 100, 255))
+                    t = render_text("large", "Select Map Size", (255, 100, 255))
                     screen.blit(t, (SCREEN_WIDTH // 2 - t.get_width() // 2, SCREEN_HEIGHT * 0.1))
                     list_start_y = SCREEN_HEIGHT * 0.25
                     for i, (w, h) in enumerate(AVAILABLE_MAP_SIZES):
@@ -597,54 +887,64 @@ def main():  # noqa: C901
                         prefix = "> " if is_selected else "  "
                         suffix = " [ACTIVE]" if is_active else ""
                         text_str = f"{prefix}{w} x {h}{suffix}"
-                        surf = FONTS["medium"].render(text_str, True, color)
+                        surf = render_text("medium", text_str, color)
                         screen.blit(surf, (SCREEN_WIDTH // 2 - 150, list_start_y + i * (SCREEN_HEIGHT * 0.06)))
-                    draw_legend(screen, FONTS["small"], ["[ENTER] Confirm", "[W / S] Navigate", "[ESC] Cancel"])
+                    draw_legend(screen, "small", ["[ENTER] Confirm", "[W / S] Navigate", "[ESC] Cancel"])
 
             elif data.game_state in [GameState.PLAYING, GameState.GAME_OVER]:
-                draw_board(screen, data.board_width, data.board_height)
-                draw_snake(screen, data.snake_head, data.snake_body, data.snake_direction)
-
-                fx, fy = data.food_position
-                ftype = data.food_type
-                food_img = GRAPHICS.get("foods", {}).get(ftype)
-                if food_img:
-                    screen.blit(food_img, (OFFSET_X + fx * CELL_SIZE, OFFSET_Y + fy * CELL_SIZE))
+                if aiMode:
+                    m_str = "AI"
+                elif algoMode:
+                    m_str = bot_label
                 else:
-                    colors = [(255, 0, 0), (200, 0, 0), (255, 255, 0), (128, 0, 128), (255, 165, 0)]
-                    c = colors[int(ftype)] if int(ftype) < len(colors) else (255, 255, 255)
-                    pygame.draw.rect(
-                        screen, c, (OFFSET_X + fx * CELL_SIZE, OFFSET_Y + fy * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    )
+                    m_str = "MANUAL"
+                score_str = f"Score: {data.score} | Mode: {m_str}"
+                hud = [(score_str, *make_text_box("medium", score_str, (255, 255, 255), 10, 10))]
 
-                m_str = "AI" if aiMode else ("ALGO" if algoMode else "MANUAL")
-                score_txt = FONTS["medium"].render(f"Score: {data.score} | Mode: {m_str}", True, (255, 255, 255))
-                draw_text_with_bg(screen, score_txt, 10, 10)
+                if aiMode or algoMode:
+                    if last_rendered_tick is not None and data.tick > last_rendered_tick:
+                        dropped_frames += data.tick - last_rendered_tick - 1
+                    last_rendered_tick = data.tick
 
-                if data.game_state == GameState.GAME_OVER:
-                    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                    overlay.fill((0, 0, 0, 180))
-                    screen.blit(overlay, (0, 0))
+                    speed_label = SIM_SPEEDS[sim_speed_idx][0]
+                    stats_str = f"Sim: {speed_label} | {ticks_per_sec:.0f} ticks/s | Dropped: {dropped_frames}"
+                    stats_y = hud[0][2].bottom + 4
+                    hud.append((stats_str, *make_text_box("small", stats_str, (200, 200, 200), 10, stats_y + 6)))
 
-                    t = FONTS["large"].render("GAME OVER", True, (255, 0, 0))
+                legend_lines = []
+                if aiMode or algoMode:
+                    legend_lines = ["[F] Sim Speed", "[R] Main Menu", "[Q] Quit"]
+                else:
+                    legend_lines = ["[WASD] Move", "[R] Main Menu", "[Q] Quit"]
+                legend = make_legend("small", legend_lines)
+
+                if data.game_state == GameState.PLAYING:
+                    dirty_rects = render_scene(screen, data, hud + legend)
+                elif SCENE["valid"] and SCENE["state"] == GameState.GAME_OVER:
+                    dirty_rects = []
+                else:
+                    render_scene(screen, data, hud)
+
+                    screen.blit(get_overlay((0, 0, 0, 180)), (0, 0))
+
+                    t = render_text("large", "GAME OVER", (255, 0, 0))
                     screen.blit(t, (SCREEN_WIDTH // 2 - t.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
 
-                    s_msg = FONTS["medium"].render(f"Score: {data.score}", True, (255, 255, 255))
+                    s_msg = render_text("medium", f"Score: {data.score}", (255, 255, 255))
                     screen.blit(s_msg, (SCREEN_WIDTH // 2 - s_msg.get_width() // 2, SCREEN_HEIGHT // 2 + 10))
 
-                    restart_msg = FONTS["medium"].render("[T] PLAY AGAIN", True, (0, 255, 0))
+                    restart_msg = render_text("medium", "[T] PLAY AGAIN", (0, 255, 0))
                     screen.blit(
                         restart_msg, (SCREEN_WIDTH // 2 - restart_msg.get_width() // 2, SCREEN_HEIGHT // 2 + 60)
                     )
 
-                legend_lines = []
-                if aiMode or algoMode:
-                    legend_lines = ["[R] Main Menu", "[Q] Quit"]
-                else:
-                    legend_lines = ["[WASD] Move", "[R] Main Menu", "[Q] Quit"]
-                draw_legend(screen, FONTS["small"], legend_lines)
+                    for _, box, rect in legend:
+                        screen.blit(box, rect.topleft)
 
-            pygame.display.flip()
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
             should_render = False
 
         clock.tick(200)
@@ -655,5 +955,4 @@ def main():  # noqa: C901
 
 
 if __name__ == "__main__":
-    time.sleep(0.5)
     sys.exit(main())
@@ -0,0 +1,133 @@
+"""Inspect, verify and play back episode files recorded by the engine.
+
+Episodes are recorded by ``snake_game --record FILE``, by the viewer's
+``--record`` option, or during training with ``Config.RECORD_EPISODES``.
+Without options the tool prints a summary of the file. ``--verify``
+re-simulates every episode at engine speed and checks that it reproduces the
+recorded score and food events, and ``--view`` plays one episode back in the
+viewer (start it from the menu with "Start Game").
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+current_file_path = Path(__file__).resolve()
+project_root = current_file_path.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from py import snake_lib as snakelib  # noqa: E402
+
+
+def print_summary(path, episodes):
+    """Print the size and score statistics of an episode file.
+
+    Args:
+        path (Path): Episode file.
+        episodes (list): Episodes read from the file.
+
+    """
+    ticks = sum(episode.ticks for episode in episodes)
+    size = os.path.getsize(path)
+    print(f"{path}: {len(episodes)} episodes, {ticks} ticks, {size} bytes")
+    if not episodes:
+        return
+
+    scores = [episode.score for episode in episodes]
+    best = max(range(len(episodes)), key=lambda index: episodes[index].score)
+    print(f"  {size / max(ticks, 1):.3f} bytes/tick, {size / len(episodes):.1f} bytes/episode")
+    print(f"  score: avg {sum(scores) / len(scores):.1f}, best {scores[best]} (episode {best})")
+
+
+def print_episodes(episodes, indices):
+    """Print one line per episode.
+
+    Args:
+        episodes (list): Episodes read from the file.
+        indices (list): Indices of the episodes to print.
+
+    """
+    print(f"{'Episode':>8} {'Board':>7} {'Seed':>10} {'Ticks':>8} {'Score':>6} {'Food':>5}")
+    for index in indices:
+        episode = episodes[index]
+        board = f"{episode.width}x{episode.height}"
+        food = len(episode.food_events) if episode.food_events else "-"
+        print(f"{index:>8} {board:>7} {episode.seed:>10} {episode.ticks:>8} {episode.score:>6} {food:>5}")
+
+
+def verify(episodes, indices):
+    """Re-simulate episodes and report the ones that did not reproduce.
+
+    Args:
+        episodes (list): Episodes read from the file.
+        indices (list): Indices of the episodes to replay.
+
+    Returns:
+        int: Number of episodes whose replay diverged from the recording.
+
+    """
+    start = time.perf_counter()
+    results = [snakelib.replay_episode(episodes[index]) for index in indices]
+    elapsed = time.perf_counter() - start
+
+    mismatches = 0
+    for index, result in zip(indices, results, strict=True):
+        episode = episodes[index]
+        if not result.matches:
+            mismatches += 1
+            print(
+                f"  episode {index}: replay reached score {result.score} in {result.ticks} ticks, "
+                f"recorded {episode.score} in {episode.ticks}"
+            )
+
+    ticks = sum(result.ticks for result in results)
+    print(
+        f"Replayed {len(results)} episodes ({ticks} ticks) in {elapsed:.3f}s "
+        f"({ticks / max(elapsed, 1e-9):,.0f} ticks/s): {len(results) - mismatches} reproduced, {mismatches} diverged"
+    )
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, verify and play back recorded snake episodes.")
+    parser.add_argument("file", help="episode file to read")
+    parser.add_argument("--list", action="store_true", help="print every episode")
+    parser.add_argument("--verify", action="store_true", help="re-simulate the episodes and check the results")
+    parser.add_argument("--episode", type=int, help="only use this episode")
+    parser.add_argument("--view", action="store_true", help="play the episode back in the viewer")
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    episodes = snakelib.read_episodes(path)
+    print_summary(path, episodes)
+
+    if args.episode is not None:
+        if not 0 <= args.episode < len(episodes):
+            print(f"Episode {args.episode} not found.", file=sys.stderr)
+            return 1
+        indices = [args.episode]
+    else:
+        indices = range(len(episodes))
+
+    if args.list:
+        print_episodes(episodes, indices)
+
+    if args.verify and verify(episodes, indices):
+        return 1
+
+    if args.view:
+        viewer = current_file_path.parent / "main.py"
+        episode = args.episode if args.episode is not None else 0
+        return subprocess.run(  # noqa: S603
+            [sys.executable, str(viewer), "--replay", str(path), "--episode", str(episode)], check=False
+        ).returncode
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
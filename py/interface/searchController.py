@@ -0,0 +1,69 @@
+"""Lookahead controller for Snake game backed by the native beam search."""
+
+from typing import Optional
+
+from SnakeGameController import SnakeGameData
+
+from py import snake_lib as snakelib
+from py.training.utils import load_network
+
+
+class SnakeSearchAI:
+    """Chooses moves with ``snake_lib.SearchController``.
+
+    Every decision rebuilds the game state from the shared memory data and
+    searches it inside the engine, so no Python code runs per simulated step.
+    The random state of the running game is not published, so food eaten during
+    the search is placed as in a fresh game; only the first moves of a search
+    depend on the real food position anyway. Decisions are limited to
+    ``time_budget_ms`` so the viewer stays responsive at high simulation speeds.
+
+    Attributes:
+        search (snakelib.SearchController): The native search.
+
+    """
+
+    def __init__(self, model_path: Optional[str] = None, **config) -> None:
+        """Create the search and optionally load a rollout policy.
+
+        Args:
+            model_path (Optional[str]): Network model rolled out from every searched state.
+            **config: ``snake_lib.SearchController`` options (``max_depth``, ``beam_width``,
+                ``node_budget``, ``time_budget_ms``, ``rollout_steps``).
+
+        """
+        config.setdefault("time_budget_ms", 20.0)
+        if model_path is not None:
+            config.setdefault("rollout_steps", 10)
+        self.search = snakelib.SearchController(**config)
+
+        if model_path is not None:
+            network = load_network(model_path)
+            if network is not None:
+                self.search.set_policy(
+                    network.to_genome(), len(network.inputs), len(network.hidden), len(network.outputs)
+                )
+
+    def get_next_move(self, data: SnakeGameData) -> Optional[int]:
+        """Search from the current game state.
+
+        Args:
+            data (SnakeGameData): The latest game state.
+
+        Returns:
+            Optional[int]: The direction to move in, or None without a snake.
+
+        """
+        if not data.snake_body:
+            return None
+
+        snapshot = snakelib.GameSnapshot(
+            data.board_width,
+            data.board_height,
+            data.snake_body,
+            snakelib.Direction(int(data.snake_direction)),
+            data.food_position,
+            score=data.score,
+            tick_count=data.tick,
+        )
+        return int(self.search.decide(snapshot))
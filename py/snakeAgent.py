@@ -19,7 +19,7 @@ class SnakeAgent:
         """Initialize the SnakeAgent by loading a model from file.
 
         Args:
-            path (str): Path to the JSON file containing the saved neural network.
+            path (str): Path to the saved neural network (JSON or binary model file).
 
         """
         try:
@@ -1,6 +1,12 @@
 """Snake game library."""
 
+from collections.abc import Sequence
 from enum import Enum
+from os import PathLike
+from typing import overload
+
+import numpy as np
+import numpy.typing as npt
 
 
 class Direction(Enum):
@@ -35,10 +41,174 @@ class StepResult:
     def __init__(self) -> None: ...
 
 
+class GameSnapshot:
+    """Complete state of a game: snake, food, random state, score and game state."""
+
+    width: int
+    """Board width."""
+    height: int
+    """Board height."""
+    snake_body: list[tuple[int, int]]
+    """Snake body coordinates, head first."""
+    snake_direction: Direction
+    """Current moving direction of the snake."""
+    food_position: tuple[int, int]
+    """Position of the food."""
+    game_state: GameState
+    """State of the game."""
+    score: int
+    """Score."""
+    tick_count: int
+    """Snake moves since the game started."""
+
+    @overload
+    def __init__(self) -> None:
+        """Create an empty snapshot to be filled by ``Game.snapshot_into``."""
+        ...
+
+    @overload
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        snake_body: list[tuple[int, int]],
+        snake_direction: Direction,
+        food_position: tuple[int, int],
+        score: int = 0,
+        tick_count: int = 0,
+        rng_state: int = 0,
+    ) -> None:
+        """Create a playing state, e.g. from the shared memory data, to search from.
+
+        The snake body must not be empty, and its segments and the food must lie on
+        the board; anything else raises ``ValueError``.
+        """
+        ...
+
+
+class SearchStats:
+    """Statistics of the last search."""
+
+    nodes: int
+    """Simulated steps, rollouts included."""
+    depth: int
+    """Deepest fully searched depth."""
+    elapsed_ms: float
+    """Wall time of the search in milliseconds."""
+    value: float
+    """Evaluation of the best state found."""
+
+
+class SearchController:
+    """Chooses moves by beam search over simulated engine states."""
+
+    last_stats: SearchStats
+    """Statistics of the last decision."""
+
+    def __init__(
+        self,
+        max_depth: int = 12,
+        beam_width: int = 32,
+        node_budget: int = 20000,
+        time_budget_ms: float = 0.0,
+        rollout_steps: int = 0,
+    ) -> None:
+        """Create a search; a budget of 0 is unlimited."""
+        ...
+
+    def set_policy(self, genome: Sequence[float], input_size: int, hidden_size: int, output_size: int) -> None:
+        """Roll out a network, given as a flat genome, from every searched state."""
+        ...
+
+    def clear_policy(self) -> None:
+        """Remove the rollout policy."""
+        ...
+
+    def decide(self, snapshot: GameSnapshot) -> Direction:
+        """Search from a game state and return the move to play."""
+        ...
+
+
+class Episode:
+    """A recorded game: board size, seed and the move played on every tick."""
+
+    width: int
+    """Board width."""
+    height: int
+    """Board height."""
+    seed: int
+    """Seed of the board's food generator."""
+    ticks: int
+    """Number of recorded moves."""
+    score: int
+    """Final score."""
+    actions: list[Direction]
+    """Move played on every tick."""
+    food_events: list[tuple[int, tuple[int, int], int]]
+    """Food placements as ``(tick, (x, y), food_type)``; empty unless the file records them."""
+
+
+class ReplayResult:
+    """Outcome of re-simulating an episode."""
+
+    ticks: int
+    """Moves played before the game ended or the actions ran out."""
+    score: int
+    """Score reached by the replay."""
+    matches: bool
+    """Indicates if the score and the recorded food events were reproduced."""
+
+
+class EpisodeRecorder:
+    """Appends finished episodes to a compact binary episode file."""
+
+    records_food: bool
+    """Indicates if the file stores food events."""
+    episode_count: int
+    """Number of episodes written so far."""
+
+    def __init__(self, path: str | PathLike, record_food: bool = False) -> None:
+        """Create (or truncate) an episode file."""
+        ...
+
+    def flush(self) -> None:
+        """Flush recorded episodes to disk."""
+        ...
+
+
+def read_episodes(path: str | PathLike) -> list[Episode]:
+    """Read every episode of an episode file."""
+    ...
+
+
+def replay_episode(episode: Episode) -> ReplayResult:
+    """Re-simulate an episode on a headless game and return the outcome."""
+    ...
+
+
 class Game:
     """Snake game class."""
 
-    def __init__(self, board_width: int = 20, board_height: int = 20) -> None: ...
+    def __init__(self, width: int = 20, height: int = 20, ipc: bool = True) -> None:
+        """Create a game; with ``ipc=False`` no shared memory or command socket is opened.
+
+        Board sides range from ``MIN_BOARD_DIMENSION`` to ``MAX_BOARD_DIMENSION``; other sizes raise ``ValueError``.
+        """
+        ...
+
+    seed: int
+    """Seed of the current episode's food generator."""
+
+    def reset(self, seed: int | None = None) -> StepResult:
+        """Reset the game in place without allocating and return the initial game state.
+
+        Without a seed the new episode gets a fresh random one.
+        """
+        ...
+
+    def set_recorder(self, recorder: EpisodeRecorder | None) -> None:
+        """Record the following episodes to a recorder, or stop recording with None."""
+        ...
 
     def initialize_game(self) -> StepResult:
         """Initialize the game and return the initial game state."""
@@ -47,3 +217,70 @@ class Game:
     def step_game(self, direction: Direction) -> StepResult:
         """Advance the game by one step in the given direction."""
         ...
+
+    def snapshot(self) -> GameSnapshot:
+        """Capture the snake, food, random state, score and state of the game."""
+        ...
+
+    def snapshot_into(self, snapshot: GameSnapshot) -> None:
+        """Capture the game into an existing snapshot, reusing its storage."""
+        ...
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Restore a state captured with ``snapshot``; the game continues with the same food.
+
+        Snapshots with a board size out of range, an empty snake, or segments or food
+        off the board raise ``ValueError`` (only a finished game's head may lie past the edge).
+        """
+        ...
+
+    def clone(self) -> "Game":
+        """Return an independent headless copy of the game."""
+        ...
+
+    def grid_shape(self, size: int = 0) -> tuple[int, int, int]:
+        """Shape of ``observe_grid`` buffers: channels, rows and columns."""
+        ...
+
+    @overload
+    def observe_grid(self, out: npt.NDArray[np.uint8], size: int = 0) -> None: ...
+    @overload
+    def observe_grid(self, out: npt.NDArray[np.float32], size: int = 0) -> None: ...
+    def observe_grid(self, out: npt.NDArray[np.uint8] | npt.NDArray[np.float32], size: int = 0) -> None:
+        """Write the grid observation of the game into a C-contiguous array.
+
+        The planes are body, head, food and walls (``GRID_CHANNELS``). With ``size=0`` they
+        cover the whole board and the wall plane is empty; otherwise they are a
+        ``size`` x ``size`` window centered on the head, and cells outside the board are walls.
+        The array is written in place and must have the shape ``grid_shape(size)``.
+        """
+        ...
+
+    def __copy__(self) -> "Game": ...
+
+    def __deepcopy__(self, memo: dict) -> "Game": ...
+
+    def __getstate__(self) -> tuple:
+        """Return the episode state; unpickled games are created with ``ipc=False``."""
+        ...
+
+    def __setstate__(self, state: tuple) -> None: ...
+
+
+GRID_CHANNELS: int
+"""Number of planes in a grid observation."""
+MIN_BOARD_DIMENSION: int
+"""Smallest board width or height."""
+MAX_BOARD_DIMENSION: int
+"""Largest board width or height."""
+
+
+@overload
+def observe_grids(games: Sequence[Game], out: npt.NDArray[np.uint8], size: int = 0) -> None: ...
+@overload
+def observe_grids(games: Sequence[Game], out: npt.NDArray[np.float32], size: int = 0) -> None: ...
+def observe_grids(
+    games: Sequence[Game], out: npt.NDArray[np.uint8] | npt.NDArray[np.float32], size: int = 0
+) -> None:
+    """Write the grid observation of every game into one ``(games, *grid_shape(size))`` array."""
+    ...
@@ -0,0 +1,15 @@
+"""Shared fixtures for the test suite.
+
+pytest imports its own ``py`` compatibility module before collecting tests,
+which hides this project's ``py`` package; it is dropped here so the tests
+import the package from the project root.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[2]
+for path in (project_root, project_root / "py" / "interface"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+sys.modules.pop("py", None)
@@ -0,0 +1,66 @@
+"""Board size limits and food placement."""
+
+import pytest
+
+from py import snake_lib as snakelib
+
+DIRECTIONS = {
+    (0, -1): snakelib.Direction.UP,
+    (0, 1): snakelib.Direction.DOWN,
+    (-1, 0): snakelib.Direction.LEFT,
+    (1, 0): snakelib.Direction.RIGHT,
+}
+
+
+def hamiltonian_cycle(width, height):
+    """Visit every cell once: down the first column, then up through the others row by row."""
+    cycle = [(0, y) for y in range(height)]
+    for row, y in enumerate(range(height - 1, -1, -1)):
+        columns = range(1, width) if row % 2 == 0 else range(width - 1, 0, -1)
+        cycle += [(x, y) for x in columns]
+    return cycle
+
+
+@pytest.mark.parametrize("size", [snakelib.MIN_BOARD_DIMENSION, snakelib.MAX_BOARD_DIMENSION])
+def test_board_limits_are_accepted(size):
+    game = snakelib.Game(size, snakelib.MIN_BOARD_DIMENSION, ipc=False)
+    assert not game.reset(1).is_game_over
+
+
+@pytest.mark.parametrize(
+    "width, height", [(snakelib.MIN_BOARD_DIMENSION - 1, 10), (10, snakelib.MAX_BOARD_DIMENSION + 1), (0, 0)]
+)
+def test_board_out_of_range_is_rejected(width, height):
+    with pytest.raises(ValueError):
+        snakelib.Game(width, height, ipc=False)
+
+
+def test_filling_the_board_ends_the_game():
+    width = height = 6
+    cycle = hamiltonian_cycle(width, height)
+    order = {cell: index for index, cell in enumerate(cycle)}
+    game = snakelib.Game(width, height, ipc=False)
+    result = game.reset(5)
+
+    for _ in range(100 * width * height):
+        if result.is_game_over:
+            break
+        snapshot = game.snapshot()
+        assert snapshot.food_position not in snapshot.snake_body
+        head = snapshot.snake_body[0]
+        target = cycle[(order[head] + 1) % len(cycle)]
+        result = game.step_game(DIRECTIONS[(target[0] - head[0], target[1] - head[1])])
+
+    assert result.is_game_over
+    assert len(game.snapshot().snake_body) == width * height
+
+
+def test_controller_rejects_sizes_the_engine_ignores(capsys):
+    controller = pytest.importorskip("SnakeGameController").SnakeGameController
+    low, high = controller.MIN_BOARD_DIMENSION, controller.MAX_BOARD_DIMENSION
+    assert (low, high) == (snakelib.MIN_BOARD_DIMENSION, snakelib.MAX_BOARD_DIMENSION)
+
+    assert controller._pack_board_size(low, high) is not None
+    for width, height in [(low - 1, low), (low, high + 1), ("wide", low)]:
+        assert controller._pack_board_size(width, height) is None
+    assert f"must be in range {low}-{high}" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+"""Round trips of training state checkpoints."""
+
+import numpy as np
+
+from py.training.checkpoint import load_training_state, save_training_state
+from py.training.config import Config
+from py.training.training import write_training_state
+from py.training.worker import Worker
+
+
+def small_config(tmp_path):
+    config = Config()
+    config.WIDTH = 10
+    config.HEIGHT = 10
+    config.MAX_STEPS = 50
+    config.POPULATION_SIZE = 12
+    config.HIDDEN_SIZE = 8
+    config.WORKERS = 1
+    config.STATE_CHECKPOINT_DIR = str(tmp_path)
+    return config
+
+
+def new_worker(config, state=None):
+    return Worker(config, pop_size=config.POPULATION_SIZE, hidden_size=config.HIDDEN_SIZE, state=state)
+
+
+def test_resumed_worker_repeats_the_original_run(tmp_path):
+    config = small_config(tmp_path)
+    worker = new_worker(config)
+    worker.run()
+
+    meta = {"workers": 1, "generation": 1, "best_fit": 1.5}
+    best_genome = worker.population[0].to_genome()
+    path = tmp_path / "run_gen1.npz"
+    save_training_state(path, meta, best_genome, [worker.get_state()])
+    loaded_meta, loaded_genome, islands = load_training_state(path)
+
+    assert loaded_meta["generation"] == 1
+    assert loaded_meta["best_fit"] == 1.5
+    np.testing.assert_array_equal(loaded_genome, best_genome)
+
+    # The random generators are process-wide, so the original finishes its generation before the copy is built.
+    expected = worker.run()
+    population = worker.get_state()["population"]
+
+    resumed = new_worker(config, state=islands[0])
+    assert resumed.gen_number == 1
+    assert resumed.run() == expected
+    np.testing.assert_array_equal(resumed.get_state()["population"], population)
+
+
+def test_state_without_a_best_network(tmp_path):
+    config = small_config(tmp_path)
+    worker = new_worker(config)
+    write_training_state(config, "run", 0, [worker.get_state()], None, -1, 0, tmp_path / "telemetry.jsonl")
+
+    meta, best_genome, islands = load_training_state(tmp_path / "run_gen1.npz")
+    assert best_genome is None
+    assert meta["best_fit"] == -1
+    assert new_worker(config, state=islands[0]).gen_number == 0
@@ -0,0 +1,43 @@
+"""Round trips of networks through the model file formats."""
+
+import numpy as np
+import pytest
+
+from py.training.neural import Neural
+from py.training.utils import MODEL_DTYPE, MODEL_HEADER, load_network, save_network
+
+
+@pytest.fixture
+def network():
+    np.random.seed(3)
+    return Neural(12, 16, 4, 3.0)
+
+
+def test_binary_model_round_trip(network, tmp_path):
+    path = tmp_path / "model.bin"
+    save_network(network, str(path))
+    assert path.stat().st_size == MODEL_HEADER.size + network.to_genome().size * MODEL_DTYPE.itemsize
+
+    loaded = load_network(str(path))
+    assert isinstance(loaded.hidden_weights.base, np.memmap)
+    np.testing.assert_array_equal(loaded.hidden_weights, np.asarray(network.hidden_weights, dtype=MODEL_DTYPE))
+    np.testing.assert_array_equal(loaded.output_weights, np.asarray(network.output_weights, dtype=MODEL_DTYPE))
+    assert loaded.weight_range == network.weight_range
+
+    inputs = np.linspace(0.0, 1.0, 12)
+    np.testing.assert_allclose(loaded.predict(inputs), network.predict(inputs), rtol=1e-5)
+
+
+def test_binary_and_json_models_agree(network, tmp_path):
+    save_network(network, str(tmp_path / "model.json"))
+    save_network(load_network(str(tmp_path / "model.json")), str(tmp_path / "model.bin"))
+
+    loaded = load_network(str(tmp_path / "model.bin"))
+    np.testing.assert_array_equal(loaded.to_genome(), network.to_genome().astype(MODEL_DTYPE))
+
+
+def test_truncated_binary_model_is_rejected(network, tmp_path):
+    path = tmp_path / "model.bin"
+    save_network(network, str(path))
+    path.write_bytes(path.read_bytes()[: MODEL_HEADER.size - 1])
+    assert load_network(str(path)) is None
@@ -0,0 +1,84 @@
+"""Frames published by a running engine through shared memory.
+
+The tests start ``build/src/app/snake_game`` and are skipped when it has not
+been built or ``posix_ipc`` is not installed.
+"""
+
+import struct
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("posix_ipc")
+
+from SnakeGameController import GameState, IpcCommands, SnakeGameController  # noqa: E402
+
+ENGINE = Path(__file__).resolve().parents[2] / "build" / "src" / "app" / "snake_game"
+
+
+@pytest.fixture(scope="module")
+def controller():
+    if not ENGINE.exists():
+        pytest.skip(f"the engine is not built ({ENGINE})")
+
+    engine = subprocess.Popen([str(ENGINE)], stdout=subprocess.DEVNULL)  # noqa: S603
+    controller = SnakeGameController()
+    try:
+        assert controller.wait_until_ready(pid=engine.pid)
+        yield controller
+    finally:
+        controller.disconnect()
+        engine.kill()
+        engine.wait()
+
+
+def test_frame_ring_holds_every_recent_tick(controller):
+    assert controller.send_command(IpcCommands.SET_TICK_RATE, 100)
+    assert controller.send_command(IpcCommands.START_GAME)
+
+    frames = []
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not any(frame.game_state == GameState.GAME_OVER for frame in frames):
+        time.sleep(0.05)
+        frames += controller.read_frames()
+
+    playing = [frame for frame in frames if frame.game_state == GameState.PLAYING]
+    assert len(playing) > 1
+    ticks = [frame.tick for frame in playing]
+    assert ticks == list(range(ticks[0], ticks[0] + len(ticks)))
+    for frame in playing:
+        assert len(frame.snake_body) == frame.snake_length
+        assert frame.snake_body[0] == frame.snake_head
+
+
+def test_header_matches_the_engine_layout(controller):
+    memory = controller.memory
+    header = SnakeGameController.SHM_HEADER.unpack_from(memory, 0)
+    magic, layout_version, header_size = header[:3]
+    region_size, stats_offset, frames_offset, frame_count, frame_size, body_capacity = header[5:11]
+    board_width, board_height, field_count = header[12:15]
+
+    assert magic == SnakeGameController.SHM_MAGIC
+    assert layout_version == SnakeGameController.LAYOUT_VERSION
+    assert field_count == len(SnakeGameController.FRAME_FIELDS) + 1
+    # The C++ header is the fixed fields followed by the field offsets, padded to its 8-byte alignment.
+    fields_end = SnakeGameController.SHM_HEADER.size + struct.calcsize(f"<{field_count}H")
+    assert header_size == (fields_end + 7) // 8 * 8
+
+    assert header_size <= stats_offset
+    assert stats_offset + SnakeGameController.ENGINE_STATS_FORMAT.size <= frames_offset
+    assert frames_offset + frame_count * frame_size <= region_size <= len(memory)
+    assert body_capacity == board_width * board_height
+
+    # Every frame field lies before the body, without overlapping the next one.
+    offsets = struct.unpack_from(f"<{field_count}H", memory, SnakeGameController.SHM_HEADER.size)
+    fields = sorted(zip(offsets, (code for _, code in SnakeGameController.FRAME_FIELDS), strict=False))
+    for (offset, code), (next_offset, _) in zip(fields, fields[1:] + [(offsets[-1], None)], strict=True):
+        assert offset + struct.calcsize(f"<{code}") <= next_offset
+    body_size = struct.calcsize(f"<{2 * body_capacity}{SnakeGameController.BODY_COORDINATE}")
+    assert offsets[-1] + body_size <= frame_size
+
+    data = controller.read_frames(since_version=0)[-1]
+    assert (data.board_width, data.board_height) == (board_width, board_height)
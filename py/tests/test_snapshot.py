@@ -0,0 +1,95 @@
+"""Round trips of game states through snapshots and pickling."""
+
+import pickle
+
+import pytest
+
+from py import snake_lib as snakelib
+
+MOVES = [snakelib.Direction.RIGHT, snakelib.Direction.DOWN, snakelib.Direction.LEFT, snakelib.Direction.DOWN] * 4
+
+
+def started_game(seed=7, steps=3):
+    game = snakelib.Game(12, 12, ipc=False)
+    game.reset(seed)
+    for direction in MOVES[:steps]:
+        game.step_game(direction)
+    return game
+
+
+def play(game, moves):
+    results = []
+    for direction in moves:
+        result = game.step_game(direction)
+        results.append((list(result.distances), result.is_game_over, result.fruit_picked_up))
+        if result.is_game_over:
+            break
+    return results
+
+
+def state(game):
+    snapshot = game.snapshot()
+    return (
+        snapshot.snake_body,
+        snapshot.snake_direction,
+        snapshot.food_position,
+        snapshot.game_state,
+        snapshot.score,
+        snapshot.tick_count,
+    )
+
+
+def test_restored_game_steps_like_the_original():
+    game = started_game()
+    snapshot = game.snapshot()
+    expected = play(game, MOVES)
+
+    restored = snakelib.Game(12, 12, ipc=False)
+    restored.restore(snapshot)
+    assert play(restored, MOVES) == expected
+    assert state(restored) == state(game)
+
+
+def test_unpickled_game_steps_like_the_original():
+    game = started_game()
+    copy = pickle.loads(pickle.dumps(game))
+    assert state(copy) == state(game)
+    assert play(copy, MOVES) == play(game, MOVES)
+    assert state(copy) == state(game)
+
+
+def test_finished_game_can_be_pickled():
+    game = started_game(steps=0)
+    while not game.step_game(snakelib.Direction.UP).is_game_over:
+        pass
+
+    copy = pickle.loads(pickle.dumps(game))
+    assert copy.snapshot().game_state == snakelib.GameState.GAME_OVER
+    assert state(copy) == state(game)
+
+
+def test_empty_snapshot_is_rejected():
+    game = started_game()
+    with pytest.raises(ValueError):
+        game.restore(snakelib.GameSnapshot())
+
+
+@pytest.mark.parametrize(
+    "body, food",
+    [
+        ([(3, 3)], (12, 0)),
+        ([(3, 3), (3, 12)], (0, 0)),
+        ([], (0, 0)),
+    ],
+)
+def test_snapshot_off_the_board_is_rejected(body, food):
+    with pytest.raises(ValueError):
+        snakelib.GameSnapshot(12, 12, body, snakelib.Direction.UP, food)
+
+
+@pytest.mark.parametrize(
+    "width, height", [(snakelib.MIN_BOARD_DIMENSION - 1, 12), (12, snakelib.MAX_BOARD_DIMENSION + 1)]
+)
+def test_board_size_out_of_range_is_rejected(width, height):
+    with pytest.raises(ValueError):
+        snakelib.GameSnapshot(width, height, [(2, 2)], snakelib.Direction.UP, (0, 0))
@@ -0,0 +1,449 @@
+"""Execution backends running the training islands.
+
+Every island is a stateful ``Worker`` that lives in its own process for the
+whole run. The driver talks to the islands only through the small interface
+shared by the backends below:
+
+- ``submit_run(index)`` starts one generation on an island.
+- ``wait_result()`` blocks until any island finishes and returns its stats.
+- ``publish_best(index)`` makes the island's best genome available to the driver.
+- ``fetch_genome(handle)`` turns a published handle into a float32 array.
+- ``inject_genome(index, handle)`` queues a migrant before the island's next run.
+- ``fetch_state(index)`` returns an idle island's full state for a training checkpoint.
+
+Islands can start from saved states (``--resume``) or from a population seeded
+with existing genomes (``--seed-models``), see ``Worker``.
+
+The backend is selected by ``Config.BACKEND``. Ray is only imported when the
+``"ray"`` backend is chosen.
+"""
+
+import logging
+import multiprocessing
+import os
+import traceback
+from multiprocessing import connection, shared_memory
+
+import numpy as np
+
+from py.training.neural import Neural
+from py.training.worker import Worker
+
+BACKENDS = ("local", "ray")
+
+
+def create_backend(config, states=None, seed_genomes=None):
+    """Create the execution backend selected in the configuration.
+
+    Args:
+        config (Config): Training configuration.
+        states (list | None): Saved state of every island to continue from.
+        seed_genomes (list | None): Genomes placed in the population of every new island.
+
+    Returns:
+        LocalBackend | RayBackend: A backend with ``config.WORKERS`` islands started.
+
+    Raises:
+        ValueError: If ``config.BACKEND`` is not a known backend.
+
+    """
+    if config.BACKEND == "local":
+        return LocalBackend(config, states, seed_genomes)
+    if config.BACKEND == "ray":
+        return RayBackend(config, states, seed_genomes)
+    raise ValueError(f"Unknown training backend: {config.BACKEND!r} (expected one of {', '.join(BACKENDS)})")
+
+
+def genome_size(config):
+    """Return the number of weights in a genome for the configured network shape.
+
+    Args:
+        config (Config): Training configuration.
+
+    Returns:
+        int: Length of a flat genome.
+
+    """
+    return Neural.genome_size(config.INPUT_SIZE, config.HIDDEN_SIZE, config.OUTPUT_SIZE)
+
+
+def _island_reply(worker, genomes, command):
+    """Run an island command that is answered on the pipe.
+
+    Args:
+        worker (Worker): The island.
+        genomes (np.ndarray): The island's shared genome buffer.
+        command (str): ``"run"``, ``"publish_best"`` or ``"get_state"``.
+
+    Returns:
+        The reply sent to the driver.
+
+    Raises:
+        ValueError: If the command is unknown.
+
+    """
+    if command == "run":
+        return worker.run()
+    if command == "publish_best":
+        genomes[0] = worker.publish_best()
+        return None
+    if command == "get_state":
+        return worker.get_state()
+    raise ValueError(f"Unknown island command: {command!r}")
+
+
+def _report_failure(conn, error):
+    """Answer every command of an island that could not be started with its error.
+
+    The driver only reads the pipe when it expects a reply, so the error is
+    returned in place of those replies and raised there like a failed run.
+
+    Args:
+        conn (multiprocessing.connection.Connection): Command pipe to the driver.
+        error (str): Formatted traceback of the failure.
+
+    """
+    try:
+        while True:
+            command = conn.recv()
+            if command == "close":
+                break
+            if command != "inject_genome":
+                conn.send((False, error))
+    except (EOFError, KeyboardInterrupt):
+        pass
+
+
+def _island_main(conn, config, buffer, index, state, seed_genomes):
+    """Serve commands for one island in a child process.
+
+    The island's shared buffer holds two genomes: the first is written by
+    ``publish_best`` for the driver, the second is written by the driver before
+    it sends ``inject_genome``.
+
+    Args:
+        conn (multiprocessing.connection.Connection): Command pipe to the driver.
+        config (Config): Training configuration.
+        buffer (shared_memory.SharedMemory): The island's genome buffer.
+        index (int): Island index.
+        state (dict | None): Saved island state to continue from.
+        seed_genomes (list | None): Genomes placed in a new population.
+
+    """
+    try:
+        worker = Worker(
+            config,
+            pop_size=config.POPULATION_SIZE,
+            hidden_size=config.HIDDEN_SIZE,
+            worker_id=index,
+            state=state,
+            seed_genomes=seed_genomes,
+        )
+    except Exception:
+        _report_failure(conn, traceback.format_exc())
+        buffer.close()
+        return
+
+    genomes = np.ndarray((2, genome_size(config)), dtype=np.float32, buffer=buffer.buf)
+
+    try:
+        while True:
+            command = conn.recv()
+            if command == "close":
+                break
+
+            if command == "inject_genome":
+                worker.inject_genome(genomes[1].copy())
+                continue
+
+            try:
+                conn.send((True, _island_reply(worker, genomes, command)))
+            except Exception:
+                conn.send((False, traceback.format_exc()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del genomes
+        buffer.close()
+
+
+class LocalBackend:
+    """Runs the islands as local processes connected by pipes.
+
+    Each island owns a shared memory block used to exchange genomes with the
+    driver, so weights are copied once into shared memory instead of being
+    pickled through the pipe. Only the small per-generation stats travel over
+    the pipe.
+
+    Attributes:
+        config (Config): Training configuration.
+
+    """
+
+    def __init__(self, config, states=None, seed_genomes=None):
+        """Start one process per island.
+
+        Args:
+            config (Config): Training configuration.
+            states (list | None): Saved state of every island to continue from.
+            seed_genomes (list | None): Genomes placed in the population of every new island.
+
+        """
+        self.config = config
+        self._size = genome_size(config)
+        self._buffers = []
+        self._genomes = []
+        self._conns = []
+        self._processes = []
+        self._pending = {}
+
+        for index in range(config.WORKERS):
+            buffer = shared_memory.SharedMemory(create=True, size=2 * self._size * np.dtype(np.float32).itemsize)
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_island_main,
+                args=(child_conn, config, buffer, index, states[index] if states else None, seed_genomes),
+                name=f"island-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+
+            self._buffers.append(buffer)
+            self._genomes.append(np.ndarray((2, self._size), dtype=np.float32, buffer=buffer.buf))
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+    def has_pending(self):
+        """Check whether any island is still running a generation.
+
+        Returns:
+            bool: True while at least one submitted run has not been collected.
+
+        """
+        return bool(self._pending)
+
+    def submit_run(self, index):
+        """Start the next generation on an island.
+
+        Args:
+            index (int): Island index.
+
+        """
+        self._conns[index].send("run")
+        self._pending[self._conns[index]] = index
+
+    def wait_result(self):
+        """Wait for any island to finish its generation.
+
+        Returns:
+            tuple: The island index and the stats returned by ``Worker.run``.
+
+        """
+        ready = connection.wait(list(self._pending))
+        index = self._pending.pop(ready[0])
+        return index, self._receive(index)
+
+    def publish_best(self, index):
+        """Copy an island's best genome out of its shared buffer.
+
+        Args:
+            index (int): Island index; it must not be running a generation.
+
+        Returns:
+            np.ndarray: Driver-owned copy of the genome.
+
+        """
+        self._conns[index].send("publish_best")
+        self._receive(index)
+        return self._genomes[index][0].copy()
+
+    def fetch_genome(self, handle):
+        """Return the genome behind a handle from ``publish_best``.
+
+        Args:
+            handle (np.ndarray): Genome returned by ``publish_best``.
+
+        Returns:
+            np.ndarray: The genome.
+
+        """
+        return handle
+
+    def inject_genome(self, index, handle):
+        """Queue a migrant genome on an idle island.
+
+        The island's inbox is only rewritten after the island reports its next
+        result, by which time it has consumed this command.
+
+        Args:
+            index (int): Island index; it must not be running a generation.
+            handle (np.ndarray): Genome returned by ``publish_best``.
+
+        """
+        self._genomes[index][1] = handle
+        self._conns[index].send("inject_genome")
+
+    def fetch_state(self, index):
+        """Capture an idle island's full state.
+
+        Args:
+            index (int): Island index; it must not be running a generation.
+
+        Returns:
+            dict: State returned by ``Worker.get_state``.
+
+        """
+        self._conns[index].send("get_state")
+        return self._receive(index)
+
+    def close(self):
+        """Stop the island processes and release their shared memory."""
+        for conn in self._conns:
+            try:
+                conn.send("close")
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+
+        self._genomes.clear()
+        for buffer in self._buffers:
+            buffer.close()
+            buffer.unlink()
+        self._buffers.clear()
+
+    def _receive(self, index):
+        ok, reply = self._conns[index].recv()
+        if not ok:
+            raise RuntimeError(f"Island {index} failed:\n{reply}")
+        return reply
+
+
+class RayBackend:
+    """Runs the islands as Ray actors.
+
+    Published genomes stay in the Ray object store; the driver only fetches
+    them when it needs the weights itself, and migrants are handed to the
+    receiving actor by reference.
+
+    Attributes:
+        config (Config): Training configuration.
+
+    """
+
+    def __init__(self, config, states=None, seed_genomes=None):
+        """Initialise Ray and start one actor per island.
+
+        Args:
+            config (Config): Training configuration.
+            states (list | None): Saved state of every island to continue from.
+            seed_genomes (list | None): Genomes placed in the population of every new island.
+
+        """
+        import ray
+
+        os.environ["RAY_DISABLE_MEMORY_MONITOR"] = "1"
+        logging.getLogger("ray.core_worker").setLevel(logging.CRITICAL)
+        logging.getLogger("ray._raylet").setLevel(logging.CRITICAL)
+
+        ray.init(log_to_driver=False, ignore_reinit_error=True)
+
+        self.config = config
+        self._ray = ray
+        actor = ray.remote(Worker)
+        self._workers = [
+            actor.remote(
+                config,
+                pop_size=config.POPULATION_SIZE,
+                hidden_size=config.HIDDEN_SIZE,
+                worker_id=index,
+                state=states[index] if states else None,
+                seed_genomes=seed_genomes,
+            )
+            for index in range(config.WORKERS)
+        ]
+        self._pending = {}
+
+    def has_pending(self):
+        """Check whether any island is still running a generation.
+
+        Returns:
+            bool: True while at least one submitted run has not been collected.
+
+        """
+        return bool(self._pending)
+
+    def submit_run(self, index):
+        """Start the next generation on an island.
+
+        Args:
+            index (int): Island index.
+
+        """
+        self._pending[self._workers[index].run.remote()] = index
+
+    def wait_result(self):
+        """Wait for any island to finish its generation.
+
+        Returns:
+            tuple: The island index and the stats returned by ``Worker.run``.
+
+        """
+        done, _ = self._ray.wait(list(self._pending), num_returns=1)
+        index = self._pending.pop(done[0])
+        return index, self._ray.get(done[0])
+
+    def publish_best(self, index):
+        """Publish an island's best genome to the object store.
+
+        Args:
+            index (int): Island index.
+
+        Returns:
+            ray.ObjectRef: Reference to the genome.
+
+        """
+        return self._workers[index].publish_best.remote()
+
+    def fetch_genome(self, handle):
+        """Fetch a published genome from the object store.
+
+        Args:
+            handle (ray.ObjectRef): Reference returned by ``publish_best``.
+
+        Returns:
+            np.ndarray: The genome.
+
+        """
+        return self._ray.get(handle)
+
+    def inject_genome(self, index, handle):
+        """Queue a migrant genome on an island's actor.
+
+        Args:
+            index (int): Island index.
+            handle (ray.ObjectRef): Reference returned by ``publish_best``.
+
+        """
+        self._workers[index].inject_genome.remote(handle)
+
+    def fetch_state(self, index):
+        """Capture an island's full state.
+
+        Args:
+            index (int): Island index.
+
+        Returns:
+            dict: State returned by ``Worker.get_state``.
+
+        """
+        return self._ray.get(self._workers[index].get_state.remote())
+
+    def close(self):
+        """Shut Ray down."""
+        self._ray.shutdown()
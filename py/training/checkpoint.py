@@ -0,0 +1,253 @@
+"""Checkpoints of the training driver.
+
+``CheckpointWriter`` saves single networks on a background thread. Training
+state checkpoints hold everything needed to resume a run instead: every
+island's population as float64 genomes, its generation counter and the states
+of its ``random`` and ``np.random`` generators, plus the driver's progress and
+global best genome. They are written as uncompressed ``.npz`` archives (loaded
+without pickle), with the driver state stored as a JSON string.
+"""
+
+import hashlib
+import json
+import math
+import os
+import queue
+import random
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from py.training.neural import Neural
+from py.training.utils import MODEL_DTYPE, MODEL_SUFFIX, save_network
+
+
+def network_digest(network: Neural) -> str:
+    """Compute a content hash of a network's weights.
+
+    Args:
+        network (Neural): The network to hash.
+
+    Returns:
+        str: Hex digest that is equal for networks with identical float32 weights.
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for weights in (network.hidden_weights, network.output_weights):
+        array = np.ascontiguousarray(weights, dtype=MODEL_DTYPE)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class CheckpointWriter:
+    """Writes network checkpoints on a background thread.
+
+    Networks are snapshotted and queued by ``submit`` and written by a single
+    daemon thread, so the driver never blocks on disk I/O unless the bounded
+    queue is full. A network identical to the last one saved into the same
+    directory is skipped, and after every write only the ``keep`` newest model
+    files of that directory are retained.
+
+    Attributes:
+        keep (int): Number of checkpoints kept per directory (0 keeps everything).
+
+    """
+
+    def __init__(self, queue_size: int, keep: int) -> None:
+        """Start the writer thread.
+
+        Args:
+            queue_size (int): Maximum number of pending checkpoints before ``submit`` blocks.
+            keep (int): Number of checkpoints kept per directory (0 keeps everything).
+
+        """
+        self.keep = keep
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._last_digest = {}
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, network: Neural, filepath: str) -> bool:
+        """Queue a network to be saved.
+
+        Args:
+            network (Neural): The network to save. Its weights are copied immediately.
+            filepath (str): Destination path of the checkpoint.
+
+        Returns:
+            bool: True if the checkpoint was queued, False if it was skipped as a duplicate.
+
+        """
+        if network is None:
+            return False
+
+        snapshot = Neural.from_weights(
+            np.array(network.hidden_weights, dtype=MODEL_DTYPE),
+            np.array(network.output_weights, dtype=MODEL_DTYPE),
+            network.weight_range,
+        )
+        digest = network_digest(snapshot)
+        directory = Path(filepath).parent
+        if self._last_digest.get(directory) == digest:
+            return False
+
+        self._last_digest[directory] = digest
+        self._queue.put((snapshot, filepath))
+        return True
+
+    def close(self) -> None:
+        """Write all pending checkpoints and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            network, filepath = item
+            try:
+                save_network(network, filepath)
+                self._prune(Path(filepath).parent)
+            except Exception as e:
+                print(f"Checkpoint write failed: {e}", flush=True)
+
+    def _prune(self, directory: Path) -> None:
+        if self.keep <= 0:
+            return
+
+        checkpoints = sorted(directory.glob(f"*{MODEL_SUFFIX}"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in checkpoints[self.keep :]:
+            stale.unlink(missing_ok=True)
+
+
+STATE_FORMAT_VERSION = 1
+STATE_SUFFIX = ".npz"
+
+
+def capture_random_state() -> dict:
+    """Capture the states of the ``random`` and ``np.random`` generators of this process.
+
+    Returns:
+        dict: Generator states as arrays and scalars, restorable with ``restore_random_state``.
+
+    """
+    _, internal, gauss = random.getstate()
+    _, keys, position, has_gauss, cached_gauss = np.random.get_state()
+    return {
+        "py_random": np.asarray(internal, dtype=np.uint32),
+        "py_gauss": np.float64(math.nan if gauss is None else gauss),
+        "np_random": np.asarray(keys, dtype=np.uint32),
+        "np_random_pos": np.int64(position),
+        "np_gauss": np.float64(cached_gauss if has_gauss else math.nan),
+    }
+
+
+def restore_random_state(state: dict) -> None:
+    """Restore generator states captured by ``capture_random_state``.
+
+    Args:
+        state (dict): Captured generator states.
+
+    """
+    gauss = float(state["py_gauss"])
+    random.setstate((3, tuple(int(value) for value in state["py_random"]), None if math.isnan(gauss) else gauss))
+    cached_gauss = float(state["np_gauss"])
+    np.random.set_state(
+        (
+            "MT19937",
+            np.asarray(state["np_random"], dtype=np.uint32),
+            int(state["np_random_pos"]),
+            int(not math.isnan(cached_gauss)),
+            0.0 if math.isnan(cached_gauss) else cached_gauss,
+        )
+    )
+
+
+def save_training_state(path: Path, meta: dict, best_genome, islands: list) -> None:
+    """Write a training state checkpoint atomically.
+
+    Args:
+        path (Path): Destination ``.npz`` file; parent directories are created.
+        meta (dict): JSON-serialisable driver state.
+        best_genome (np.ndarray | None): Genome of the global best network.
+        islands (list): State of every island, as returned by ``Worker.get_state``.
+
+    """
+    arrays = {"meta": np.frombuffer(json.dumps({"format": STATE_FORMAT_VERSION, **meta}).encode(), dtype=np.uint8)}
+    if best_genome is not None:
+        arrays["best_genome"] = np.asarray(best_genome, dtype=MODEL_DTYPE)
+    for index, island in enumerate(islands):
+        for key, value in island.items():
+            arrays[f"island{index}.{key}"] = np.asarray(value)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(partial, path)
+
+
+def load_training_state(path: Path) -> tuple:
+    """Read a training state checkpoint.
+
+    Args:
+        path (Path): Checkpoint written by ``save_training_state``.
+
+    Returns:
+        tuple: The driver state (dict), the global best genome (or None) and the list of island states.
+
+    Raises:
+        ValueError: If the file is not a training state checkpoint of a supported version.
+
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if "meta" not in archive.files:
+            raise ValueError(f"{path} is not a training state checkpoint")
+        meta = json.loads(archive["meta"].tobytes())
+        if meta.get("format") != STATE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported training state format {meta.get('format')} in {path}")
+
+        best_genome = archive["best_genome"] if "best_genome" in archive.files else None
+        islands = [{} for _ in range(meta["workers"])]
+        for name in archive.files:
+            island, dot, key = name.partition(".")
+            if dot and island.startswith("island"):
+                islands[int(island[len("island") :])][key] = archive[name]
+    return meta, best_genome, islands
+
+
+def latest_training_state(directory: Path) -> Path | None:
+    """Find the most recently written training state checkpoint of a directory.
+
+    Args:
+        directory (Path): Checkpoint directory.
+
+    Returns:
+        Path | None: The newest checkpoint, or None if there is none.
+
+    """
+    states = sorted(Path(directory).glob(f"*{STATE_SUFFIX}"), key=lambda path: path.stat().st_mtime)
+    return states[-1] if states else None
+
+
+def prune_training_states(directory: Path, prefix: str, keep: int) -> None:
+    """Delete all but the newest checkpoints of one run.
+
+    Args:
+        directory (Path): Checkpoint directory.
+        prefix (str): File name prefix of the run's checkpoints.
+        keep (int): Number of checkpoints kept (0 keeps all).
+
+    """
+    if keep <= 0:
+        return
+    states = sorted(
+        Path(directory).glob(f"{prefix}*{STATE_SUFFIX}"), key=lambda path: path.stat().st_mtime, reverse=True
+    )
+    for stale in states[keep:]:
+        stale.unlink(missing_ok=True)
@@ -20,10 +20,28 @@ class Config:
         POP_RETENTION (float): Fraction of top performers to keep unchanged.
         POP_CHILDREN (float): Fraction of population to generate via crossover.
         POP_RANDOM (float): Fraction of population to randomly reinitialize.
+        SELECTION (str): Parent selection scheme, "roulette", "rank" or "tournament".
+        TOURNAMENT_SIZE (int): Contenders per parent in tournament selection.
         GENERATIONS (int): Total number of training generations.
         POPULATION_SIZE (int): Number of individuals in each worker's population.
         WORKERS (int): Number of parallel training workers.
         MIGRATION_INTERVAL (int): Generations between worker synchronizations.
+        BACKEND (str): Execution backend for the workers, "local" (multiprocessing) or "ray".
+        CHECKPOINT_QUEUE_SIZE (int): Pending checkpoint writes before the driver blocks.
+        CHECKPOINT_KEEP (int): Checkpoints kept in each checkpoint directory (0 keeps all).
+        STATE_CHECKPOINT_INTERVAL (int): Generations between full training state checkpoints (0 disables them).
+        STATE_CHECKPOINT_DIR (str): Directory of the training state checkpoints ``training.py --resume`` reads.
+        STATE_CHECKPOINT_KEEP (int): Training state checkpoints kept per run (0 keeps all).
+        PROFILE_TIMINGS (bool): Record and report per-phase timings of every generation.
+        PROFILE_GENERATION (int | None): Generation to run under cProfile in every worker (None disables it).
+        PROFILE_DIR (str): Directory for cProfile dumps, readable with ``pstats`` or snakeviz.
+        TELEMETRY_DIR (str): Directory of the per-run JSON lines logs with the stats of every generation.
+        PLOT_PROGRESS (bool): Save a progress plot when training finishes (see ``py/training/plot_training.py``).
+        RECORD_EPISODES (str | None): Directory to record every training game to, one episode file per worker
+            (None disables recording). A resumed run records to new ``worker{N}-{segment}.snkr`` files.
+            Recordings can be inspected with ``py/interface/replay.py``.
+        RECORD_FOOD_EVENTS (bool): Also store food placements in the recordings, so replays can be verified.
+        EVAL_CACHE_DIR (str): Directory of the cached results of ``py/training/evaluate.py``.
         FOOD_REWARD (float): Fitness reward for eating food.
         STEP_REWARD (float): Fitness reward per step survived.
 
@@ -45,10 +63,33 @@ class Config:
     POP_CHILDREN = 0.80
     POP_RANDOM = 0.1
 
+    SELECTION = "roulette"
+    TOURNAMENT_SIZE = 3
+
     GENERATIONS = 2000
     POPULATION_SIZE = 200
     WORKERS = 4
     MIGRATION_INTERVAL = 50
+    BACKEND = "local"
+
+    CHECKPOINT_QUEUE_SIZE = 8
+    CHECKPOINT_KEEP = 20
+
+    STATE_CHECKPOINT_INTERVAL = 50
+    STATE_CHECKPOINT_DIR = "py/training/checkpoints"
+    STATE_CHECKPOINT_KEEP = 3
+
+    PROFILE_TIMINGS = False
+    PROFILE_GENERATION = None
+    PROFILE_DIR = "py/training/profiles"
+
+    TELEMETRY_DIR = "py/training/logs"
+    PLOT_PROGRESS = False
+
+    RECORD_EPISODES = None
+    RECORD_FOOD_EVENTS = False
+
+    EVAL_CACHE_DIR = "py/training/eval_cache"
 
     FOOD_REWARD = 10
     STEP_REWARD = 0.001
@@ -0,0 +1,38 @@
+"""Convert saved JSON models to the compact binary model format."""
+
+import argparse
+import sys
+from pathlib import Path
+
+current_file_path = Path(__file__).resolve()
+project_root = current_file_path.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from py.training.utils import MODEL_SUFFIX, load_network, save_network  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert JSON snake models to the binary model format.")
+    parser.add_argument("models", nargs="+", help="JSON model files to convert")
+    parser.add_argument("--output-dir", help="directory for converted models (default: next to each source)")
+    args = parser.parse_args()
+
+    failures = 0
+    for model in args.models:
+        source = Path(model)
+        network = load_network(str(source))
+        if network is None:
+            failures += 1
+            continue
+
+        target_dir = Path(args.output_dir) if args.output_dir else source.parent
+        target = target_dir / source.with_suffix(MODEL_SUFFIX).name
+        save_network(network, str(target))
+        print(f"✓ {source} -> {target} ({target.stat().st_size} bytes)", flush=True)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
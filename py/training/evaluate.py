@@ -0,0 +1,360 @@
+"""Compare saved models on seeded headless games.
+
+Every player (a saved network, and optionally the heuristic controller or the
+native search controller) plays the same seeded games on headless engines,
+spread over all cores. A game ends on a collision, when the snake fills the
+board, or when the snake goes ``Config.MAX_STEPS`` steps without eating, as
+during training. No game runs longer than ``MAX_GAME_STEPS`` steps, so a single
+game cannot hold up a pool worker. The tool reports the score distribution, the
+game length and how the games ended.
+
+Results are cached in ``Config.EVAL_CACHE_DIR`` under the hash of the player
+(the model file contents), the board size, the seed range and the step limits,
+so comparing the same models again does not replay any game.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_file_path = Path(__file__).resolve()
+project_root = current_file_path.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from py import snake_lib as snakelib  # noqa: E402
+from py.training.config import Config  # noqa: E402
+from py.training.neural import Neural  # noqa: E402
+from py.training.utils import load_network  # noqa: E402
+
+interface_path = project_root / "py" / "interface"
+
+DIRECTIONS = [snakelib.Direction.UP, snakelib.Direction.DOWN, snakelib.Direction.LEFT, snakelib.Direction.RIGHT]
+DEATH_CAUSES = ("wall", "self", "starvation", "board_full", "step_limit")
+MAX_GAME_STEPS = 100_000
+PERCENTILES = (10, 90)
+
+
+class Player:
+    """A controller to evaluate, described so that it can be rebuilt in a pool process.
+
+    Attributes:
+        name (str): Name shown in the report.
+        kind (str): ``"network"``, ``"heuristic"`` or ``"search"``.
+        digest (str): Hash identifying the player in the cache.
+        network (tuple | None): ``(genome, input_size, hidden_size, output_size, weight_range)`` of a network.
+
+    """
+
+    def __init__(self, name, kind, digest, network=None):
+        """Describe a player.
+
+        Args:
+            name (str): Name shown in the report.
+            kind (str): ``"network"``, ``"heuristic"`` or ``"search"``.
+            digest (str): Hash identifying the player in the cache.
+            network (tuple | None): Genome and shape of a network player.
+
+        """
+        self.name = name
+        self.kind = kind
+        self.digest = digest
+        self.network = network
+
+    @classmethod
+    def from_model(cls, path):
+        """Load a saved network.
+
+        Args:
+            path (Path): JSON or binary model file.
+
+        Returns:
+            Player | None: The player, or None if the model could not be loaded.
+
+        """
+        network = load_network(str(path))
+        if network is None:
+            return None
+        shape = (len(network.inputs), len(network.hidden), len(network.outputs), network.weight_range)
+        return cls(path.name, "network", file_digest(path), (network.to_genome(), *shape))
+
+    @classmethod
+    def from_source(cls, kind, path):
+        """Describe a built-in controller, keyed by the file that implements it.
+
+        Args:
+            kind (str): ``"heuristic"`` or ``"search"``.
+            path (Path): Source or library file of the controller.
+
+        Returns:
+            Player: The player.
+
+        """
+        return cls(kind, kind, file_digest(path))
+
+    def build(self):
+        """Create the controller in the current process.
+
+        Returns:
+            Callable: Function mapping a game and its last step result to a direction.
+
+        """
+        if self.kind == "network":
+            genome, input_size, hidden_size, output_size, weight_range = self.network
+            network = Neural.from_genome(genome, input_size, hidden_size, output_size, weight_range)
+            return lambda game, state: DIRECTIONS[int(np.argmax(network.predict(state.distances)))]
+
+        if self.kind == "search":
+            search = snakelib.SearchController()
+            return lambda game, state: search.decide(game.snapshot())
+
+        if str(interface_path) not in sys.path:
+            sys.path.insert(0, str(interface_path))
+        from heuristicController import SnakeHeuristicAI
+
+        heuristic = SnakeHeuristicAI()
+        return lambda game, state: snakelib.Direction(int(heuristic.get_next_move(game_data(game.snapshot()))))
+
+
+def file_digest(path):
+    """Hash a file.
+
+    Args:
+        path (Path): File to hash.
+
+    Returns:
+        str: First 16 hex digits of the SHA-256 of the file contents.
+
+    """
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def game_data(snapshot):
+    """Convert a snapshot to the shared memory data the viewer's controllers expect.
+
+    Args:
+        snapshot (snakelib.GameSnapshot): Current state of a headless game.
+
+    Returns:
+        SnakeGameData: The same state as published by the engine.
+
+    """
+    from SnakeGameController import Direction, FoodType, GameState, SnakeGameData
+
+    body = snapshot.snake_body
+    return SnakeGameData(
+        version=snapshot.tick_count,
+        board_width=snapshot.width,
+        board_height=snapshot.height,
+        score=snapshot.score,
+        speed=1,
+        game_state=GameState.PLAYING,
+        food_position=snapshot.food_position,
+        food_type=FoodType.APPLE,
+        snake_head=body[0],
+        snake_length=len(body),
+        tick=snapshot.tick_count,
+        snake_body=body,
+        neural_vector=[],
+        snake_direction=Direction(int(snapshot.snake_direction)),
+    )
+
+
+def play_games(task):
+    """Play a range of seeded games with one player.
+
+    Args:
+        task (tuple): ``(player, width, height, first_seed, count, max_steps, max_game_steps)``.
+
+    Returns:
+        list: ``[seed, score, steps, death cause]`` of every game.
+
+    """
+    player, width, height, first_seed, count, max_steps, max_game_steps = task
+    choose = player.build()
+    game = snakelib.Game(width, height, ipc=False)
+
+    results = []
+    for seed in range(first_seed, first_seed + count):
+        state = game.reset(seed)
+        steps = 0
+        hungry = 0
+        while True:
+            state = game.step_game(choose(game, state))
+            steps += 1
+            hungry = 0 if state.fruit_picked_up else hungry + 1
+            if state.is_game_over or hungry >= max_steps or steps >= max_game_steps:
+                break
+
+        snapshot = game.snapshot()
+        head = snapshot.snake_body[0]
+        if not state.is_game_over:
+            cause = "starvation" if hungry >= max_steps else "step_limit"
+        elif head[0] >= width or head[1] >= height:
+            cause = "wall"
+        elif len(snapshot.snake_body) >= width * height:
+            cause = "board_full"
+        else:
+            cause = "self"
+        results.append([seed, snapshot.score, steps, cause])
+    return results
+
+
+def cache_path(cache_dir, player, width, height, first_seed, games, max_steps, max_game_steps):
+    """Path of the cached results of a player.
+
+    Args:
+        cache_dir (Path): Cache directory.
+        player (Player): The evaluated player.
+        width (int): Board width.
+        height (int): Board height.
+        first_seed (int): Seed of the first game.
+        games (int): Number of games.
+        max_steps (int): Steps without food after which a game ends.
+        max_game_steps (int): Steps after which a game ends.
+
+    Returns:
+        Path: The cache file.
+
+    """
+    seeds = f"seeds{first_seed}-{first_seed + games - 1}"
+    key = f"{player.kind}-{player.digest}-{width}x{height}-{seeds}-max{max_steps}-cap{max_game_steps}"
+    return Path(cache_dir) / f"{key}.json"
+
+
+def evaluate(
+    players, width, height, first_seed, games, max_steps, processes, cache_dir=None, max_game_steps=MAX_GAME_STEPS
+):
+    """Play every player's games, reading and writing the cache.
+
+    Args:
+        players (list): Players to evaluate.
+        width (int): Board width.
+        height (int): Board height.
+        first_seed (int): Seed of the first game.
+        games (int): Games per player.
+        max_steps (int): Steps without food after which a game ends.
+        processes (int): Pool processes.
+        cache_dir (Path | None): Cache directory, or None to always play the games.
+        max_game_steps (int): Steps after which a game ends.
+
+    Returns:
+        dict: Player name mapped to its ``[seed, score, steps, death cause]`` games.
+
+    """
+    results = {}
+    pending = []
+    for player in players:
+        path = (
+            cache_path(cache_dir, player, width, height, first_seed, games, max_steps, max_game_steps)
+            if cache_dir
+            else None
+        )
+        if path is not None and path.exists():
+            results[player.name] = json.loads(path.read_text())
+            print(f"✓ {player.name}: cached ({path.name})", flush=True)
+        else:
+            pending.append((player, path))
+
+    if pending:
+        chunk = max(1, games // (processes * 4))
+        tasks = [
+            (index, (player, width, height, seed, min(chunk, first_seed + games - seed), max_steps, max_game_steps))
+            for index, (player, _) in enumerate(pending)
+            for seed in range(first_seed, first_seed + games, chunk)
+        ]
+        played = [[] for _ in pending]
+        owners = [index for index, _ in tasks]
+        with multiprocessing.Pool(processes) as pool:
+            for index, games_played in zip(owners, pool.imap(play_games, [task for _, task in tasks]), strict=True):
+                played[index].extend(games_played)
+
+        for (player, path), player_games in zip(pending, played, strict=True):
+            results[player.name] = player_games
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(player_games))
+
+    return results
+
+
+def print_report(results):
+    """Print the score, length and death cause statistics of every player.
+
+    Args:
+        results (dict): Player name mapped to its games.
+
+    """
+    low, high = PERCENTILES
+    causes = "".join(f" {cause:>10}" for cause in DEATH_CAUSES)
+    print(
+        f"{'Player':<24} {'Games':>6} {'Mean':>8} {'Median':>8} {f'P{low}':>7} {f'P{high}':>7} {'Max':>6}"
+        f" {'Steps':>8}{causes}"
+    )
+    for name, games in results.items():
+        scores = np.array([game[1] for game in games])
+        steps = np.array([game[2] for game in games])
+        deaths = [game[3] for game in games]
+        shares = "".join(f" {deaths.count(cause) / len(games):>10.1%}" for cause in DEATH_CAUSES)
+        print(
+            f"{name:<24} {len(games):>6} {scores.mean():>8.1f} {np.median(scores):>8.1f}"
+            f" {np.percentile(scores, low):>7.1f} {np.percentile(scores, high):>7.1f} {scores.max():>6}"
+            f" {steps.mean():>8.1f}{shares}"
+        )
+
+
+def main():
+    config = Config()
+    parser = argparse.ArgumentParser(description="Compare saved snake models on seeded headless games.")
+    parser.add_argument("models", nargs="*", help="JSON or binary model files to evaluate")
+    parser.add_argument("--heuristic", action="store_true", help="also evaluate the heuristic controller")
+    parser.add_argument("--search", action="store_true", help="also evaluate the native search controller")
+    parser.add_argument("--games", type=int, default=100, help="games per player")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--width", type=int, default=config.WIDTH, help="board width")
+    parser.add_argument("--height", type=int, default=config.HEIGHT, help="board height")
+    parser.add_argument("--max-steps", type=int, default=config.MAX_STEPS, help="steps without food before a game ends")
+    parser.add_argument(
+        "--max-game-steps", type=int, default=MAX_GAME_STEPS, help="steps after which a game ends regardless"
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="pool processes")
+    parser.add_argument("--no-cache", action="store_true", help="play every game even if results are cached")
+    args = parser.parse_args()
+
+    players = []
+    for model in args.models:
+        player = Player.from_model(Path(model))
+        if player is None:
+            return 1
+        players.append(player)
+    if args.heuristic:
+        players.append(Player.from_source("heuristic", interface_path / "heuristicController.py"))
+    if args.search:
+        players.append(Player.from_source("search", snakelib.__file__))
+    if not players:
+        parser.error("nothing to evaluate: pass model files, --heuristic or --search")
+
+    cache_dir = None if args.no_cache else Path(config.EVAL_CACHE_DIR)
+    results = evaluate(
+        players,
+        args.width,
+        args.height,
+        args.seed,
+        args.games,
+        args.max_steps,
+        args.processes,
+        cache_dir,
+        args.max_game_steps,
+    )
+    print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
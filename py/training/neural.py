@@ -42,6 +42,85 @@ class Neural:
             [random.uniform(-weight_range, weight_range) for _ in range(hidden_size + 1)] for _ in range(output_size)
         ]
 
+    @classmethod
+    def from_weights(cls, hidden_weights, output_weights, weight_range):
+        """Build a network around existing weight matrices, skipping random initialisation.
+
+        Args:
+            hidden_weights: Input-to-hidden weights, one row per hidden neuron with the bias first.
+            output_weights: Hidden-to-output weights, one row per output neuron with the bias first.
+            weight_range (float): Maximum absolute value for weights.
+
+        Returns:
+            Neural: A network using the given weights (not copied).
+
+        """
+        network = cls.__new__(cls)
+        network.weight_range = weight_range
+        network.inputs = [0.0 for _ in range(len(hidden_weights[0]) - 1)]
+        network.hidden = [0.0 for _ in range(len(hidden_weights))]
+        network.hidden_weights = hidden_weights
+        network.outputs = [0.0 for _ in range(len(output_weights))]
+        network.output_weights = output_weights
+        return network
+
+    @staticmethod
+    def genome_size(input_size, hidden_size, output_size):
+        """Return the number of weights in a genome for the given layer sizes.
+
+        Args:
+            input_size (int): Number of input neurons.
+            hidden_size (int): Number of hidden layer neurons.
+            output_size (int): Number of output neurons.
+
+        Returns:
+            int: Length of the flat array returned by ``to_genome``.
+
+        """
+        return hidden_size * (input_size + 1) + output_size * (hidden_size + 1)
+
+    @classmethod
+    def from_genome(cls, genome, input_size, hidden_size, output_size, weight_range):
+        """Rebuild a network from a flat genome produced by ``to_genome``.
+
+        Args:
+            genome (np.ndarray): Flat weight array, hidden weights first.
+            input_size (int): Number of input neurons.
+            hidden_size (int): Number of hidden layer neurons.
+            output_size (int): Number of output neurons.
+            weight_range (float): Maximum absolute value for weights.
+
+        Returns:
+            Neural: A network owning a copy of the genome's weights.
+
+        Raises:
+            ValueError: If the genome length doesn't match the layer sizes.
+
+        """
+        split = hidden_size * (input_size + 1)
+        if len(genome) != cls.genome_size(input_size, hidden_size, output_size):
+            raise ValueError("Genome size doesn't match the network shape!")
+        hidden_weights = np.asarray(genome[:split], dtype=float).reshape(hidden_size, input_size + 1).tolist()
+        output_weights = np.asarray(genome[split:], dtype=float).reshape(output_size, hidden_size + 1).tolist()
+        return cls.from_weights(hidden_weights, output_weights, weight_range)
+
+    def to_genome(self):
+        """Flatten the weights into a single float32 array.
+
+        The hidden weight rows come first, followed by the output weight rows,
+        which is compact enough to ship between processes.
+
+        Returns:
+            np.ndarray: One-dimensional float32 array of all weights.
+
+        """
+        return np.concatenate(
+            (
+                np.asarray(self.hidden_weights, dtype=np.float32).ravel(),
+                np.asarray(self.output_weights, dtype=np.float32).ravel(),
+            )
+        )
+
     def predict(self, input):
         """Perform forward propagation to compute network output.
 
@@ -102,23 +181,16 @@ class Neural:
             Neural: A new network with weights randomly selected from both parents.
 
         """
-        child = Neural(len(self.inputs), len(self.hidden), len(self.outputs), self.weight_range)
-
-        for node in range(len(self.hidden_weights)):
-            for weight in range(len(self.hidden_weights[node])):
-                if random.random() < 0.5:
-                    child.hidden_weights[node][weight] = self.hidden_weights[node][weight]
-                else:
-                    child.hidden_weights[node][weight] = other.hidden_weights[node][weight]
-
-        for node in range(len(self.output_weights)):
-            for weight in range(len(self.output_weights[node])):
-                if random.random() < 0.5:
-                    child.output_weights[node][weight] = self.output_weights[node][weight]
-                else:
-                    child.output_weights[node][weight] = other.output_weights[node][weight]
-
-        return child
+        hidden_weights = np.asarray(self.hidden_weights)
+        output_weights = np.asarray(self.output_weights)
+        hidden_mask = np.random.random(hidden_weights.shape) < 0.5
+        output_mask = np.random.random(output_weights.shape) < 0.5
+
+        return Neural.from_weights(
+            np.where(hidden_mask, hidden_weights, other.hidden_weights).tolist(),
+            np.where(output_mask, output_weights, other.output_weights).tolist(),
+            self.weight_range,
+        )
 
     def sigmoid(self, x):
         """Sigmoid activation function.
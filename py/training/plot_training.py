@@ -0,0 +1,163 @@
+"""Plot training progress from a telemetry log.
+
+Reads the JSON lines log written by ``training.py`` (the newest log in
+``Config.TELEMETRY_DIR`` by default) and saves a plot of the best fitness of
+every worker and of the whole run. With ``--follow`` the log is read
+incrementally and the plot is refreshed while training is still running.
+matplotlib is only imported here, and the plot is only shown in a window with
+``--show``, so the tool also works on a headless machine.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+current_file_path = Path(__file__).resolve()
+project_root = current_file_path.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from py.training.config import Config  # noqa: E402
+from py.training.telemetry import TelemetryReader, latest_log  # noqa: E402
+
+
+class TrainingProgress:
+    """Fitness series collected from telemetry records.
+
+    Attributes:
+        workers (dict): Worker index mapped to ``(generations, best fitness)`` lists.
+        generations (list): Generations every worker has finished.
+        generation_best (list): Best fitness over all workers of each finished generation.
+
+    """
+
+    def __init__(self):
+        """Create empty series."""
+        self.workers = {}
+        self.generations = []
+        self.generation_best = []
+
+    def add(self, records):
+        """Append telemetry records to the series.
+
+        Args:
+            records (list): Records read from the log.
+
+        """
+        for record in records:
+            if record["type"] == "run":
+                self._truncate(record.get("start_generation", 0))
+            elif record["type"] == "worker":
+                gens, fitness = self.workers.setdefault(record["worker"], ([], []))
+                gens.append(record["gen"])
+                fitness.append(record["best_fitness"])
+            elif record["type"] == "generation":
+                self.generations.append(record["gen"])
+                self.generation_best.append(record["best_fitness"])
+
+    def _truncate(self, generation):
+        # A resumed run repeats the generations logged after its checkpoint.
+        for gens, fitness in self.workers.values():
+            kept = sum(gen < generation for gen in gens)
+            del gens[kept:], fitness[kept:]
+        kept = sum(gen < generation for gen in self.generations)
+        del self.generations[kept:], self.generation_best[kept:]
+
+
+def plot_progress(progress, output, show=False):
+    """Plot the fitness series and save the figure.
+
+    Args:
+        progress (TrainingProgress): Series to plot.
+        output (Path): Image file to write.
+        show (bool): Whether to also open the plot in a window (blocks until it is closed).
+
+    """
+    import matplotlib
+
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    workers = sorted(progress.workers)
+    fig, axes = plt.subplots(len(workers) + 1, 1, figsize=(12, 4 * (len(workers) + 1)), squeeze=False)
+    axes = axes[:, 0]
+
+    for axis, worker in zip(axes, workers, strict=False):
+        gens, fitness = progress.workers[worker]
+        axis.plot(gens, fitness, marker="o", label=f"Worker {worker}")
+        axis.set_ylabel("Best Fitness")
+        axis.set_title(f"Worker {worker} Progress")
+        axis.grid()
+        axis.legend()
+
+    axes[-1].plot(
+        progress.generations, progress.generation_best, marker="s", color="red", linewidth=2, label="Global Best"
+    )
+    axes[-1].set_xlabel("Generation")
+    axes[-1].set_ylabel("Best Fitness")
+    axes[-1].set_title("Global Best Fitness")
+    axes[-1].grid()
+    axes[-1].legend()
+
+    fig.tight_layout()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output, dpi=150)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def plot_log(log, output, show=False):
+    """Read a whole telemetry log and plot it.
+
+    Args:
+        log (Path): Telemetry log.
+        output (Path): Image file to write.
+        show (bool): Whether to also open the plot in a window.
+
+    """
+    progress = TrainingProgress()
+    progress.add(TelemetryReader(log).read())
+    plot_progress(progress, output, show)
+
+
+def main():
+    config = Config()
+    parser = argparse.ArgumentParser(description="Plot training progress from a telemetry log.")
+    parser.add_argument("log", nargs="?", help=f"telemetry log (default: newest log in {config.TELEMETRY_DIR})")
+    parser.add_argument("--output", default="py/training/models/training_progress.png", help="image file to write")
+    parser.add_argument("--show", action="store_true", help="also show the plot in a window")
+    parser.add_argument("--follow", action="store_true", help="keep reading the log and refresh the plot")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between refreshes with --follow")
+    args = parser.parse_args()
+
+    log = Path(args.log) if args.log else latest_log(config.TELEMETRY_DIR)
+    if log is None or not log.exists():
+        print("No telemetry log found.", file=sys.stderr)
+        return 1
+
+    output = Path(args.output)
+    if not args.follow:
+        plot_log(log, output, args.show)
+        print(f"✓ Plot of {log} saved to {output}")
+        return 0
+
+    reader = TelemetryReader(log)
+    progress = TrainingProgress()
+    try:
+        while True:
+            records = reader.read()
+            if records:
+                progress.add(records)
+                plot_progress(progress, output)
+                print(f"✓ {len(progress.generations)} generations plotted to {output}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
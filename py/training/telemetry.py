@@ -0,0 +1,107 @@
+"""Streaming training telemetry.
+
+The training driver appends one JSON object per line to a log file as results
+arrive, so nothing is accumulated in memory and a crashed run keeps everything
+up to its last generation. Every record has a ``"type"``:
+
+- ``"run"``: written once at start, with the main configuration values.
+- ``"worker"``: one worker generation (``worker``, ``gen``, ``best_fitness``,
+  ``avg_fitness`` and, with ``Config.PROFILE_TIMINGS``, ``timings``).
+- ``"generation"``: a generation every worker has finished (``gen``,
+  ``best_fitness`` over all workers and the ``global_best`` so far).
+
+All records also carry ``time``, the seconds since the start of the run.
+``TelemetryReader`` reads a log incrementally, also while it is being written.
+"""
+
+import json
+import time
+from pathlib import Path
+
+
+class TelemetryLog:
+    """Appends training records to a JSON lines file.
+
+    Attributes:
+        path (Path): The log file.
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Create the log file.
+
+        Args:
+            path (Path): Path of the new log; parent directories are created.
+
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._start = time.perf_counter()
+
+    def record(self, record_type: str, **fields) -> None:
+        """Append a record and flush it to the file.
+
+        Args:
+            record_type (str): Record type, stored under ``"type"``.
+            **fields: JSON-serialisable record fields.
+
+        """
+        entry = {"type": record_type, "time": round(time.perf_counter() - self._start, 3), **fields}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the log file."""
+        self._file.close()
+
+
+class TelemetryReader:
+    """Reads new records from a telemetry log on every call.
+
+    Only complete lines are returned; a record that is still being written is
+    picked up by the next ``read`` call.
+
+    Attributes:
+        path (Path): The log file.
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open a log for reading from its beginning.
+
+        Args:
+            path (Path): Path of the log.
+
+        """
+        self.path = Path(path)
+        self._offset = 0
+
+    def read(self) -> list:
+        """Read the records appended since the last call.
+
+        Returns:
+            list: Newly appended records as dictionaries.
+
+        """
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        return [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+
+
+def latest_log(directory: Path) -> Path | None:
+    """Find the most recently written log of a directory.
+
+    Args:
+        directory (Path): Directory containing ``*.jsonl`` logs.
+
+    Returns:
+        Path | None: The newest log, or None if there is none.
+
+    """
+    logs = sorted(Path(directory).glob("*.jsonl"), key=lambda path: path.stat().st_mtime)
+    return logs[-1] if logs else None
@@ -1,28 +1,33 @@
-"""Main training script for Snake AI using distributed genetic algorithms."""
+"""Main training script for Snake AI using distributed genetic algorithms.
 
-import logging
-import os
+Every ``Config.STATE_CHECKPOINT_INTERVAL`` generations the full training state
+is saved to ``Config.STATE_CHECKPOINT_DIR``, and ``--resume`` continues an
+interrupted run from the latest (or a given) checkpoint. ``--seed-models``
+starts the populations from existing model files instead of random networks.
+"""
+
+import argparse
 import sys
+import time
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-import numpy as np
-import ray
-
 current_file_path = Path(__file__).resolve()
 project_root = current_file_path.parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from py.training.backends import create_backend  # noqa: E402
+from py.training.checkpoint import (  # noqa: E402
+    CheckpointWriter,
+    latest_training_state,
+    load_training_state,
+    prune_training_states,
+    save_training_state,
+)
 from py.training.config import Config  # noqa: E402
-from py.training.utils import save_network  # noqa: E402
-from py.training.worker import Worker  # noqa: E402
-
-os.environ["RAY_DISABLE_MEMORY_MONITOR"] = "1"
-logging.getLogger("ray.core_worker").setLevel(logging.CRITICAL)
-logging.getLogger("ray._raylet").setLevel(logging.CRITICAL)
-
-ray.init(log_to_driver=False, ignore_reinit_error=True)
+from py.training.neural import Neural  # noqa: E402
+from py.training.telemetry import TelemetryLog  # noqa: E402
+from py.training.utils import load_network, save_network  # noqa: E402
 
 
 def print_config(config):
@@ -35,7 +40,7 @@ def print_config(config):
     print("=" * 60)
     print("SNAKE AI TRAINING - CONFIGURATION".center(60))
     print("=" * 60)
-    print(f"  Workers:                  {config.WORKERS}")
+    print(f"  Workers:                  {config.WORKERS} ({config.BACKEND})")
     print(f"  Population Size:          {config.POPULATION_SIZE}")
     print(f"  Generations:              {config.GENERATIONS}")
     print(f"  Hidden Layer Size:        {config.HIDDEN_SIZE}")
@@ -50,145 +55,476 @@ def print_config(config):
     print()
 
 
-def handle_migration(gen, config, workers, results, best_network, best_fit):
-    """Manage the migration of the best performing network across workers.
+def fetch_network(config, backend, genome):
+    """Rebuild a network on the driver from a published genome.
 
-    Synchronizes the global best network to all workers at specified intervals
-    to prevent local optima stagnation.
+    Args:
+        config (Config): Training configuration.
+        backend: Execution backend that published the genome.
+        genome: Handle returned by the backend's ``publish_best``.
+
+    Returns:
+        Neural: The network described by the genome.
+
+    """
+    return Neural.from_genome(
+        backend.fetch_genome(genome), config.INPUT_SIZE, config.HIDDEN_SIZE, config.OUTPUT_SIZE, config.WEIGHT_RANGE
+    )
+
+
+def network_shape(config):
+    """Return the shape identifying compatible populations.
 
     Args:
-        gen (int): Current generation number.
         config (Config): Training configuration.
-        workers (list): List of Ray worker handles.
-        results (list): List of results from workers for the current generation.
-        best_network (dict): The best network weights found so far globally.
-        best_fit (float): The best fitness score found so far globally.
-
-    """
-    if gen > 0 and gen % config.MIGRATION_INTERVAL == 0:
-        try:
-            mig_best_net = [result["best_network"] for result in results]
-            mig_global_best = mig_best_net[np.argmax([result["best_fitness"] for result in results])]
-            futures = [worker.inject_network.remote(mig_global_best) for worker in workers]
-            save_network(
-                mig_global_best,
-                f"py/training/models/autosaves/migration{gen}_{int(np.max([result['best_fitness'] for result in results]))}.json",  # noqa
-            )
-            save_network(best_network, f"py/training/models/best/best_network_gen{gen}_{best_fit}.json")
 
-            ray.get(futures, timeout=30)
-        except Exception as e:
-            print(f"Migration failed: {e}", flush=True)
+    Returns:
+        list: Workers, population size and network layer sizes.
 
+    """
+    return [config.WORKERS, config.POPULATION_SIZE, config.INPUT_SIZE, config.HIDDEN_SIZE, config.OUTPUT_SIZE]
 
-def process_generation(gen, config, workers, results, best_history, worker_history):
-    """Process the results of a single generation from all workers.
 
-    Aggregates statistics, updates history, prints progress, and tracks the global
-    best network.
+def load_seed_genomes(config, paths):
+    """Load the models a new run's populations are seeded with.
 
     Args:
-        gen (int): Current generation number.
         config (Config): Training configuration.
-        workers (list): List of Ray worker handles.
-        results (list): List of training results from workers.
-        best_history (list): Global history of best fitness scores.
-        worker_history (list): List of fitness histories for each worker.
+        paths (list): JSON or binary model files.
 
     Returns:
-        tuple: (best_network, best_fit) updated global bests.
+        list: Genome of every model.
+
+    Raises:
+        ValueError: If a model cannot be loaded or does not match the configured network shape.
 
     """
-    global_best = 0
-    best_fit = -1
-    best_network = None
+    genomes = []
+    for path in paths:
+        network = load_network(path)
+        if network is None:
+            raise ValueError(f"Cannot load seed model {path}")
+        shape = [len(network.inputs), len(network.hidden), len(network.outputs)]
+        if shape != network_shape(config)[2:]:
+            raise ValueError(f"Seed model {path} has layer sizes {shape}, expected {network_shape(config)[2:]}")
+        genomes.append(network.to_genome())
+    return genomes
 
-    handle_migration(gen, config, workers, results, best_network, best_fit)
 
-    output_lines = []
-    for worker, result in enumerate(results):
-        best_snake = result["best_network"]
-        max_fit = result["best_fitness"]
-        avg_fit = result["avg_fitness"]
-        output_lines.append(f"Worker {worker}: Gen {gen} | Max: {max_fit:.2f} | Avg: {avg_fit:.2f}")
+def load_resume_state(config, path):
+    """Load the training state checkpoint a run is resumed from.
+
+    Args:
+        config (Config): Training configuration.
+        path (str | None): Checkpoint file, or None for the newest one in ``Config.STATE_CHECKPOINT_DIR``.
+
+    Returns:
+        tuple: The driver state, the global best genome (or None) and the state of every island.
+
+    Raises:
+        FileNotFoundError: If there is no checkpoint to resume from.
+        ValueError: If the checkpoint was written with a different population or network shape.
+
+    """
+    path = Path(path) if path else latest_training_state(config.STATE_CHECKPOINT_DIR)
+    if path is None or not path.exists():
+        raise FileNotFoundError(f"No training state checkpoint to resume from in {config.STATE_CHECKPOINT_DIR}")
+
+    meta, best_genome, islands = load_training_state(path)
+    if meta["shape"] != network_shape(config):
+        raise ValueError(f"Checkpoint {path} has shape {meta['shape']}, expected {network_shape(config)}")
+    print(f"✓ Resuming from {path} at generation {meta['generation']}")
+    return meta, best_genome, islands
 
-        if max_fit > best_fit:
-            best_fit = max_fit
-            best_network = best_snake
 
-        if max_fit > global_best:
-            global_best = max_fit
+def write_training_state(config, run_name, gen, islands, best_network, best_fit, generation_fit, telemetry_path):
+    """Save the full training state after a generation every worker has finished.
 
-        worker_history[worker].append(max_fit)
-    best_history.append(global_best)
-    output_lines.append(f"\nGeneration {gen} complete. Generation Best: {global_best:.2f}. Global Best: {best_fit:.2f}")
+    Args:
+        config (Config): Training configuration.
+        run_name (str): Name of the run, used as the checkpoint file prefix.
+        gen (int): Generation the island states were captured after.
+        islands (list): State of every island.
+        best_network (Neural): The best network found so far.
+        best_fit (float): Fitness of ``best_network``.
+        generation_fit (float): Best fitness of the last completed generation.
+        telemetry_path (Path): Telemetry log of the run, continued on resume.
+
+    """
+    directory = Path(config.STATE_CHECKPOINT_DIR)
+    meta = {
+        "workers": config.WORKERS,
+        "shape": network_shape(config),
+        "generation": gen + 1,
+        "best_fit": best_fit,
+        "generation_fit": generation_fit,
+        "telemetry": str(telemetry_path),
+    }
+    best_genome = best_network.to_genome() if best_network is not None else None
+    save_training_state(directory / f"{run_name}_gen{gen + 1}.npz", meta, best_genome, islands)
+    prune_training_states(directory, f"{run_name}_gen", config.STATE_CHECKPOINT_KEEP)
+
+
+def handle_migration(gen, config, backend, index, best_genome, best_network, best_fit, checkpoints):
+    """Send the global best network to a worker that reached a migration point.
+
+    Migration is asynchronous: the migrant genome is queued on the worker
+    before its next run, so neither the driver nor any other worker waits for it.
+
+    Args:
+        gen (int): Generation the worker has just completed.
+        config (Config): Training configuration.
+        backend: Execution backend running the workers.
+        index (int): Index of the worker.
+        best_genome: Handle of the genome of ``best_network``, as returned by the backend.
+        best_network (Neural): The best network found so far across all workers.
+        best_fit (float): Fitness of ``best_network``.
+        checkpoints (CheckpointWriter): Background writer for checkpoint files.
+
+    """
+    if gen > 0 and gen % config.MIGRATION_INTERVAL == 0 and best_genome is not None:
+        backend.inject_genome(index, best_genome)
+        checkpoints.submit(best_network, f"py/training/models/autosaves/migration{gen}_{int(best_fit)}.bin")
+
+
+def record_generation_best(gen, fitness, config, generation_best, completed):
+    """Fold one worker's result into the per-generation best fitness.
+
+    Workers finish generations out of step with each other, so a generation is
+    only complete once every worker has reported it.
+
+    Args:
+        gen (int): Generation the result belongs to.
+        fitness (float): Best fitness the worker reached in that generation.
+        config (Config): Training configuration.
+        generation_best (dict): Pending generations mapped to ``[reports, best fitness]``.
+        completed (int): Number of generations completed so far.
+
+    Returns:
+        list: ``(gen, best fitness)`` of the generations completed by this result, in order.
+
+    """
+    entry = generation_best.setdefault(gen, [0, 0])
+    entry[0] += 1
+    entry[1] = max(entry[1], fitness)
+
+    done = []
+    while completed in generation_best and generation_best[completed][0] == config.WORKERS:
+        done.append((completed, generation_best.pop(completed)[1]))
+        completed += 1
+    return done
+
+
+def print_progress(config, latest, completed, generation_fit, best_fit, redraw):
+    """Print the latest result of every worker and the overall progress.
+
+    Args:
+        config (Config): Training configuration.
+        latest (list): Latest ``(gen, result)`` per worker, or None if it has not reported yet.
+        completed (int): Number of generations every worker has finished.
+        generation_fit (float): Best fitness of the last completed generation.
+        best_fit (float): The best fitness found so far across all workers.
+        redraw (bool): Whether to overwrite the previously printed block.
 
-    if gen > 0:
+    """
+    output_lines = []
+    for worker, entry in enumerate(latest):
+        if entry is None:
+            output_lines.append(f"Worker {worker}: starting")
+            continue
+        gen, result = entry
+        line = f"Worker {worker}: Gen {gen} | Max: {result['best_fitness']:.2f} | Avg: {result['avg_fitness']:.2f}"
+        if "timings" in result:
+            line += f" | {format_timings(result['timings'])}"
+        output_lines.append(line)
+
+    output_lines.append(
+        f"\nGenerations complete: {completed}/{config.GENERATIONS}. "
+        f"Generation Best: {generation_fit:.2f}. Global Best: {best_fit:.2f}"
+    )
+
+    if redraw:
         sys.stdout.write(f"\033[{len(output_lines) + 1}A")
         sys.stdout.flush()
 
     for line in output_lines:
         print(f"\033[2K{line}")
 
-    return best_network, best_fit
+
+def format_timings(timings):
+    """Format the phase timings of one generation for the progress display.
+
+    Args:
+        timings (dict): Timings returned by ``Worker.run`` with ``Config.PROFILE_TIMINGS``.
+
+    Returns:
+        str: One-line summary of the timings.
+
+    """
+    return (
+        f"{timings['steps_per_sec']:.0f} steps/s | eval {timings['eval']:.2f}s "
+        f"(nn {timings['inference']:.2f}s, step {timings['step']:.2f}s) | evolve {timings['evolve']:.2f}s | "
+        f"transfer {timings['transfer'] * 1000:.0f}ms"
+    )
+
+
+def add_timings(totals, timings):
+    """Accumulate the phase timings of one generation.
+
+    Args:
+        totals (dict): Running totals, updated in place.
+        timings (dict): Timings of one generation.
+
+    """
+    for phase, value in timings.items():
+        if phase != "steps_per_sec":
+            totals[phase] = totals.get(phase, 0) + value
 
 
-def plot_training_progress(config, best_history, worker_history):
-    """Generate and save training progress plots.
+def print_timing_summary(worker_totals, driver_timings):
+    """Print the accumulated phase timings of the whole run.
 
-    Creates subplots showing fitness progression for each worker and the global best.
+    Args:
+        worker_totals (list): Accumulated timings per worker.
+        driver_timings (dict): Time the driver spent in each of its phases.
+
+    """
+    print("=" * 60)
+    print("TIMINGS".center(60))
+    print("=" * 60)
+    for worker, totals in enumerate(worker_totals):
+        if not totals:
+            continue
+        print(
+            f"  Worker {worker}: {totals['steps']} steps in {totals['games']} games, "
+            f"{totals['steps'] / totals['eval']:.0f} steps/s"
+        )
+        print(
+            f"    eval {totals['eval']:.2f}s (nn {totals['inference']:.2f}s, step {totals['step']:.2f}s) | "
+            f"evolve {totals['evolve']:.2f}s | transfer {totals['transfer']:.2f}s"
+        )
+    print("  Driver: " + " | ".join(f"{phase} {seconds:.2f}s" for phase, seconds in driver_timings.items()))
+    print("=" * 60)
+
+
+def plot_training_progress(log):
+    """Save a plot of the run's progress next to the models.
+
+    matplotlib is only imported when a plot is requested.
+
+    Args:
+        log (Path): Telemetry log of the run.
+
+    """
+    from py.training.plot_training import plot_log
+
+    output = Path("py/training/models/training_progress.png")
+    plot_log(log, output)
+    print(f"✓ Progress plot saved to {output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train snake networks with an island genetic algorithm.")
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        metavar="CHECKPOINT",
+        help=f"continue from a training state checkpoint (default: the newest in {Config.STATE_CHECKPOINT_DIR})",
+    )
+    start.add_argument("--seed-models", nargs="+", metavar="MODEL", help="start every population from these models")
+    return parser.parse_args()
+
+
+def start_run(config, args):
+    """Determine where a run starts from the command line.
 
     Args:
         config (Config): Training configuration.
-        best_history (list): Global best fitness per generation.
-        worker_history (list): Per-worker fitness history.
+        args (argparse.Namespace): Parsed command line.
+
+    Returns:
+        dict: Starting generation, best network and fitness, island states, seed genomes and telemetry log.
 
     """
-    num_workers = config.WORKERS
-    fig, axes = plt.subplots(num_workers + 1, 1, figsize=(12, 4 * (num_workers + 1)))
+    run = {
+        "generation": 0,
+        "best_fit": -1,
+        "generation_fit": 0,
+        "best_genome": None,
+        "best_network": None,
+        "states": None,
+        "seed_genomes": None,
+        "telemetry": Path(config.TELEMETRY_DIR) / time.strftime("run_%Y%m%d_%H%M%S.jsonl"),
+    }
+    if args.seed_models:
+        run["seed_genomes"] = load_seed_genomes(config, args.seed_models)
+    if args.resume is None:
+        return run
+
+    meta, best_genome, run["states"] = load_resume_state(config, args.resume)
+    run.update(
+        generation=meta["generation"],
+        best_fit=meta["best_fit"],
+        generation_fit=meta["generation_fit"],
+        telemetry=Path(meta["telemetry"]),
+    )
+    if best_genome is not None:
+        run["best_genome"] = best_genome
+        run["best_network"] = Neural.from_genome(
+            best_genome, config.INPUT_SIZE, config.HIDDEN_SIZE, config.OUTPUT_SIZE, config.WEIGHT_RANGE
+        )
+    return run
+
+
+def save_final_network(best_network, best_fit):
+    """Save the best network of a finished run.
+
+    Args:
+        best_network (Neural | None): The best network found, or ``None`` when no result ever arrived.
+        best_fit (float): Fitness of ``best_network``.
 
-    for i in range(num_workers):
-        axes[i].plot(worker_history[i], marker="o", label=f"Worker {i}")
-        axes[i].set_ylabel("Best Fitness")
-        axes[i].set_title(f"Worker {i} Progress")
-        axes[i].grid()
-        axes[i].legend()
+    """
+    if best_network is None:
+        print("Training complete. No network was evaluated, so there is nothing to save.")
+        return
 
-    axes[-1].plot(best_history, marker="s", color="red", linewidth=2, label="Global Best")
-    axes[-1].set_xlabel("Generation")
-    axes[-1].set_ylabel("Best Fitness")
-    axes[-1].set_title("Global Best Fitness")
-    axes[-1].grid()
-    axes[-1].legend()
+    print("Training complete. Saving best network...")
+    save_network(best_network, f"py/training/models/network_{int(best_fit)}.bin")
 
-    plt.tight_layout()
-    plt.savefig("py/training/models/training_progress.png", dpi=150)
-    plt.show()
+
+def checkpoint_island(config, backend, index, gen, island_states, best_network, best_fit, generation_fit, telemetry):
+    """Collect an island's state after a checkpoint generation, and save the checkpoint once complete.
+
+    Islands finish generations out of step, so the state of each is captured
+    when it reports the checkpoint generation, while it is idle, and the
+    checkpoint is written when the last island has reported it.
+
+    Args:
+        config (Config): Training configuration.
+        backend: Execution backend running the workers.
+        index (int): Index of the idle worker that has just finished ``gen``.
+        gen (int): Generation the worker has just completed.
+        island_states (dict): Checkpoint generations mapped to the island states collected so far.
+        best_network (Neural): The best network found so far.
+        best_fit (float): Fitness of ``best_network``.
+        generation_fit (float): Best fitness of the last completed generation.
+        telemetry (Path): Telemetry log of the run.
+
+    """
+    if not config.STATE_CHECKPOINT_INTERVAL or (gen + 1) % config.STATE_CHECKPOINT_INTERVAL != 0:
+        return
+
+    islands = island_states.setdefault(gen, [None] * config.WORKERS)
+    islands[index] = backend.fetch_state(index)
+    if all(island is not None for island in islands):
+        write_training_state(
+            config, telemetry.stem, gen, island_states.pop(gen), best_network, best_fit, generation_fit, telemetry
+        )
 
 
 def main():
     config = Config()
-    workers = [
-        Worker.remote(config, pop_size=config.POPULATION_SIZE, hidden_size=config.HIDDEN_SIZE)
-        for _ in range(config.WORKERS)
-    ]
-    best_network = None
-    best_fit = -1
-    best_history = []
-    worker_history = [[] for _ in range(config.WORKERS)]
+    run = start_run(config, parse_args())
+    start = run["generation"]
+    best_network = run["best_network"]
+    best_fit = run["best_fit"]
+    best_genome = run["best_genome"]
+    generation_fit = run["generation_fit"]
+
+    generations = [start] * config.WORKERS
+    completed = start
+    generation_best = {}
+    island_states = {}
+    latest = [None] * config.WORKERS
+    redraw = False
+
+    driver_timings = {"wait": 0.0, "publish": 0.0, "checkpoint": 0.0, "migration": 0.0}
+    worker_totals = [{} for _ in range(config.WORKERS)]
+    submitted = [0.0] * config.WORKERS
 
     print_config(config)
 
-    for gen in range(config.GENERATIONS):
-        futures = [worker.run.remote() for worker in workers]
-        results = ray.get(futures)
-        best_network, best_fit = process_generation(gen, config, workers, results, best_history, worker_history)
+    telemetry = TelemetryLog(run["telemetry"])
+    telemetry.record(
+        "run",
+        workers=config.WORKERS,
+        generations=config.GENERATIONS,
+        population=config.POPULATION_SIZE,
+        hidden_size=config.HIDDEN_SIZE,
+        board=[config.WIDTH, config.HEIGHT],
+        backend=config.BACKEND,
+        start_generation=start,
+        seed_models=len(run["seed_genomes"] or []),
+    )
+    print(f"Telemetry: {telemetry.path}")
+
+    backend = create_backend(config, run["states"], run["seed_genomes"])
+    checkpoints = CheckpointWriter(config.CHECKPOINT_QUEUE_SIZE, config.CHECKPOINT_KEEP)
+    try:
+        for index in range(config.WORKERS if start < config.GENERATIONS else 0):
+            submitted[index] = time.perf_counter()
+            backend.submit_run(index)
+
+        while backend.has_pending():
+            wait_start = time.perf_counter()
+            index, result = backend.wait_result()
+            received = time.perf_counter()
+            driver_timings["wait"] += received - wait_start
+
+            if "timings" in result:
+                result["timings"]["transfer"] = received - submitted[index] - result["timings"]["run"]
+                add_timings(worker_totals[index], result["timings"])
+
+            gen = generations[index]
+            generations[index] += 1
+            latest[index] = (gen, result)
+            telemetry.record("worker", worker=index, gen=gen, **result)
+
+            if result["best_fitness"] > best_fit:
+                best_fit = result["best_fitness"]
+                phase_start = time.perf_counter()
+                best_genome = backend.publish_best(index)
+                best_network = fetch_network(config, backend, best_genome)
+                checkpoint_start = time.perf_counter()
+                checkpoints.submit(best_network, f"py/training/models/best/best_network_gen{gen}_{best_fit}.bin")
+                driver_timings["publish"] += checkpoint_start - phase_start
+                driver_timings["checkpoint"] += time.perf_counter() - checkpoint_start
+
+            for done_gen, done_fit in record_generation_best(
+                gen, result["best_fitness"], config, generation_best, completed
+            ):
+                completed += 1
+                generation_fit = done_fit
+                telemetry.record("generation", gen=done_gen, best_fitness=done_fit, global_best=best_fit)
+            phase_start = time.perf_counter()
+            handle_migration(gen, config, backend, index, best_genome, best_network, best_fit, checkpoints)
+            driver_timings["migration"] += time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            checkpoint_island(
+                config, backend, index, gen, island_states, best_network, best_fit, generation_fit, telemetry.path
+            )
+            driver_timings["checkpoint"] += time.perf_counter() - phase_start
+
+            if gen + 1 < config.GENERATIONS:
+                submitted[index] = time.perf_counter()
+                backend.submit_run(index)
 
-    print("Training complete. Saving best network...")
-    save_network(best_network, f"py/training/models/network_{int(best_fit)}.json")
-    plot_training_progress(config, best_history, worker_history)
+            print_progress(config, latest, completed, generation_fit, best_fit, redraw)
+            redraw = True
+    finally:
+        checkpoints.close()
+        backend.close()
+        telemetry.close()
+
+    if config.PROFILE_TIMINGS:
+        print_timing_summary(worker_totals, driver_timings)
 
-    ray.shutdown()
+    save_final_network(best_network, best_fit)
+    if config.PLOT_PROGRESS:
+        plot_training_progress(telemetry.path)
 
 
 if __name__ == "__main__":
@@ -1,28 +1,51 @@
-"""Utility functions for saving and loading neural network models."""
+"""Utility functions for saving and loading neural network models.
+
+Two on-disk formats are supported, selected by file suffix:
+
+* ``.json`` - the original human-readable format with nested weight lists.
+* ``.bin`` - a compact binary format: a fixed 32-byte little-endian header
+  (magic, format version, layer sizes, weight range) followed by the hidden and
+  output weight matrices as contiguous float32 rows. Weights are loaded through
+  ``np.memmap`` so opening a model does not parse or copy the tensors.
+"""
 
 import json
+import struct
 from pathlib import Path
 
+import numpy as np
+
 from py.training.neural import Neural
 
+MODEL_SUFFIX = ".bin"
+MODEL_MAGIC = b"SNKM"
+MODEL_FORMAT_VERSION = 1
+MODEL_HEADER = struct.Struct("<4sIIIIf8x")
+MODEL_DTYPE = np.dtype("<f4")
+
 
 def save_network(network: Neural, filepath: str) -> None:
-    """Save a neural network to a JSON file.
+    """Save a neural network to a JSON or binary model file.
 
     Args:
         network (Neural): The neural network to save.
-        filepath (str): Path where the network should be saved.
+        filepath (str): Path where the network should be saved. A ``.bin`` suffix
+            selects the binary format, anything else is written as JSON.
 
     """
     Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
+    if Path(filepath).suffix == MODEL_SUFFIX:
+        _save_binary(network, filepath)
+        return
+
     data = {
         "input_size": len(network.inputs),
         "hidden_size": len(network.hidden),
         "output_size": len(network.outputs),
         "weight_range": network.weight_range,
-        "hidden_weights": network.hidden_weights,
-        "output_weights": network.output_weights,
+        "hidden_weights": np.asarray(network.hidden_weights, dtype=float).tolist(),
+        "output_weights": np.asarray(network.output_weights, dtype=float).tolist(),
     }
 
     with open(filepath, "w") as f:
@@ -30,23 +53,23 @@ def save_network(network: Neural, filepath: str) -> None:
 
 
 def load_network(filepath: str) -> Neural:
-    """Load a neural network from a JSON file.
+    """Load a neural network from a JSON or binary model file.
 
     Args:
-        filepath (str): Path to the saved network JSON file.
+        filepath (str): Path to the saved network file.
 
     Returns:
         Neural: The loaded neural network, or None if loading fails.
 
     """
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
-
-        network = Neural(data["input_size"], data["hidden_size"], data["output_size"], data["weight_range"])
+        if Path(filepath).suffix == MODEL_SUFFIX:
+            network = _load_binary(filepath)
+        else:
+            with open(filepath, "r") as f:
+                data = json.load(f)
 
-        network.hidden_weights = data["hidden_weights"]
-        network.output_weights = data["output_weights"]
+            network = Neural.from_weights(data["hidden_weights"], data["output_weights"], data["weight_range"])
 
         print(f"✓ Loaded network from {filepath}", flush=True)
         return network
@@ -57,3 +80,45 @@ def load_network(filepath: str) -> Neural:
     except Exception as e:
         print(f"✗ Error loading network: {e}", flush=True)
         return None
+
+
+def _save_binary(network: Neural, filepath: str) -> None:
+    hidden_weights = np.asarray(network.hidden_weights, dtype=MODEL_DTYPE)
+    output_weights = np.asarray(network.output_weights, dtype=MODEL_DTYPE)
+    header = MODEL_HEADER.pack(
+        MODEL_MAGIC,
+        MODEL_FORMAT_VERSION,
+        len(network.inputs),
+        len(network.hidden),
+        len(network.outputs),
+        network.weight_range,
+    )
+
+    with open(filepath, "wb") as f:
+        f.write(header)
+        f.write(hidden_weights.tobytes())
+        f.write(output_weights.tobytes())
+
+
+def _load_binary(filepath: str) -> Neural:
+    with open(filepath, "rb") as f:
+        header = f.read(MODEL_HEADER.size)
+
+    if len(header) != MODEL_HEADER.size:
+        raise ValueError("truncated model header")
+
+    magic, version, input_size, hidden_size, output_size, weight_range = MODEL_HEADER.unpack(header)
+    if magic != MODEL_MAGIC:
+        raise ValueError("not a binary snake model")
+    if version != MODEL_FORMAT_VERSION:
+        raise ValueError(f"unsupported model format version {version}")
+
+    hidden_count = hidden_size * (input_size + 1)
+    output_count = output_size * (hidden_size + 1)
+    weights = np.memmap(
+        filepath, dtype=MODEL_DTYPE, mode="c", offset=MODEL_HEADER.size, shape=(hidden_count + output_count,)
+    )
+
+    hidden_weights = weights[:hidden_count].reshape(hidden_size, input_size + 1)
+    output_weights = weights[hidden_count:].reshape(output_size, hidden_size + 1)
+    return Neural.from_weights(hidden_weights, output_weights, float(weight_range))
@@ -1,68 +1,190 @@
-"""Ray worker for parallel genetic algorithm training."""
+"""Island worker for parallel genetic algorithm training."""
 
-import copy
+import cProfile
+import time
+from pathlib import Path
 
 import numpy as np
-import ray
 
 from py import snake_lib as snakelib
+from py.training.checkpoint import capture_random_state, restore_random_state
 from py.training.neural import Neural
 
 
-@ray.remote
 class Worker:
     """Distributed worker for training a population of neural networks.
 
-    This Ray remote class manages a population of neural networks, evaluates
-    their fitness by playing Snake, and evolves them using genetic algorithms.
+    Each worker is one island of the genetic algorithm, run in its own process
+    by an execution backend (see ``py.training.backends``). It manages a
+    population of neural networks, evaluates their fitness by playing Snake,
+    and evolves them using genetic algorithms.
 
     Attributes:
         gen_number (int): Current generation number.
+        worker_id (int): Index of this worker, used to name profile dumps.
         config (Config): Training configuration.
         pop_size (int): Size of the population.
         hidden_size (int): Size of hidden layer in networks.
         population (list): List of Neural networks in this worker.
-        games (list): List of Snake game instances.
+        best_network (Neural): Best network of the last evaluated generation.
+        games (list): Headless Snake games, reset and reused for the whole run.
+        recorder (snakelib.EpisodeRecorder | None): Episode file the games are recorded to
+            (only with ``Config.RECORD_EPISODES``).
         gamestates (list): Current game states for each individual.
         directions (list): Available movement directions.
+        timings (dict): Phase timings of the last generation (only with ``Config.PROFILE_TIMINGS``).
 
     """
 
-    def __init__(self, config, pop_size, hidden_size):
-        """Initialize worker with a random population.
+    def __init__(self, config, pop_size, hidden_size, worker_id=0, state=None, seed_genomes=None):
+        """Initialize worker with a random, seeded or restored population.
 
         Args:
             config (Config): Training configuration object.
             pop_size (int): Number of individuals in the population.
             hidden_size (int): Number of hidden neurons in each network.
+            worker_id (int): Index of this worker, used to name profile dumps.
+            state (dict | None): State captured by ``get_state`` to continue from.
+            seed_genomes (list | None): Genomes that replace the first individuals of a new population.
 
         """
+        # Forked islands inherit the driver's np.random state; give each its own.
+        np.random.seed()
         self.gen_number = 0
+        self.worker_id = worker_id
         self.config = config
         self.pop_size = pop_size
         self.hidden_size = hidden_size
         self.population = [
             Neural(config.INPUT_SIZE, hidden_size, config.OUTPUT_SIZE, config.WEIGHT_RANGE) for _ in range(pop_size)
         ]
-        self.games = [snakelib.Game(config.WIDTH, config.HEIGHT) for _ in range(pop_size)]
+        self.best_network = None
+        self.games = [snakelib.Game(config.WIDTH, config.HEIGHT, ipc=False) for _ in range(pop_size)]
+
+        self.recorder = None
+        if config.RECORD_EPISODES:
+            record_dir = Path(config.RECORD_EPISODES)
+            record_dir.mkdir(parents=True, exist_ok=True)
+            record_path = record_dir / f"worker{worker_id}.snkr"
+            # Opening a recording truncates it, so a resumed worker continues in the next free numbered file.
+            segment = 1
+            while state is not None and record_path.exists():
+                record_path = record_dir / f"worker{worker_id}-{segment}.snkr"
+                segment += 1
+            self.recorder = snakelib.EpisodeRecorder(record_path, record_food=config.RECORD_FOOD_EVENTS)
+            for game in self.games:
+                game.set_recorder(self.recorder)
 
-        self.gamestates = [game.initialize_game() for game in self.games]
         self.directions = [
             snakelib.Direction.UP,
             snakelib.Direction.DOWN,
             snakelib.Direction.LEFT,
             snakelib.Direction.RIGHT,
         ]
+        self.timings = {}
+
+        for index, genome in enumerate((seed_genomes or [])[:pop_size]):
+            self.population[index] = self._network(genome)
+        if state is not None:
+            self.set_state(state)
+        else:
+            self.reset_games()
+
+    def reset_games(self, seeds=None):
+        """Start a new game for every individual.
+
+        Args:
+            seeds (list | None): Game seeds; by default they are drawn from ``np.random``, so
+                the games of a restored worker repeat those of the original run.
+
+        """
+        if seeds is None:
+            seeds = np.random.randint(0, 2**32, size=self.pop_size, dtype=np.uint64)
+        self.gamestates = [game.reset(int(seed)) for game, seed in zip(self.games, seeds, strict=True)]
+
+    def get_state(self):
+        """Capture everything needed to continue this worker in another process.
+
+        Must be called between generations.
+
+        Returns:
+            dict: Generation counter, float64 population genomes, seeds of the current games and random states.
+
+        """
+        return {
+            "gen_number": np.int64(self.gen_number),
+            # Weights are kept in float64 so that a resumed run repeats the original exactly.
+            "population": np.stack(
+                [
+                    np.concatenate((np.ravel(network.hidden_weights), np.ravel(network.output_weights)))
+                    for network in self.population
+                ]
+            ),
+            "game_seeds": np.array([game.seed for game in self.games], dtype=np.uint32),
+            **capture_random_state(),
+        }
+
+    def set_state(self, state):
+        """Continue from a state captured by ``get_state``.
+
+        Args:
+            state (dict): The captured state.
+
+        Raises:
+            ValueError: If the population does not match this worker's size and network shape.
+
+        """
+        population = state["population"]
+        if population.shape != (
+            self.pop_size,
+            Neural.genome_size(self.config.INPUT_SIZE, self.hidden_size, self.config.OUTPUT_SIZE),
+        ):
+            raise ValueError(f"Saved population of shape {population.shape} does not match the configuration")
+
+        self.gen_number = int(state["gen_number"])
+        self.population = [self._network(genome) for genome in population]
+        restore_random_state(state)
+        self.reset_games(state["game_seeds"])
 
     def run(self):
         """Execute one generation: evaluate fitness and evolve population.
 
+        With ``Config.PROFILE_TIMINGS`` the returned statistics also contain the
+        phase timings of the generation under ``"timings"``. When the generation
+        equals ``Config.PROFILE_GENERATION`` it runs under cProfile and the
+        profile is written to ``Config.PROFILE_DIR``.
+
         Returns:
-            dict: Statistics including best network, best fitness, and average fitness.
+            dict: Statistics including best fitness and average fitness.
 
         """
+        gen = self.gen_number
+        profiler = None
+        if gen == self.config.PROFILE_GENERATION:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        start = time.perf_counter()
         fitness = self.eval()
+        evolve_start = time.perf_counter()
         stats = self.evolve(fitness)
+        end = time.perf_counter()
+
+        if profiler is not None:
+            profiler.disable()
+            profile_dir = Path(self.config.PROFILE_DIR)
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(profile_dir / f"worker{self.worker_id}_gen{gen}.prof")
+
+        if self.recorder is not None:
+            self.recorder.flush()
+
+        if self.config.PROFILE_TIMINGS:
+            self.timings["eval"] = evolve_start - start
+            self.timings["evolve"] = end - evolve_start
+            self.timings["run"] = end - start
+            self.timings["steps_per_sec"] = self.timings["steps"] / self.timings["eval"]
+            stats["timings"] = dict(self.timings)
         return stats
 
     def eval(self):
@@ -79,15 +201,25 @@ class Worker:
         active = [True] * self.pop_size
         steps = [0] * self.pop_size
         survived_steps = [0] * self.pop_size
+        timed = self.config.PROFILE_TIMINGS
+        inference_time = 0.0
+        step_time = 0.0
         while any(active):
             for i in range(self.pop_size):
                 if not active[i]:
                     continue
+                if timed:
+                    inference_start = time.perf_counter()
                 inputs = self.gamestates[i].distances
                 outputs = self.population[i].predict(inputs)
                 direction = np.argmax(outputs)
 
+                if timed:
+                    step_start = time.perf_counter()
+                    inference_time += step_start - inference_start
                 self.gamestates[i] = self.games[i].step_game(self.directions[direction])
+                if timed:
+                    step_time += time.perf_counter() - step_start
 
                 if self.gamestates[i].fruit_picked_up:
                     fitness[i] += 1
@@ -100,6 +232,13 @@ class Worker:
                 survived_steps[i] += 1
 
         self.gen_number += 1
+        if timed:
+            self.timings = {
+                "inference": inference_time,
+                "step": step_time,
+                "steps": sum(survived_steps),
+                "games": self.pop_size,
+            }
         fitness = [
             fitness[i] * self.config.FOOD_REWARD + survived_steps[i] * self.config.STEP_REWARD
             for i in range(self.pop_size)
@@ -115,7 +254,7 @@ class Worker:
             fitness (list): Fitness scores for current population.
 
         Returns:
-            dict: Dictionary with best network, best fitness, and average fitness.
+            dict: Dictionary with best fitness and average fitness.
 
         """
         sorted_indices = np.argsort(fitness)[::-1]
@@ -132,17 +271,9 @@ class Worker:
         for i in range(num_retain):
             new_pop.append(sorted_population[i])
 
-        if np.max(sorted_fitness) > 0:
-            probabilities = sorted_fitness / np.sum(sorted_fitness)
-        else:
-            probabilities = np.ones(len(sorted_fitness)) / len(sorted_fitness)
-
-        for _ in range(num_children):
-            parents = np.random.choice(self.pop_size, size=2, p=probabilities)
-            p1 = sorted_population[parents[0]]
-            p2 = sorted_population[parents[1]]
-
-            child = p1.merge(p2)
+        parents = self.select_parents(sorted_fitness, num_children)
+        for first, second in parents:
+            child = sorted_population[first].merge(sorted_population[second])
             child.mutate(mutation_rate, self.config.MUTATION_VARIANCE)
             new_pop.append(child)
 
@@ -151,27 +282,79 @@ class Worker:
                 Neural(self.config.INPUT_SIZE, self.hidden_size, self.config.OUTPUT_SIZE, self.config.WEIGHT_RANGE)
             )
 
+        self.best_network = sorted_population[0]
         self.population = new_pop
-        self.games = [snakelib.Game(self.config.WIDTH, self.config.HEIGHT) for _ in range(self.pop_size)]
-        self.gamestates = [game.initialize_game() for game in self.games]
+        self.reset_games()
         return {
-            "best_network": sorted_population[0],
-            "best_fitness": sorted_fitness[0],
-            "avg_fitness": np.mean(sorted_fitness),
+            "best_fitness": float(sorted_fitness[0]),
+            "avg_fitness": float(np.mean(sorted_fitness)),
         }
 
-    def inject_network(self, network):
-        """Inject a migrated network into the population.
+    def select_parents(self, sorted_fitness, count):
+        """Draw the parent pairs for a whole generation at once.
+
+        The selection scheme is chosen by ``Config.SELECTION``:
+
+        - ``"roulette"``: probability proportional to fitness (uniform if no fitness is positive).
+        - ``"rank"``: probability proportional to rank, so the best gets ``pop_size`` shares and the worst one.
+        - ``"tournament"``: each parent is the fittest of ``Config.TOURNAMENT_SIZE`` uniformly drawn contenders.
+
+        Args:
+            sorted_fitness (np.ndarray): Fitness scores sorted from best to worst.
+            count (int): Number of parent pairs to draw.
+
+        Returns:
+            np.ndarray: Array of shape ``(count, 2)`` with indices into the sorted population.
+
+        Raises:
+            ValueError: If ``Config.SELECTION`` is not a known scheme.
+
+        """
+        selection = self.config.SELECTION
+        if selection == "tournament":
+            contenders = np.random.randint(0, self.pop_size, size=(count, 2, self.config.TOURNAMENT_SIZE))
+            return contenders.min(axis=2)
+
+        if selection == "rank":
+            weights = np.arange(self.pop_size, 0, -1, dtype=float)
+        elif selection == "roulette":
+            weights = sorted_fitness if np.max(sorted_fitness) > 0 else np.ones(self.pop_size)
+        else:
+            raise ValueError(f"Unknown selection scheme: {selection!r}")
+
+        return np.random.choice(self.pop_size, size=(count, 2), p=weights / np.sum(weights))
+
+    def publish_best(self):
+        """Return the genome of the best network of the last generation.
+
+        The networks themselves stay on the worker; only this flat array is
+        placed in the object store, and only when the driver asks for it.
+
+        Returns:
+            np.ndarray: Flat float32 genome (see ``Neural.to_genome``), or None before the first generation.
+
+        """
+        if self.best_network is None:
+            return None
+        return self.best_network.to_genome()
+
+    def _network(self, genome):
+        return Neural.from_genome(
+            genome, self.config.INPUT_SIZE, self.hidden_size, self.config.OUTPUT_SIZE, self.config.WEIGHT_RANGE
+        )
+
+    def inject_genome(self, genome):
+        """Inject a migrated genome into the population.
 
-        Replaces a random individual with the provided network (typically
-        the global best from another worker).
+        Replaces a random individual with a network rebuilt from the provided
+        genome (typically the global best from another worker).
 
         Args:
-            network (Neural): Network to inject into the population.
+            genome (np.ndarray): Flat float32 genome to inject into the population.
 
         """
         try:
             replace_idx = np.random.randint(0, self.pop_size)
-            self.population[replace_idx] = copy.deepcopy(network)
+            self.population[replace_idx] = self._network(genome)
         except Exception as e:
-            print(f"Error injecting network: {e}", flush=True)
+            print(f"Error injecting genome: {e}", flush=True)
@@ -1,13 +1,113 @@
+#include "Definitions.hpp"
+#include "Episode.hpp"
 #include "Game.hpp"
 
+#include <cstddef>
+#include <cstdlib>
 #include <exception>
 #include <iostream>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <utility>
 
-auto main(const int /*argc*/, const char* const /*argv*/[]) -> int
+namespace
+{
+
+/**
+ * @brief Command line options of the game executable.
+ *
+ *   --record FILE   record every played episode to FILE
+ *   --record-food   also store food events in the recording
+ *   --replay FILE   play back an episode of FILE instead of taking moves from the viewer
+ *   --episode N     index of the episode to play back (default: 0)
+ *   --late-ticks P  what to do with overdue ticks: skip (default) or catch-up
+ */
+struct Options
+{
+  std::string recordPath;
+  bool        recordFood = false;
+  std::string replayPath;
+  size_t      episode = 0;
+
+  SnakeGame::LateTickPolicy lateTickPolicy = SnakeGame::LateTickPolicy::SKIP;
+};
+
+auto parseLateTickPolicy(const std::string_view value) -> SnakeGame::LateTickPolicy
+{
+  if (value == "skip")
+  {
+    return SnakeGame::LateTickPolicy::SKIP;
+  }
+  if (value == "catch-up")
+  {
+    return SnakeGame::LateTickPolicy::CATCH_UP;
+  }
+  throw std::invalid_argument("Unknown late tick policy: " + std::string(value));
+}
+
+auto parseOptions(const int argc, const char* const argv[]) -> Options
+{
+  auto options = Options{};
+  for (int i = 1; i < argc; ++i)
+  {
+    const auto argument = std::string_view(argv[i]);
+    const auto hasValue = i + 1 < argc;
+
+    if (argument == "--record-food")
+    {
+      options.recordFood = true;
+    }
+    else if (argument == "--record" and hasValue)
+    {
+      options.recordPath = argv[++i];
+    }
+    else if (argument == "--replay" and hasValue)
+    {
+      options.replayPath = argv[++i];
+    }
+    else if (argument == "--episode" and hasValue)
+    {
+      options.episode = std::strtoull(argv[++i], nullptr, 10);
+    }
+    else if (argument == "--late-ticks" and hasValue)
+    {
+      options.lateTickPolicy = parseLateTickPolicy(argv[++i]);
+    }
+    else
+    {
+      throw std::invalid_argument("Unknown argument: " + std::string(argument));
+    }
+  }
+  return options;
+}
+
+}  // namespace
+
+auto main(const int argc, const char* const argv[]) -> int
 {
   try
   {
-    Game{}.run();
+    const auto options = parseOptions(argc, argv);
+
+    auto game = Game{};
+    game.setLateTickPolicy(options.lateTickPolicy);
+    if (not options.recordPath.empty())
+    {
+      game.setRecorder(std::make_shared<SnakeGame::EpisodeRecorder>(options.recordPath, options.recordFood));
+    }
+    if (not options.replayPath.empty())
+    {
+      auto episodes = SnakeGame::readEpisodes(options.replayPath);
+      if (options.episode >= episodes.size())
+      {
+        throw std::out_of_range("Episode " + std::to_string(options.episode) + " not found in " + options.replayPath);
+      }
+      game.startReplay(std::move(episodes[options.episode]));
+    }
+
+    game.run();
   }
   catch (const std::exception& e)
   {
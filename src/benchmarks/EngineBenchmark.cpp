@@ -0,0 +1,360 @@
+#include "Board.hpp"
+#include "Definitions.hpp"
+#include "Game.hpp"
+#include "SearchController.hpp"
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <cstdlib>
+#include <exception>
+#include <iostream>
+#include <string>
+#include <string_view>
+#include <utility>
+#include <vector>
+
+/**
+ * @file EngineBenchmark.cpp
+ * @brief Microbenchmarks of the engine's hot paths.
+ *
+ * Measures Game::step (which includes getNeuralInputs), a step followed by a grid observation, getNeuralInputs
+ * alone, a saveState/loadState round trip, Board::placeFood and a SearchController decision for several board sizes and
+ * snake lengths, and prints the results as a JSON array on stdout. Each benchmark runs up to --steps operations
+ * (default 200000) or one second, whichever comes first. The snake follows a Hamiltonian cycle of the board, so it
+ * never dies and its length only changes when it eats.
+ */
+
+namespace
+{
+
+using SnakeGame::Board;
+using SnakeGame::BoardDimensions;
+using SnakeGame::Coordinate;
+using SnakeGame::Direction;
+using SnakeGame::Game;
+using SnakeGame::GameSnapshot;
+using SnakeGame::GameState;
+using SnakeGame::SearchConfig;
+using SnakeGame::SearchController;
+
+using Clock = std::chrono::steady_clock;
+
+/// Steps after which the snake is restored to its initial length.
+constexpr uint32_t RESTORE_INTERVAL = 256;
+/// Wall time after which a benchmark stops even if it has not run all its operations.
+constexpr double TIME_BUDGET_SECONDS = 1.0;
+/// Shape of the searches measured; small enough for a batch to fit the time budget.
+constexpr SearchConfig SEARCH_CONFIG = {
+  .maxDepth = 4, .beamWidth = 4, .nodeBudget = 0, .timeBudgetMs = 0.0, .rolloutSteps = 0};
+/// Side of the grid observations measured, centered on the head.
+constexpr uint8_t GRID_WINDOW = 11;
+/// Operations run between two clock reads.
+constexpr uint64_t BATCH_SIZE = 256;
+
+struct BenchmarkResult
+{
+  std::string name;
+  uint64_t    operations;
+  double      seconds;
+};
+
+struct Scenario
+{
+  BoardDimensions boardSize;
+  uint16_t        snakeLength;
+};
+
+/**
+ * @brief Builds a Hamiltonian cycle of a board with an even height.
+ *
+ * Rows are swept back and forth over columns 1..width-1, and column 0 leads back
+ * to the start.
+ */
+auto buildCycle(const BoardDimensions boardSize) -> std::vector<Coordinate>
+{
+  const auto [width, height] = boardSize;
+
+  auto cycle = std::vector<Coordinate>{};
+  cycle.reserve(static_cast<size_t>(width) * height);
+
+  for (uint16_t y = 0; y < height; ++y)
+  {
+    for (uint16_t i = 1; i < width; ++i)
+    {
+      const auto x = (y % 2 == 0) ? i : static_cast<uint16_t>(width - i);
+      cycle.emplace_back(x, y);
+    }
+  }
+  for (auto y = static_cast<int>(height) - 1; y >= 0; --y)
+  {
+    cycle.emplace_back(0, static_cast<uint16_t>(y));
+  }
+
+  return cycle;
+}
+
+auto directionBetween(const Coordinate from, const Coordinate to) -> Direction
+{
+  if (to.first > from.first)
+  {
+    return Direction::RIGHT;
+  }
+  if (to.first < from.first)
+  {
+    return Direction::LEFT;
+  }
+  return to.second > from.second ? Direction::DOWN : Direction::UP;
+}
+
+/**
+ * @brief Builds a playing snapshot whose snake lies on the cycle with its head at cycle[length - 1].
+ */
+auto makeSnapshot(const std::vector<Coordinate>& cycle, const Scenario& scenario) -> GameSnapshot
+{
+  auto body = std::vector<Coordinate>{};
+  body.reserve(scenario.snakeLength);
+  for (auto i = static_cast<int>(scenario.snakeLength) - 1; i >= 0; --i)
+  {
+    body.push_back(cycle.at(static_cast<size_t>(i)));
+  }
+
+  const auto direction = body.size() > 1 ? directionBetween(body[1], body[0]) : Direction::RIGHT;
+  const auto food      = cycle.at((scenario.snakeLength + cycle.size() / 2) % cycle.size());
+
+  return {
+    .boardSize      = scenario.boardSize,
+    .snakeBody      = body,
+    .snakeDirection = direction,
+    .snakeGrowing   = false,
+    .foodPosition   = food,
+    .foodType       = SnakeGame::FoodType::APPLE,
+    .gameState      = GameState::PLAYING,
+    .score          = 0,
+    .speed          = 1,
+    .tickCount      = 0,
+    .rngState       = 0,
+  };
+}
+
+/**
+ * @brief Runs an operation in batches until maxOperations are done or the time budget is spent.
+ */
+template <typename Operation>
+auto measure(std::string name, const uint64_t maxOperations, Operation&& operation) -> BenchmarkResult
+{
+  auto operations = uint64_t{0};
+  auto elapsed    = std::chrono::duration<double>::zero();
+
+  const auto start = Clock::now();
+  while (operations < maxOperations and elapsed.count() < TIME_BUDGET_SECONDS)
+  {
+    for (uint64_t i = 0; i < BATCH_SIZE; ++i)
+    {
+      operation();
+    }
+    operations += BATCH_SIZE;
+    elapsed     = Clock::now() - start;
+  }
+
+  return {.name = std::move(name), .operations = operations, .seconds = elapsed.count()};
+}
+
+auto scenarioLabel(const Scenario& scenario) -> std::string
+{
+  return "[" + std::to_string(scenario.boardSize.first) + "x" + std::to_string(scenario.boardSize.second) +
+         ",len=" + std::to_string(scenario.snakeLength) + "]";
+}
+
+auto benchmarkStep(const Scenario& scenario, const uint64_t steps) -> BenchmarkResult
+{
+  const auto cycle    = buildCycle(scenario.boardSize);
+  const auto snapshot = makeSnapshot(cycle, scenario);
+
+  auto game = Game(scenario.boardSize, false);
+  game.loadState(snapshot);
+
+  auto head     = static_cast<size_t>(scenario.snakeLength) - 1;
+  auto sinceSet = uint32_t{0};
+
+  return measure("engine.step" + scenarioLabel(scenario), steps,
+                 [&]() -> void
+                 {
+                   const auto next   = (head + 1) % cycle.size();
+                   const auto result = game.step(directionBetween(cycle[head], cycle[next]));
+                   head              = next;
+
+                   if (result.isGameOver or ++sinceSet == RESTORE_INTERVAL)
+                   {
+                     game.loadState(snapshot);
+                     head     = static_cast<size_t>(scenario.snakeLength) - 1;
+                     sinceSet = 0;
+                   }
+                 });
+}
+
+auto benchmarkGridStep(const Scenario& scenario, const uint64_t steps) -> BenchmarkResult
+{
+  const auto cycle    = buildCycle(scenario.boardSize);
+  const auto snapshot = makeSnapshot(cycle, scenario);
+
+  auto game = Game(scenario.boardSize, false);
+  game.loadState(snapshot);
+
+  const auto shape    = game.getGridShape(GRID_WINDOW);
+  auto       grid     = std::vector<float>(shape[0] * shape[1] * shape[2]);
+  auto       head     = static_cast<size_t>(scenario.snakeLength) - 1;
+  auto       sinceSet = uint32_t{0};
+
+  return measure("engine.step_grid_observation" + scenarioLabel(scenario), steps,
+                 [&]() -> void
+                 {
+                   const auto next   = (head + 1) % cycle.size();
+                   const auto result = game.step(directionBetween(cycle[head], cycle[next]));
+                   game.writeGrid(grid.data(), GRID_WINDOW);
+                   head = next;
+
+                   if (result.isGameOver or ++sinceSet == RESTORE_INTERVAL)
+                   {
+                     game.loadState(snapshot);
+                     head     = static_cast<size_t>(scenario.snakeLength) - 1;
+                     sinceSet = 0;
+                   }
+                 });
+}
+
+auto benchmarkNeuralInputs(const Scenario& scenario, const uint64_t iterations) -> BenchmarkResult
+{
+  auto game = Game(scenario.boardSize, false);
+  game.loadState(makeSnapshot(buildCycle(scenario.boardSize), scenario));
+
+  auto checksum = 0.0F;
+  auto result   = measure("engine.neural_inputs" + scenarioLabel(scenario), iterations,
+                          [&]() -> void { checksum += game.getNeuralInputs()[0]; });
+
+  if (checksum < 0.0F)
+  {
+    std::cerr << checksum << '\n';
+  }
+  return result;
+}
+
+auto benchmarkSnapshot(const Scenario& scenario, const uint64_t iterations) -> BenchmarkResult
+{
+  auto game = Game(scenario.boardSize, false);
+  game.loadState(makeSnapshot(buildCycle(scenario.boardSize), scenario));
+
+  auto snapshot = GameSnapshot{};
+  return measure("engine.snapshot_restore" + scenarioLabel(scenario), iterations,
+                 [&]() -> void
+                 {
+                   game.saveState(snapshot);
+                   game.loadState(snapshot);
+                 });
+}
+
+auto benchmarkPlaceFood(const Scenario& scenario, const uint64_t iterations) -> BenchmarkResult
+{
+  const auto snapshot = makeSnapshot(buildCycle(scenario.boardSize), scenario);
+  const auto width    = static_cast<size_t>(scenario.boardSize.first);
+
+  // The game looks cells up in its occupancy grid, so placing food does not scan the snake.
+  auto occupied = std::vector<uint8_t>(width * scenario.boardSize.second);
+  for (const auto& segment : snapshot.snakeBody)
+  {
+    occupied[(segment.second * width) + segment.first] = 1;
+  }
+  const auto isOccupied = [&occupied, width](const Coordinate position) -> bool
+  { return occupied[(position.second * width) + position.first] != 0; };
+
+  auto       board     = Board(scenario.boardSize);
+  const auto freeCells = occupied.size() - snapshot.snakeBody.size();
+
+  return measure("engine.place_food" + scenarioLabel(scenario), iterations,
+                 [&]() -> void { board.placeFood(isOccupied, freeCells); });
+}
+
+auto benchmarkSearch(const Scenario& scenario, const uint64_t iterations) -> BenchmarkResult
+{
+  const auto snapshot = makeSnapshot(buildCycle(scenario.boardSize), scenario);
+
+  auto search   = SearchController(SEARCH_CONFIG);
+  auto checksum = uint64_t{0};
+  auto result   = measure("engine.search_decision" + scenarioLabel(scenario), iterations,
+                          [&]() -> void { checksum += static_cast<uint64_t>(search.decide(snapshot)); });
+
+  if (checksum == UINT64_MAX)
+  {
+    std::cerr << checksum << '\n';
+  }
+  return result;
+}
+
+void printResults(const std::vector<BenchmarkResult>& results)
+{
+  std::cout << "[\n";
+  for (size_t i = 0; i < results.size(); ++i)
+  {
+    const auto& result = results[i];
+    const auto  perOp  = result.seconds / static_cast<double>(result.operations);
+    std::cout << R"(  {"name": ")" << result.name << R"(", "operations": )" << result.operations << R"(, "seconds": )"
+              << result.seconds << R"(, "seconds_per_op": )" << perOp << R"(, "ops_per_sec": )" << 1.0 / perOp << "}"
+              << (i + 1 < results.size() ? ",\n" : "\n");
+  }
+  std::cout << "]\n";
+}
+
+auto parseSteps(const int argc, const char* const argv[]) -> uint64_t
+{
+  constexpr uint64_t defaultSteps = 200'000;
+  for (int i = 1; i + 1 < argc; ++i)
+  {
+    if (std::string_view(argv[i]) == "--steps")
+    {
+      return std::strtoull(argv[i + 1], nullptr, 10);
+    }
+  }
+  return defaultSteps;
+}
+
+}  // namespace
+
+auto main(const int argc, const char* const argv[]) -> int
+{
+  try
+  {
+    const auto steps = parseSteps(argc, argv);
+
+    const auto scenarios = std::vector<Scenario>{
+      {  .boardSize = {10, 10},     .snakeLength = 3},
+      {  .boardSize = {10, 10},    .snakeLength = 50},
+      {  .boardSize = {20, 20},     .snakeLength = 3},
+      {  .boardSize = {20, 20},   .snakeLength = 100},
+      {  .boardSize = {20, 20},   .snakeLength = 300},
+      {  .boardSize = {50, 50},     .snakeLength = 3},
+      {  .boardSize = {50, 50},   .snakeLength = 500},
+      {  .boardSize = {50, 50},  .snakeLength = 2000},
+      {.boardSize = {256, 256},     .snakeLength = 3},
+      {.boardSize = {256, 256}, .snakeLength = 20000},
+    };
+
+    auto results = std::vector<BenchmarkResult>{};
+    for (const auto& scenario : scenarios)
+    {
+      results.push_back(benchmarkStep(scenario, steps));
+      results.push_back(benchmarkGridStep(scenario, steps));
+      results.push_back(benchmarkNeuralInputs(scenario, steps));
+      results.push_back(benchmarkSnapshot(scenario, steps));
+      results.push_back(benchmarkPlaceFood(scenario, steps / 10));
+      results.push_back(benchmarkSearch(scenario, steps / 1000));
+    }
+
+    printResults(results);
+  }
+  catch (const std::exception& e)
+  {
+    std::cerr << "Error: " << e.what() << '\n';
+    return 1;
+  }
+  return 0;
+}
@@ -1,13 +1,25 @@
 #include "Definitions.hpp"
+#include "Episode.hpp"
 #include "Game.hpp"
+#include "SearchController.hpp"
 
 #include <pybind11/cast.h>
 #include <pybind11/detail/common.h>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/stl/filesystem.h>
 
+#include <array>
+#include <cstddef>
 #include <cstdint>
+#include <filesystem>
 #include <memory>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
 
 namespace Py = pybind11;
 
@@ -16,6 +28,257 @@ using StepResult      = SnakeGame::StepResult;
 using GameState       = SnakeGame::GameState;
 using Direction       = SnakeGame::Direction;
 using BoardDimensions = SnakeGame::BoardDimensions;
+using Coordinate      = SnakeGame::Coordinate;
+using FoodType        = SnakeGame::FoodType;
+using GameSnapshot    = SnakeGame::GameSnapshot;
+using Episode         = SnakeGame::Episode;
+using EpisodeRecorder = SnakeGame::EpisodeRecorder;
+using ReplayResult    = SnakeGame::ReplayResult;
+using NetworkPolicy   = SnakeGame::NetworkPolicy;
+using SearchConfig    = SnakeGame::SearchConfig;
+using SearchStats     = SnakeGame::SearchStats;
+using Search          = SnakeGame::SearchController;
+
+namespace
+{
+
+auto boardDimensions(const uint16_t width, const uint16_t height) -> BoardDimensions
+{
+  if (width < SnakeGame::MIN_BOARD_DIMENSION or height < SnakeGame::MIN_BOARD_DIMENSION or
+      width > SnakeGame::MAX_BOARD_DIMENSION or height > SnakeGame::MAX_BOARD_DIMENSION)
+  {
+    throw std::invalid_argument("Board width and height must be between " +
+                                std::to_string(SnakeGame::MIN_BOARD_DIMENSION) + " and " +
+                                std::to_string(SnakeGame::MAX_BOARD_DIMENSION));
+  }
+  return {width, height};
+}
+
+void checkOnBoard(const BoardDimensions boardSize, const Coordinate position, const std::string& name)
+{
+  if (position.first >= boardSize.first or position.second >= boardSize.second)
+  {
+    throw std::invalid_argument(name + " (" + std::to_string(position.first) + ", " + std::to_string(position.second) +
+                                ") is outside the board");
+  }
+}
+
+/**
+ * @brief Rejects snapshots that Game::loadState cannot restore safely.
+ *
+ * A game that ran into a wall is saved with its head past the edge, so the
+ * head of a GAME_OVER snapshot may lie off the board.
+ */
+void checkSnapshot(const GameSnapshot& snapshot)
+{
+  boardDimensions(snapshot.boardSize.first, snapshot.boardSize.second);
+  if (snapshot.snakeBody.empty())
+  {
+    throw std::invalid_argument("The snake body must not be empty");
+  }
+
+  const auto first = snapshot.gameState == GameState::GAME_OVER ? size_t{1} : size_t{0};
+  for (size_t i = first; i < snapshot.snakeBody.size(); ++i)
+  {
+    checkOnBoard(snapshot.boardSize, snapshot.snakeBody[i], "Snake segment");
+  }
+  checkOnBoard(snapshot.boardSize, snapshot.foodPosition, "Food position");
+}
+
+void restoreGame(Game& game, const GameSnapshot& snapshot)
+{
+  checkSnapshot(snapshot);
+  game.loadState(snapshot);
+}
+
+auto resetGame(Game& game, const std::optional<uint32_t> seed) -> StepResult
+{
+  if (seed)
+  {
+    game.reset(*seed);
+  }
+  else
+  {
+    game.reset();
+  }
+  return {
+    .distances     = game.getNeuralInputs(),
+    .isGameOver    = false,
+    .fruitPickedUp = false,
+  };
+}
+
+auto snapshotToTuple(const GameSnapshot& snapshot) -> Py::tuple
+{
+  return Py::make_tuple(snapshot.boardSize.first, snapshot.boardSize.second, snapshot.snakeBody,
+                        static_cast<uint8_t>(snapshot.snakeDirection), snapshot.snakeGrowing, snapshot.foodPosition,
+                        static_cast<uint8_t>(snapshot.foodType), static_cast<uint8_t>(snapshot.gameState),
+                        snapshot.score, snapshot.speed, snapshot.tickCount, snapshot.rngState);
+}
+
+auto snapshotFromTuple(const Py::tuple& state) -> GameSnapshot
+{
+  constexpr size_t stateSize = 12;
+  if (state.size() != stateSize)
+  {
+    throw std::runtime_error("Invalid Game state");
+  }
+
+  return {
+    .boardSize      = boardDimensions(state[0].cast<uint16_t>(), state[1].cast<uint16_t>()),
+    .snakeBody      = state[2].cast<std::vector<Coordinate>>(),
+    .snakeDirection = static_cast<Direction>(state[3].cast<uint8_t>()),
+    .snakeGrowing   = state[4].cast<bool>(),
+    .foodPosition   = state[5].cast<Coordinate>(),
+    .foodType       = static_cast<FoodType>(state[6].cast<uint8_t>()),
+    .gameState      = static_cast<GameState>(state[7].cast<uint8_t>()),
+    .score          = state[8].cast<uint16_t>(),
+    .speed          = state[9].cast<uint8_t>(),
+    .tickCount      = state[10].cast<uint32_t>(),
+    .rngState       = state[11].cast<uint64_t>(),
+  };
+}
+
+auto getGameState(const Game& game) -> Py::tuple
+{
+  return snapshotToTuple(game.saveState());
+}
+
+auto setGameState(const Py::tuple& state) -> std::unique_ptr<Game>
+{
+  const auto snapshot = snapshotFromTuple(state);
+  checkSnapshot(snapshot);
+
+  auto game = std::make_unique<Game>(snapshot.boardSize, false);
+  game->loadState(snapshot);
+  return game;
+}
+
+auto cloneGame(const Game& game) -> std::unique_ptr<Game>
+{
+  const auto snapshot = game.saveState();
+
+  auto clone = std::make_unique<Game>(snapshot.boardSize, false);
+  clone->loadState(snapshot);
+  return clone;
+}
+
+auto makeSnapshot(const uint16_t width, const uint16_t height, std::vector<Coordinate> snakeBody,
+                  const Direction snakeDirection, const Coordinate foodPosition, const uint16_t score,
+                  const uint32_t tickCount, const uint64_t rngState) -> GameSnapshot
+{
+  auto snapshot = GameSnapshot{
+    .boardSize      = {width, height},
+    .snakeBody      = std::move(snakeBody),
+    .snakeDirection = snakeDirection,
+    .snakeGrowing   = false,
+    .foodPosition   = foodPosition,
+    .foodType       = FoodType::APPLE,
+    .gameState      = GameState::PLAYING,
+    .score          = score,
+    .speed          = 1,
+    .tickCount      = tickCount,
+    .rngState       = rngState,
+  };
+  checkSnapshot(snapshot);
+  return snapshot;
+}
+
+auto makeSearch(const uint32_t maxDepth, const uint32_t beamWidth, const uint32_t nodeBudget, const double timeBudgetMs,
+                const uint32_t rolloutSteps) -> std::unique_ptr<Search>
+{
+  return std::make_unique<Search>(SearchConfig{
+    .maxDepth     = maxDepth,
+    .beamWidth    = beamWidth,
+    .nodeBudget   = nodeBudget,
+    .timeBudgetMs = timeBudgetMs,
+    .rolloutSteps = rolloutSteps,
+  });
+}
+
+auto getEpisodeActions(const Episode& episode) -> std::vector<Direction>
+{
+  auto actions = std::vector<Direction>{};
+  actions.reserve(episode.ticks);
+  for (uint32_t tick = 0; tick < episode.ticks; ++tick)
+  {
+    actions.push_back(episode.getAction(tick));
+  }
+  return actions;
+}
+
+auto getEpisodeFoodEvents(const Episode& episode) -> Py::list
+{
+  auto events = Py::list{};
+  for (const auto& event : episode.foodEvents)
+  {
+    events.append(Py::make_tuple(event.tick, event.position, static_cast<uint8_t>(event.type)));
+  }
+  return events;
+}
+
+template <typename T>
+using GridBuffer = Py::array_t<T, Py::array::c_style>;
+
+template <typename T>
+void checkGridBuffer(const GridBuffer<T>& output, const std::vector<size_t>& shape)
+{
+  auto matches = static_cast<size_t>(output.ndim()) == shape.size();
+  for (size_t axis = 0; matches and axis < shape.size(); ++axis)
+  {
+    matches = static_cast<size_t>(output.shape(static_cast<Py::ssize_t>(axis))) == shape[axis];
+  }
+  if (not matches)
+  {
+    auto expected = std::string{};
+    for (const auto extent : shape)
+    {
+      expected += expected.empty() ? "(" : ", ";
+      expected += std::to_string(extent);
+    }
+    throw std::invalid_argument("Grid observation buffer must have shape " + expected + ")");
+  }
+}
+
+template <typename T>
+void observeGrid(Game& game, GridBuffer<T> output, const uint8_t size)
+{
+  const auto shape = game.getGridShape(size);
+  checkGridBuffer(output, {shape.begin(), shape.end()});
+
+  auto*      data    = output.mutable_data();
+  const auto release = Py::gil_scoped_release{};
+  game.writeGrid(data, size);
+}
+
+template <typename T>
+void observeGrids(const std::vector<Game*>& games, GridBuffer<T> output, const uint8_t size)
+{
+  if (games.empty())
+  {
+    throw std::invalid_argument("At least one game is needed");
+  }
+
+  const auto shape = games.front()->getGridShape(size);
+  for (const auto* game : games)
+  {
+    if (game->getGridShape(size) != shape)
+    {
+      throw std::invalid_argument("Batched games must have the same board size");
+    }
+  }
+  checkGridBuffer(output, {games.size(), shape[0], shape[1], shape[2]});
+
+  auto*      data    = output.mutable_data();
+  const auto stride  = shape[0] * shape[1] * shape[2];
+  const auto release = Py::gil_scoped_release{};
+  for (size_t i = 0; i < games.size(); ++i)
+  {
+    games[i]->writeGrid(data + (i * stride), size);
+  }
+}
+
+}  // namespace
 
 PYBIND11_MODULE(snake_lib, m)
 {
@@ -41,21 +304,108 @@ PYBIND11_MODULE(snake_lib, m)
     .def_readonly("is_game_over", &StepResult::isGameOver)
     .def_readonly("fruit_picked_up", &StepResult::fruitPickedUp);
 
+  Py::class_<GameSnapshot>(m, "GameSnapshot")
+    .def(Py::init<>())
+    .def(Py::init(&makeSnapshot), Py::arg("width"), Py::arg("height"), Py::arg("snake_body"),
+         Py::arg("snake_direction"), Py::arg("food_position"), Py::arg("score") = 0, Py::arg("tick_count") = 0,
+         Py::arg("rng_state") = 0)
+    .def_property_readonly("width", [](const GameSnapshot& snapshot) -> uint16_t { return snapshot.boardSize.first; })
+    .def_property_readonly("height", [](const GameSnapshot& snapshot) -> uint16_t { return snapshot.boardSize.second; })
+    .def_readonly("snake_body", &GameSnapshot::snakeBody)
+    .def_readonly("snake_direction", &GameSnapshot::snakeDirection)
+    .def_readonly("food_position", &GameSnapshot::foodPosition)
+    .def_readonly("game_state", &GameSnapshot::gameState)
+    .def_readonly("score", &GameSnapshot::score)
+    .def_readonly("tick_count", &GameSnapshot::tickCount)
+    .def(Py::pickle(&snapshotToTuple, &snapshotFromTuple));
+
+  Py::class_<SearchStats>(m, "SearchStats")
+    .def_readonly("nodes", &SearchStats::nodes)
+    .def_readonly("depth", &SearchStats::depth)
+    .def_readonly("elapsed_ms", &SearchStats::elapsedMs)
+    .def_readonly("value", &SearchStats::value);
+
+  Py::class_<Search>(m, "SearchController")
+    .def(Py::init(&makeSearch), Py::arg("max_depth") = 12, Py::arg("beam_width") = 32, Py::arg("node_budget") = 20000,
+         Py::arg("time_budget_ms") = 0.0, Py::arg("rollout_steps") = 0)
+    .def(
+      "set_policy",
+      [](Search& search, std::vector<float> genome, const size_t inputSize, const size_t hiddenSize,
+         const size_t outputSize) -> void
+      { search.setPolicy(NetworkPolicy(std::move(genome), inputSize, hiddenSize, outputSize)); },
+      Py::arg("genome"), Py::arg("input_size"), Py::arg("hidden_size"), Py::arg("output_size"),
+      "Roll out a network, given as a flat genome, from every searched state")
+    .def(
+      "clear_policy", [](Search& search) -> void { search.setPolicy(std::nullopt); }, "Remove the rollout policy")
+    .def("decide", &Search::decide, Py::arg("snapshot"), Py::call_guard<Py::gil_scoped_release>(),
+         "Search from a game state and return the move to play")
+    .def_property_readonly("last_stats", &Search::getLastStats);
+
+  Py::class_<Episode>(m, "Episode")
+    .def_property_readonly("width", [](const Episode& episode) -> uint16_t { return episode.boardSize.first; })
+    .def_property_readonly("height", [](const Episode& episode) -> uint16_t { return episode.boardSize.second; })
+    .def_readonly("seed", &Episode::seed)
+    .def_readonly("ticks", &Episode::ticks)
+    .def_readonly("score", &Episode::score)
+    .def_property_readonly("actions", &getEpisodeActions)
+    .def_property_readonly("food_events", &getEpisodeFoodEvents);
+
+  Py::class_<ReplayResult>(m, "ReplayResult")
+    .def_readonly("ticks", &ReplayResult::ticks)
+    .def_readonly("score", &ReplayResult::score)
+    .def_readonly("matches", &ReplayResult::matches);
+
+  Py::class_<EpisodeRecorder, std::shared_ptr<EpisodeRecorder>>(m, "EpisodeRecorder")
+    .def(Py::init<const std::filesystem::path&, bool>(), Py::arg("path"), Py::arg("record_food") = false)
+    .def("flush", &EpisodeRecorder::flush, "Flush recorded episodes to disk")
+    .def_property_readonly("records_food", &EpisodeRecorder::recordsFood)
+    .def_property_readonly("episode_count", &EpisodeRecorder::getEpisodeCount);
+
+  m.def("read_episodes", &SnakeGame::readEpisodes, Py::arg("path"), "Read every episode of an episode file");
+  m.def("replay_episode", &SnakeGame::replayEpisode, Py::arg("episode"), Py::call_guard<Py::gil_scoped_release>(),
+        "Re-simulate an episode on a headless game and return the outcome");
+
   Py::class_<Game>(m, "Game")
-    .def(Py::init([](const uint8_t width, const uint8_t height) -> auto
-                  { return std::make_unique<Game>(BoardDimensions{width, height}); }),
-         Py::arg("width") = 20, Py::arg("height") = 20)
+    .def(Py::init([](const uint16_t width, const uint16_t height, const bool ipc) -> auto
+                  { return std::make_unique<Game>(boardDimensions(width, height), ipc); }),
+         Py::arg("width") = 20, Py::arg("height") = 20, Py::arg("ipc") = true)
+    .def(
+      "initialize_game", [](Game& game) -> StepResult { return resetGame(game, std::nullopt); },
+      "Initialize/reset the game and return distances vector")
+    .def("reset", &resetGame, Py::arg("seed") = Py::none(),
+         "Reset the game in place without allocating and return distances vector")
+    .def_property_readonly("seed", &Game::getSeed)
+    .def("set_recorder", &Game::setRecorder, Py::arg("recorder").none(true),
+         "Record the following episodes to an EpisodeRecorder, or stop recording with None")
+    .def("step_game", &Game::step, Py::arg("direction"), "Step the game by one frame and return step result")
     .def(
-      "initialize_game",
-      [](Game& g) -> StepResult
+      "snapshot", [](const Game& game) -> GameSnapshot { return game.saveState(); },
+      "Capture the snake, food, random state, score and state of the game")
+    .def(
+      "snapshot_into", [](const Game& game, GameSnapshot& snapshot) -> void { game.saveState(snapshot); },
+      Py::arg("snapshot"), "Capture the game into an existing snapshot, reusing its storage")
+    .def("restore", &restoreGame, Py::arg("snapshot"), "Restore a state captured with snapshot()")
+    .def("clone", &cloneGame, "Return an independent headless copy of the game")
+    .def("__copy__", &cloneGame)
+    .def("__deepcopy__", [](const Game& game, const Py::dict& /*memo*/) -> auto { return cloneGame(game); })
+    .def(
+      "grid_shape",
+      [](const Game& game, const uint8_t size) -> Py::tuple
       {
-        g.reset();
-        return {
-          .distances     = g.getNeuralInputs(),
-          .isGameOver    = false,
-          .fruitPickedUp = false,
-        };
+        const auto shape = game.getGridShape(size);
+        return Py::make_tuple(shape[0], shape[1], shape[2]);
       },
-      "Initialize/reset the game and return distances vector")
-    .def("step_game", &Game::step, Py::arg("direction"), "Step the game by one frame and return step result");
+      Py::arg("size") = 0, "Shape of observe_grid() buffers: channels, rows and columns")
+    .def("observe_grid", &observeGrid<uint8_t>, Py::arg("out").noconvert(), Py::arg("size") = 0,
+         "Write the body, head, food and wall planes of the board, or of a size x size window centered on the head, "
+         "into a uint8 or float32 array")
+    .def("observe_grid", &observeGrid<float>, Py::arg("out").noconvert(), Py::arg("size") = 0)
+    .def(Py::pickle(&getGameState, &setGameState));
+
+  m.attr("GRID_CHANNELS")       = SnakeGame::GRID_CHANNELS;
+  m.attr("MIN_BOARD_DIMENSION") = SnakeGame::MIN_BOARD_DIMENSION;
+  m.attr("MAX_BOARD_DIMENSION") = SnakeGame::MAX_BOARD_DIMENSION;
+  m.def("observe_grids", &observeGrids<uint8_t>, Py::arg("games"), Py::arg("out").noconvert(), Py::arg("size") = 0,
+        "Write the grid observation of every game into one (games, channels, rows, columns) array");
+  m.def("observe_grids", &observeGrids<float>, Py::arg("games"), Py::arg("out").noconvert(), Py::arg("size") = 0);
 }
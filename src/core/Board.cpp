@@ -1,16 +1,31 @@
 #include "Board.hpp"
 #include "Definitions.hpp"
 
-#include <algorithm>
+#include <unistd.h>
+
+#include <cstddef>
 #include <cstdint>
-#include <deque>
 #include <random>
 
 namespace SnakeGame
 {
 
+auto FoodGenerator::randomSeed() -> uint64_t
+{
+  // Forked processes (e.g. training workers) would otherwise continue the same sequence.
+  thread_local auto owner    = pid_t{0};
+  thread_local auto sequence = FoodGenerator();
+  if (owner != ::getpid())
+  {
+    owner = ::getpid();
+    sequence.setState((static_cast<uint64_t>(std::random_device{}()) << 32U) ^ std::random_device{}());
+  }
+  return sequence();
+}
+
 Board::Board(const BoardDimensions dimensions)
-  : width_(dimensions.first), height_(dimensions.second), foodPosition_{0, 0}, foodType_(FoodType::APPLE)
+  : width_(dimensions.first), height_(dimensions.second), foodPosition_{0, 0}, foodType_(FoodType::APPLE),
+    generator_(FoodGenerator::randomSeed())
 {
   placeFood();
 }
@@ -21,15 +36,25 @@ void Board::placeFood()
   foodType_     = generateRandomFoodType();
 }
 
-void Board::placeFood(const std::deque<Coordinate>& snakeBody)
+void Board::setFood(const Coordinate position, const FoodType type) noexcept
 {
-  foodPosition_ = generateRandomPosition();
-  while (std::ranges::any_of(snakeBody, [this](const auto& segment) -> auto { return segment == foodPosition_; }))
-  {
-    foodPosition_ = generateRandomPosition();
-  }
+  foodPosition_ = position;
+  foodType_     = type;
+}
 
-  foodType_ = generateRandomFoodType();
+void Board::seed(const uint32_t seed)
+{
+  generator_.setState(seed);
+}
+
+auto Board::getGeneratorState() const noexcept -> uint64_t
+{
+  return generator_.getState();
+}
+
+void Board::setGeneratorState(const uint64_t state) noexcept
+{
+  generator_.setState(state);
 }
 
 auto Board::isFoodAt(const Coordinate position) const noexcept -> bool
@@ -52,34 +77,33 @@ auto Board::getFoodType() const noexcept -> FoodType
   return foodType_;
 }
 
-auto Board::getWidth() const noexcept -> uint8_t
+auto Board::getWidth() const noexcept -> uint16_t
 {
   return width_;
 }
 
-auto Board::getHeight() const noexcept -> uint8_t
+auto Board::getHeight() const noexcept -> uint16_t
 {
   return height_;
 }
 
-auto Board::generateRandomPosition() const -> Coordinate
+auto Board::generateRandomPosition() -> Coordinate
 {
   auto distX = std::uniform_int_distribution<>(0, width_ - 1);
   auto distY = std::uniform_int_distribution<>(0, height_ - 1);
-  return {distX(getGenerator()), distY(getGenerator())};
+  return {distX(generator_), distY(generator_)};
 }
 
-auto Board::generateRandomFoodType() -> FoodType
+auto Board::randomIndex(const size_t count) -> size_t
 {
-  auto dist = std::uniform_int_distribution<>(0, static_cast<int>(FoodType::COUNT) - 1);
-  return static_cast<FoodType>(dist(getGenerator()));
+  auto dist = std::uniform_int_distribution<size_t>(0, count - 1);
+  return dist(generator_);
 }
 
-auto Board::getGenerator() -> std::mt19937&
+auto Board::generateRandomFoodType() -> FoodType
 {
-  static auto seedDevice = std::random_device{};
-  static auto generator  = std::mt19937(seedDevice());
-  return generator;
+  auto dist = std::uniform_int_distribution<>(0, static_cast<int>(FoodType::COUNT) - 1);
+  return static_cast<FoodType>(dist(generator_));
 }
 
 }  // namespace SnakeGame
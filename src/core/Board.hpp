@@ -2,13 +2,70 @@
 
 #include "Definitions.hpp"
 
+#include <cstddef>
 #include <cstdint>
-#include <deque>
-#include <random>
+#include <limits>
 
 namespace SnakeGame
 {
 
+/**
+ * @brief Small random generator (SplitMix64) used to place food.
+ *
+ * Its whole state is a single 64-bit word, so a game's random state can be
+ * saved and restored as cheaply as the rest of a snapshot.
+ */
+class FoodGenerator
+{
+public:
+  using result_type = uint64_t;
+
+  explicit FoodGenerator(const uint64_t state = 0) noexcept : state_(state)
+  {
+  }
+
+  static constexpr auto min() noexcept -> result_type
+  {
+    return 0;
+  }
+
+  static constexpr auto max() noexcept -> result_type
+  {
+    return std::numeric_limits<result_type>::max();
+  }
+
+  auto operator()() noexcept -> result_type
+  {
+    auto value = (state_ += 0x9E3779B97F4A7C15ULL);
+    value      = (value ^ (value >> 30U)) * 0xBF58476D1CE4E5B9ULL;
+    value      = (value ^ (value >> 27U)) * 0x94D049BB133111EBULL;
+    return value ^ (value >> 31U);
+  }
+
+  auto getState() const noexcept -> uint64_t
+  {
+    return state_;
+  }
+
+  void setState(const uint64_t state) noexcept
+  {
+    state_ = state;
+  }
+
+  /**
+   * @brief Returns a fresh seed for a new generator.
+   *
+   * Seeds are drawn from a per-thread sequence that reads the system entropy
+   * source only once, so creating games and boards stays cheap.
+   *
+   * @return uint64_t A random seed.
+   */
+  static auto randomSeed() -> uint64_t;
+
+private:
+  uint64_t state_;
+};
+
 /**
  * @brief Manages the game board including dimensions, walls, and food placement.
  *
@@ -37,11 +94,89 @@ public:
   void placeFood();
 
   /**
-   * @brief Places food at a random position, avoiding the snake's body.
+   * @brief Places food at a random free position, avoiding occupied cells.
+   *
+   * Up to MAX_FOOD_DRAWS positions are drawn until one is free, so the
+   * generator advances exactly as it would for any other way of telling which
+   * cells the snake occupies. On a crowded board the food then goes to a cell
+   * picked uniformly among the free ones, so the cost stays bounded by the
+   * board size.
+   *
+   * @param isOccupied Predicate telling whether a position is taken by the snake.
+   * @param freeCells Number of positions for which isOccupied is false.
+   * @return true If the food was placed.
+   * @return false If there is no free cell left; the food is not moved.
+   */
+  template <typename IsOccupied>
+  auto placeFood(const IsOccupied& isOccupied, const size_t freeCells) -> bool
+  {
+    if (freeCells == 0)
+    {
+      return false;
+    }
+
+    for (uint32_t draw = 0; draw < MAX_FOOD_DRAWS; ++draw)
+    {
+      const auto position = generateRandomPosition();
+      if (not isOccupied(position))
+      {
+        foodPosition_ = position;
+        foodType_     = generateRandomFoodType();
+        return true;
+      }
+    }
+
+    auto skip = randomIndex(freeCells);
+    for (uint16_t y = 0; y < height_; ++y)
+    {
+      for (uint16_t x = 0; x < width_; ++x)
+      {
+        if (isOccupied(Coordinate{x, y}))
+        {
+          continue;
+        }
+        if (skip-- == 0)
+        {
+          foodPosition_ = {x, y};
+          foodType_     = generateRandomFoodType();
+          return true;
+        }
+      }
+    }
+    return false;
+  }
+
+  /**
+   * @brief Places food of the given type at an exact position.
+   *
+   * @param position The coordinate of the food.
+   * @param type The food variant.
+   */
+  void setFood(Coordinate position, FoodType type) noexcept;
+
+  /**
+   * @brief Reseeds the generator used for food positions and types.
+   *
+   * Two boards seeded with the same value place the same sequence of food for
+   * the same snake moves, which makes episodes reproducible.
+   *
+   * @param seed The new generator seed.
+   */
+  void seed(uint32_t seed);
+
+  /**
+   * @brief Gets the state of the food generator.
+   *
+   * @return uint64_t The generator state, to be passed to setGeneratorState().
+   */
+  auto getGeneratorState() const noexcept -> uint64_t;
+
+  /**
+   * @brief Restores a state previously returned by getGeneratorState().
    *
-   * @param snakeBody Collection of coordinates occupied by the snake.
+   * @param state The generator state.
    */
-  void placeFood(const std::deque<Coordinate>& snakeBody);
+  void setGeneratorState(uint64_t state) noexcept;
 
   /**
    * @brief Checks if food is at the specified position.
@@ -78,26 +213,27 @@ public:
   /**
    * @brief Gets the board width.
    *
-   * @return uint8_t The width in tiles.
+   * @return uint16_t The width in tiles.
    */
-  auto getWidth() const noexcept -> uint8_t;
+  auto getWidth() const noexcept -> uint16_t;
 
   /**
    * @brief Gets the board height.
    *
-   * @return uint8_t The height in tiles.
+   * @return uint16_t The height in tiles.
    */
-  auto getHeight() const noexcept -> uint8_t;
+  auto getHeight() const noexcept -> uint16_t;
 
 private:
-  uint8_t    width_;
-  uint8_t    height_;
-  Coordinate foodPosition_;
-  FoodType   foodType_;
-
-  auto        generateRandomPosition() const -> Coordinate;
-  static auto generateRandomFoodType() -> FoodType;
-  static auto getGenerator() -> std::mt19937&;
+  uint16_t      width_;
+  uint16_t      height_;
+  Coordinate    foodPosition_;
+  FoodType      foodType_;
+  FoodGenerator generator_;
+
+  auto generateRandomPosition() -> Coordinate;
+  auto randomIndex(size_t count) -> size_t;
+  auto generateRandomFoodType() -> FoodType;
 };
 
 }  // namespace SnakeGame
@@ -26,26 +26,36 @@ inline constexpr std::string_view DEFAULT_SHM_NAME = "/snake_game_shm";
 inline constexpr std::string_view DEFAULT_SOCKET_PATH = "/tmp/snake_game.sock";
 
 /// Default width of the game board in tiles.
-inline constexpr uint8_t DEFAULT_BOARD_WIDTH = 20;
+inline constexpr uint16_t DEFAULT_BOARD_WIDTH = 20;
 /// Default height of the game board in tiles.
-inline constexpr uint8_t DEFAULT_BOARD_HEIGHT = 20;
+inline constexpr uint16_t DEFAULT_BOARD_HEIGHT = 20;
+/// Smallest board width or height accepted from the interface.
+inline constexpr uint16_t MIN_BOARD_DIMENSION = 5;
+/// Largest board width or height; coordinates past it are reserved for positions outside the board.
+inline constexpr uint16_t MAX_BOARD_DIMENSION = 1024;
+/// Random positions Board::placeFood tries before it picks among the free cells directly.
+inline constexpr uint32_t MAX_FOOD_DRAWS = 64;
 
 /// Initial length of the snake at game start.
 inline constexpr uint16_t INITIAL_SNAKE_LENGTH = 3;
-/// Maximum allowable length of the snake.
-inline constexpr uint16_t SNAKE_MAX_LENGTH = 2048;
 
 /// Initial delay in milliseconds between game updates.
 inline constexpr uint16_t INITIAL_SPEED_DELAY_MS = 200;
 /// Amount to decrease delay per speed level increase.
 inline constexpr uint8_t SPEED_DECREASE_PER_LEVEL = 15;
+/// Tick rate multiplier value meaning "step as fast as possible".
+inline constexpr uint8_t UNLIMITED_TICK_RATE = 0;
+/// Most overdue ticks the CATCH_UP policy runs back to back; older deadlines are skipped.
+inline constexpr uint32_t MAX_CATCH_UP_TICKS = 5;
 
 /// Represents a 2D coordinate (x, y) on the board.
-using Coordinate = std::pair<uint8_t, uint8_t>;
+using Coordinate = std::pair<uint16_t, uint16_t>;
 /// Alias for board dimensions (width, height).
 using BoardDimensions = Coordinate;
 /// Neural network input vector with 12 float values.
 using NeuralInputs = std::array<float, 12>;
+/// Number of planes in a grid observation.
+inline constexpr size_t GRID_CHANNELS = 4;
 
 /**
  * @brief Enumeration of possible movement directions.
@@ -70,6 +80,15 @@ enum class GameState : uint8_t
   QUIT,       ///< Quit signal received.
 };
 
+/**
+ * @brief What the game loop does with tick deadlines that passed while it was busy.
+ */
+enum class LateTickPolicy : uint8_t
+{
+  SKIP,      ///< Run one tick now and skip the other overdue ones, keeping the original schedule.
+  CATCH_UP,  ///< Run up to MAX_CATCH_UP_TICKS overdue ticks back to back and skip the rest.
+};
+
 /**
  * @brief Enumeration of food types available in the game.
  */
@@ -97,6 +116,19 @@ enum class IpcCommands : uint8_t
   RESTART_GAME,       ///< Restart the current game.
   QUIT_GAME,          ///< Quit the game.
   CHANGE_BOARD_SIZE,  ///< Change board dimensions.
+  SET_TICK_RATE,      ///< Change the simulation speed multiplier.
+  RETURN_TO_MENU,     ///< End the current game and go back to the menu.
+};
+
+/**
+ * @brief Planes of a grid observation, in memory order.
+ */
+enum class GridChannel : uint8_t
+{
+  BODY,  ///< Snake segments other than the head.
+  HEAD,  ///< Snake head.
+  FOOD,  ///< Food.
+  WALL,  ///< Cells outside the board (only in grids centered on the head).
 };
 
 /**
@@ -109,46 +141,151 @@ struct StepResult
   bool         fruitPickedUp;  ///< True if snake ate food this step.
 };
 
-/// Array holding all coordinates of the snake's body.
-using SnakeBody = std::array<Coordinate, SNAKE_MAX_LENGTH>;
+/**
+ * @brief Complete state of a game episode, used to save and restore games.
+ */
+struct GameSnapshot
+{
+  BoardDimensions         boardSize;       ///< Board width and height.
+  std::vector<Coordinate> snakeBody;       ///< Snake body coordinates, head first.
+  Direction               snakeDirection;  ///< Current moving direction of the snake.
+  bool                    snakeGrowing;    ///< True if the snake grows on its next move.
+  Coordinate              foodPosition;    ///< Position of the food.
+  FoodType                foodType;        ///< Type of the food.
+  GameState               gameState;       ///< Current game state.
+  uint16_t                score;           ///< Current score.
+  uint8_t                 speed;           ///< Current speed level.
+  uint32_t                tickCount;       ///< Snake moves since the game started.
+  uint64_t                rngState;        ///< State of the board's food generator.
+};
 
 /**
  * @brief Shared data structure representing the current game state.
  *
- * This structure is used for inter-process communication via shared memory.
+ * This structure is used for inter-process communication via shared memory,
+ * where every frame stores it followed by the snake body coordinates.
  */
 struct GameSharedData
 {
-  uint8_t      boardWidth;      ///< Width of the board.
-  uint8_t      boardHeight;     ///< Height of the board.
+  uint16_t     boardWidth;      ///< Width of the board.
+  uint16_t     boardHeight;     ///< Height of the board.
   uint16_t     score;           ///< Current game score.
   uint8_t      speed;           ///< Current speed level.
   GameState    gameState;       ///< Current state of the game.
   Coordinate   foodPosition;    ///< Position of the food.
   FoodType     foodType;        ///< Type of the food.
   Coordinate   snakeHead;       ///< Position of the snake's head.
-  uint16_t     snakeLength;     ///< Length of the snake.
+  uint32_t     snakeLength;     ///< Length of the snake.
+  uint32_t     tickCount;       ///< Number of ticks simulated in the current game.
   NeuralInputs neuralVector;    ///< Neural network sensor inputs.
   Direction    snakeDirection;  ///< Current direction of the snake.
-  SnakeBody    snakeBody;       ///< All body segment coordinates.
 };
 
+/// Upper bounds (exclusive, in microseconds) of the tick duration histogram buckets; the last bucket is open.
+inline constexpr std::array<uint32_t, 7> TICK_HISTOGRAM_BOUNDS_US = {10, 50, 100, 500, 1000, 5000, 10000};
+/// Number of buckets in the tick duration histogram.
+inline constexpr size_t TICK_HISTOGRAM_BUCKETS = TICK_HISTOGRAM_BOUNDS_US.size() + 1;
+
 /**
- * @brief Shared memory layout with synchronization flags.
+ * @brief Engine health counters published in shared memory.
  *
- * This structure ensures safe concurrent access to game state between processes.
+ * All counters are cumulative since the engine started and are updated with
+ * relaxed atomics, so readers may observe them slightly out of step with each other.
  */
-struct SharedMemoryData
+struct EngineStats
 {
-  std::atomic<bool>     isWriting{false};  ///< Write lock flag.
-  std::atomic<uint32_t> version{0};        ///< Version counter for readers.
-  GameSharedData        gameData{};        ///< The actual game state data.
+  std::atomic<uint64_t> ticks{0};                  ///< Ticks simulated.
+  std::atomic<uint64_t> lateTicks{0};              ///< Ticks that finished after the next tick was due.
+  std::atomic<uint64_t> skippedTicks{0};           ///< Tick deadlines dropped without simulating them.
+  std::atomic<uint64_t> shmWrites{0};              ///< Frames written to shared memory.
+  std::atomic<uint64_t> commandsProcessed{0};      ///< Socket commands applied by the game loop.
+  std::atomic<uint64_t> commandsOverwritten{0};    ///< Commands replaced by a newer one before being applied.
+  std::atomic<uint64_t> commandLatencyTotalUs{0};  ///< Sum of receive-to-apply latencies of processed commands.
+  std::atomic<uint64_t> commandLatencyMaxUs{0};    ///< Largest receive-to-apply latency.
+  std::array<std::atomic<uint64_t>, TICK_HISTOGRAM_BUCKETS> tickDurationHistogram{};  ///< Tick processing times.
 };
 
-/// Size of the shared memory region in bytes.
-inline constexpr size_t SHARED_MEMORY_SIZE = sizeof(SharedMemoryData);
-/// Delay in milliseconds between shared memory write operations.
-inline constexpr int64_t SHARED_MEMORY_WRITE_DELAY = 200;
+/// Frames kept in the shared memory history ring on boards whose frames fit the ring budget.
+inline constexpr uint32_t SHARED_FRAME_HISTORY = 64;
+/// Fewest frames kept in the history ring, whatever their size.
+inline constexpr uint32_t SHARED_FRAME_HISTORY_MIN = 2;
+/// Bytes the history ring may use before it keeps fewer frames.
+inline constexpr size_t SHARED_FRAME_RING_BUDGET = size_t{16} << 20U;
+/// Identifies a snake game shared memory region ("SNKE" in memory order).
+inline constexpr uint32_t SHARED_MEMORY_MAGIC = 0x454B4E53;
+/// Version of the shared memory layout description, bumped whenever readers must change.
+inline constexpr uint16_t SHARED_MEMORY_LAYOUT_VERSION = 5;
+
+/**
+ * @brief Fields of a shared memory frame, in the order of their offsets in the header.
+ */
+enum class SharedField : uint8_t
+{
+  SEQUENCE,         ///< Version of the frame, or 0 while it is written (uint32).
+  BOARD_WIDTH,      ///< Width of the board (uint16).
+  BOARD_HEIGHT,     ///< Height of the board (uint16).
+  SCORE,            ///< Current game score (uint16).
+  SPEED,            ///< Current speed level (uint8).
+  GAME_STATE,       ///< Current state of the game (uint8).
+  FOOD_POSITION,    ///< Position of the food (2 x uint16).
+  FOOD_TYPE,        ///< Type of the food (uint8).
+  SNAKE_HEAD,       ///< Position of the snake's head (2 x uint16).
+  SNAKE_LENGTH,     ///< Length of the snake (uint32).
+  TICK_COUNT,       ///< Ticks simulated in the current game (uint32).
+  NEURAL_VECTOR,    ///< Neural network sensor inputs (12 x float32).
+  SNAKE_DIRECTION,  ///< Current direction of the snake (uint8).
+  SNAKE_BODY,       ///< Body coordinates, head first (bodyCapacity x 2 x uint16).
+};
+
+/// Number of fields described in the shared memory header.
+inline constexpr size_t SHARED_FIELD_COUNT = static_cast<size_t>(SharedField::SNAKE_BODY) + 1;
+
+/**
+ * @brief Fixed part of a shared memory frame slot; the snake body follows it.
+ *
+ * The sequence is 0 while the slot is being written and the version of its
+ * frame otherwise. Readers copy the frame and accept it if the sequence holds
+ * the expected version both before and after the copy.
+ */
+struct SharedFrame
+{
+  std::atomic<uint32_t> sequence{0};  ///< Version of the frame in the slot, or 0 while it is written.
+  GameSharedData        data{};       ///< The game state of the frame.
+};
+
+/**
+ * @brief Self-describing header at the start of the shared memory region.
+ *
+ * The header and the EngineStats fill the first page; the frame ring starts
+ * at framesOffset and is sized for the current board, so frame slots hold
+ * exactly boardWidth x boardHeight body coordinates. Large boards keep fewer
+ * frames so the ring stays within SHARED_FRAME_RING_BUDGET. Frame versions
+ * start at 1, and version v is stored in slot v % frameCount. When the board size changes
+ * the engine lays the ring out again: layoutGeneration is odd while the fields
+ * below it change and the old frames are discarded. The region only grows, so
+ * a reader's mapping never becomes invalid; readers remap when regionSize
+ * exceeds their mapping. The engine stores its process ID in enginePid once it
+ * accepts commands, so a launcher can wait for the engine it started.
+ */
+struct SharedMemoryHeader
+{
+  uint32_t              magic{SHARED_MEMORY_MAGIC};                   ///< Identifies the region.
+  uint16_t              layoutVersion{SHARED_MEMORY_LAYOUT_VERSION};  ///< Version of this description.
+  uint16_t              headerSize{sizeof(SharedMemoryHeader)};       ///< Size of the header in bytes.
+  std::atomic<uint32_t> layoutGeneration{0};             ///< Incremented around layout changes; odd while they happen.
+  std::atomic<uint32_t> version{0};                      ///< Version of the newest frame.
+  uint64_t              regionSize{0};                   ///< Size of the region in bytes.
+  uint32_t              statsOffset{0};                  ///< Offset of the EngineStats.
+  uint32_t              framesOffset{0};                 ///< Offset of the first frame slot.
+  uint32_t              frameCount{0};                   ///< Slots in the frame ring.
+  uint32_t              frameSize{0};                    ///< Bytes from one frame slot to the next.
+  uint32_t              bodyCapacity{0};                 ///< Body coordinates that fit in a frame.
+  std::atomic<uint32_t> enginePid{0};                    ///< Engine process ID while it accepts commands, else 0.
+  uint16_t              boardWidth{0};                   ///< Width of the board the frames are sized for.
+  uint16_t              boardHeight{0};                  ///< Height of the board the frames are sized for.
+  uint16_t              fieldCount{SHARED_FIELD_COUNT};  ///< Entries of fieldOffsets.
+  std::array<uint16_t, SHARED_FIELD_COUNT> fieldOffsets{};  ///< Offset of every SharedField in a frame slot.
+};
 
 /// Callback function type for handling IPC commands.
 using CommandCallback = std::function<void(IpcCommands, const std::vector<uint8_t>&)>;
@@ -5,6 +5,7 @@
 #include <cstdint>
 #include <deque>
 #include <ranges>
+#include <vector>
 
 namespace SnakeGame
 {
@@ -12,10 +13,30 @@ namespace SnakeGame
 Snake::Snake(const Coordinate initialPosition, const uint8_t initialLength)
   : currentDirection_(Direction::RIGHT), shouldGrow_(false)
 {
+  reset(initialPosition, initialLength);
+}
+
+void Snake::reset(const Coordinate initialPosition, const uint8_t initialLength)
+{
+  body_.clear();
   for (uint8_t i = 0; i < initialLength; ++i)
   {
     body_.emplace_back(initialPosition.first - i, initialPosition.second);
   }
+  currentDirection_ = Direction::RIGHT;
+  shouldGrow_       = false;
+}
+
+void Snake::restore(const std::vector<Coordinate>& body, const Direction direction, const bool growing)
+{
+  body_.assign(body.begin(), body.end());
+  currentDirection_ = direction;
+  shouldGrow_       = growing;
+}
+
+auto Snake::isGrowing() const noexcept -> bool
+{
+  return shouldGrow_;
 }
 
 void Snake::move(Direction movementDirection)
@@ -4,6 +4,7 @@
 
 #include <cstdint>
 #include <deque>
+#include <vector>
 
 namespace SnakeGame
 {
@@ -31,6 +32,31 @@ public:
   auto operator=(const Snake& other) -> Snake = delete;
   auto operator=(Snake&& other) -> Snake      = delete;
 
+  /**
+   * @brief Resets the snake to a straight line heading right, reusing its body storage.
+   *
+   * @param initialPosition The starting coordinate of the snake's head.
+   * @param initialLength The initial length of the snake (default is INITIAL_SNAKE_LENGTH).
+   */
+  void reset(Coordinate initialPosition, uint8_t initialLength = INITIAL_SNAKE_LENGTH);
+
+  /**
+   * @brief Replaces the snake's body, direction and growth flag, reusing its body storage.
+   *
+   * @param body Body coordinates, head first.
+   * @param direction The current moving direction.
+   * @param growing Whether the snake grows on its next move.
+   */
+  void restore(const std::vector<Coordinate>& body, Direction direction, bool growing);
+
+  /**
+   * @brief Checks whether the snake grows on its next move.
+   *
+   * @return true If the tail is kept on the next move.
+   * @return false Otherwise.
+   */
+  auto isGrowing() const noexcept -> bool;
+
   /**
    * @brief Moves the snake in the specified direction.
    *
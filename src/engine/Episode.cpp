@@ -0,0 +1,319 @@
+#include "Episode.hpp"
+
+#include "Definitions.hpp"
+#include "Game.hpp"
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <filesystem>
+#include <fstream>
+#include <iterator>
+#include <mutex>
+#include <stdexcept>
+#include <vector>
+
+namespace SnakeGame
+{
+
+namespace
+{
+
+constexpr uint32_t ACTIONS_PER_BYTE = 4;
+constexpr uint32_t ACTION_BITS      = 2;
+constexpr uint8_t  ACTION_MASK      = 0x03;
+
+void writeByte(std::vector<uint8_t>& buffer, const uint8_t value)
+{
+  buffer.push_back(value);
+}
+
+void writeUint16(std::vector<uint8_t>& buffer, const uint16_t value)
+{
+  buffer.push_back(static_cast<uint8_t>(value & 0xFFU));
+  buffer.push_back(static_cast<uint8_t>(value >> 8U));
+}
+
+void writeUint32(std::vector<uint8_t>& buffer, const uint32_t value)
+{
+  for (uint32_t shift = 0; shift < 32; shift += 8)
+  {
+    buffer.push_back(static_cast<uint8_t>((value >> shift) & 0xFFU));
+  }
+}
+
+/// Writes an unsigned LEB128 varint: 7 bits per byte, high bit set on all but the last byte.
+void writeVarint(std::vector<uint8_t>& buffer, uint32_t value)
+{
+  while (value >= 0x80U)
+  {
+    buffer.push_back(static_cast<uint8_t>((value & 0x7FU) | 0x80U));
+    value >>= 7U;
+  }
+  buffer.push_back(static_cast<uint8_t>(value));
+}
+
+/**
+ * @brief Bounds-checked reader over the bytes of an episode file.
+ */
+class ByteReader
+{
+public:
+  explicit ByteReader(const std::vector<uint8_t>& data) : data_(data), offset_(0)
+  {
+  }
+
+  auto atEnd() const noexcept -> bool
+  {
+    return offset_ == data_.size();
+  }
+
+  auto readByte() -> uint8_t
+  {
+    require(1);
+    return data_[offset_++];
+  }
+
+  auto readUint16() -> uint16_t
+  {
+    const auto low  = readByte();
+    const auto high = readByte();
+    return static_cast<uint16_t>(low | (high << 8U));
+  }
+
+  auto readUint32() -> uint32_t
+  {
+    auto value = uint32_t{0};
+    for (uint32_t shift = 0; shift < 32; shift += 8)
+    {
+      value |= static_cast<uint32_t>(readByte()) << shift;
+    }
+    return value;
+  }
+
+  auto readVarint() -> uint32_t
+  {
+    auto value = uint32_t{0};
+    for (uint32_t shift = 0; shift < 35; shift += 7)
+    {
+      const auto byte  = readByte();
+      value           |= static_cast<uint32_t>(byte & 0x7FU) << shift;
+      if ((byte & 0x80U) == 0)
+      {
+        return value;
+      }
+    }
+    throw std::runtime_error("Invalid varint in episode file");
+  }
+
+  void readBytes(std::vector<uint8_t>& out, const size_t count)
+  {
+    require(count);
+    const auto begin = data_.begin() + static_cast<std::ptrdiff_t>(offset_);
+    out.assign(begin, begin + static_cast<std::ptrdiff_t>(count));
+    offset_ += count;
+  }
+
+private:
+  const std::vector<uint8_t>& data_;
+  size_t                      offset_;
+
+  void require(const size_t count) const
+  {
+    if (data_.size() - offset_ < count)
+    {
+      throw std::runtime_error("Truncated episode file");
+    }
+  }
+};
+
+}  // namespace
+
+void Episode::pushAction(const Direction direction)
+{
+  const auto slot = ticks % ACTIONS_PER_BYTE;
+  if (slot == 0)
+  {
+    actions.push_back(0);
+  }
+  actions.back() |= static_cast<uint8_t>(static_cast<uint8_t>(direction) << (slot * ACTION_BITS));
+  ++ticks;
+}
+
+auto Episode::getAction(const uint32_t tick) const noexcept -> Direction
+{
+  const auto byte = actions[tick / ACTIONS_PER_BYTE];
+  return static_cast<Direction>((byte >> ((tick % ACTIONS_PER_BYTE) * ACTION_BITS)) & ACTION_MASK);
+}
+
+void Episode::restart(const BoardDimensions newBoardSize, const uint32_t newSeed) noexcept
+{
+  boardSize = newBoardSize;
+  seed      = newSeed;
+  ticks     = 0;
+  score     = 0;
+  actions.clear();
+  foodEvents.clear();
+}
+
+EpisodeRecorder::EpisodeRecorder(const std::filesystem::path& path, const bool recordFood)
+  : file_(path, std::ios::binary | std::ios::trunc), recordFood_(recordFood), episodeCount_(0)
+{
+  if (not file_)
+  {
+    throw std::runtime_error("Cannot open episode file " + path.string());
+  }
+
+  file_.write(EPISODE_FILE_MAGIC.data(), EPISODE_FILE_MAGIC.size());
+  const auto header = std::array<char, 4>{static_cast<char>(EPISODE_FILE_VERSION),
+                                          static_cast<char>(recordFood ? EPISODE_FLAG_FOOD_EVENTS : 0), 0, 0};
+  file_.write(header.data(), header.size());
+}
+
+void EpisodeRecorder::write(const Episode& episode)
+{
+  const std::lock_guard<std::mutex> lock(mutex_);
+
+  buffer_.clear();
+  writeUint16(buffer_, episode.boardSize.first);
+  writeUint16(buffer_, episode.boardSize.second);
+  writeUint32(buffer_, episode.seed);
+  writeVarint(buffer_, episode.ticks);
+  writeUint16(buffer_, episode.score);
+
+  if (recordFood_)
+  {
+    writeVarint(buffer_, static_cast<uint32_t>(episode.foodEvents.size()));
+    auto previousTick = uint32_t{0};
+    for (const auto& event : episode.foodEvents)
+    {
+      writeVarint(buffer_, event.tick - previousTick);
+      writeUint16(buffer_, event.position.first);
+      writeUint16(buffer_, event.position.second);
+      writeByte(buffer_, static_cast<uint8_t>(event.type));
+      previousTick = event.tick;
+    }
+  }
+
+  buffer_.insert(buffer_.end(), episode.actions.begin(), episode.actions.end());
+  file_.write(reinterpret_cast<const char*>(buffer_.data()), static_cast<std::streamsize>(buffer_.size()));
+  ++episodeCount_;
+}
+
+void EpisodeRecorder::flush()
+{
+  const std::lock_guard<std::mutex> lock(mutex_);
+  file_.flush();
+}
+
+auto EpisodeRecorder::recordsFood() const noexcept -> bool
+{
+  return recordFood_;
+}
+
+auto EpisodeRecorder::getEpisodeCount() const noexcept -> uint64_t
+{
+  return episodeCount_;
+}
+
+auto readEpisodes(const std::filesystem::path& path) -> std::vector<Episode>
+{
+  auto file = std::ifstream(path, std::ios::binary);
+  if (not file)
+  {
+    throw std::runtime_error("Cannot open episode file " + path.string());
+  }
+  const auto data = std::vector<uint8_t>(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+
+  auto reader = ByteReader(data);
+  for (const auto expected : EPISODE_FILE_MAGIC)
+  {
+    if (reader.readByte() != static_cast<uint8_t>(expected))
+    {
+      throw std::runtime_error("Not an episode file: " + path.string());
+    }
+  }
+  const auto version = reader.readByte();
+  if (version < EPISODE_FILE_MIN_VERSION or version > EPISODE_FILE_VERSION)
+  {
+    throw std::runtime_error("Unsupported episode file version: " + path.string());
+  }
+  // Version 2 files store board sizes and positions in a single byte.
+  const auto readCoordinate = [&reader, wide = version >= 3]() -> uint16_t
+  { return wide ? reader.readUint16() : reader.readByte(); };
+  const auto hasFood = (reader.readByte() & EPISODE_FLAG_FOOD_EVENTS) != 0;
+  reader.readUint16();
+
+  auto episodes = std::vector<Episode>{};
+  while (not reader.atEnd())
+  {
+    auto& episode     = episodes.emplace_back();
+    episode.boardSize = {readCoordinate(), readCoordinate()};
+    episode.seed      = reader.readUint32();
+    episode.ticks     = reader.readVarint();
+    episode.score     = reader.readUint16();
+
+    if (hasFood)
+    {
+      const auto count = reader.readVarint();
+      auto       tick  = uint32_t{0};
+      episode.foodEvents.reserve(count);
+      for (uint32_t i = 0; i < count; ++i)
+      {
+        tick                += reader.readVarint();
+        const auto x         = readCoordinate();
+        const auto y         = readCoordinate();
+        const auto position  = Coordinate{x, y};
+        const auto type      = static_cast<FoodType>(reader.readByte());
+        episode.foodEvents.push_back({.tick = tick, .position = position, .type = type});
+      }
+    }
+
+    reader.readBytes(episode.actions, (episode.ticks + ACTIONS_PER_BYTE - 1) / ACTIONS_PER_BYTE);
+  }
+
+  return episodes;
+}
+
+auto replayEpisode(const Episode& episode) -> ReplayResult
+{
+  auto game = Game(episode.boardSize, false);
+  game.reset(episode.seed);
+
+  auto       matches   = true;
+  auto       nextEvent = size_t{0};
+  const auto checkFood = [&](const uint32_t tick) -> void
+  {
+    if (nextEvent >= episode.foodEvents.size() or episode.foodEvents[nextEvent].tick != tick)
+    {
+      matches = matches and episode.foodEvents.empty();
+      return;
+    }
+    const auto  snapshot = game.saveState();
+    const auto& expected = episode.foodEvents[nextEvent++];
+    matches = matches and snapshot.foodPosition == expected.position and snapshot.foodType == expected.type;
+  };
+
+  checkFood(0);
+
+  auto ticks = uint32_t{0};
+  while (ticks < episode.ticks)
+  {
+    const auto result = game.step(episode.getAction(ticks));
+    ++ticks;
+    if (result.fruitPickedUp)
+    {
+      checkFood(ticks);
+    }
+    if (result.isGameOver)
+    {
+      break;
+    }
+  }
+
+  matches =
+    matches and ticks == episode.ticks and game.getScore() == episode.score and nextEvent == episode.foodEvents.size();
+  return {.ticks = ticks, .score = game.getScore(), .matches = matches};
+}
+
+}  // namespace SnakeGame
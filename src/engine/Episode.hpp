@@ -0,0 +1,174 @@
+#pragma once
+
+#include "Definitions.hpp"
+
+#include <array>
+#include <cstdint>
+#include <filesystem>
+#include <fstream>
+#include <mutex>
+#include <vector>
+
+/**
+ * @file Episode.hpp
+ * @brief Compact binary recording and deterministic replay of game episodes.
+ *
+ * An episode is fully determined by its board size, the seed of the board's food
+ * generator and the direction played on every tick, so only those are stored.
+ * Directions are packed into two bits each, which makes a recording cost a quarter
+ * of a byte per tick. Food events (where and when new food appeared) can optionally
+ * be stored as well; they are redundant for replay but let tools check that a replay
+ * did not diverge from the original game and inspect episodes without simulating them.
+ *
+ * File layout (little-endian):
+ *   - header: magic "SNKR", uint8 version, uint8 flags (bit 0: food events), uint16 reserved
+ *   - episodes, each: uint16 width, uint16 height, uint32 seed, varint ticks, uint16 score,
+ *     then, if the file has food events, varint count and per event
+ *     (varint tick delta, uint16 x, uint16 y, uint8 type), then ceil(ticks / 4) action bytes.
+ *
+ * Version 2 files, which store sizes and positions as uint8, are still read.
+ */
+
+namespace SnakeGame
+{
+
+/// Magic bytes at the start of an episode file.
+inline constexpr std::array<char, 4> EPISODE_FILE_MAGIC = {'S', 'N', 'K', 'R'};
+/// Current version of the episode file format (2: food placed by FoodGenerator, 3: 16-bit coordinates).
+inline constexpr uint8_t EPISODE_FILE_VERSION = 3;
+/// Oldest episode file format that can still be read.
+inline constexpr uint8_t EPISODE_FILE_MIN_VERSION = 2;
+/// Header flag marking files that store food events.
+inline constexpr uint8_t EPISODE_FLAG_FOOD_EVENTS = 0x01;
+
+/**
+ * @brief New food appearing on the board.
+ */
+struct FoodEvent
+{
+  uint32_t   tick;      ///< Tick on which the food was placed (0 for the initial food).
+  Coordinate position;  ///< Position of the food.
+  FoodType   type;      ///< Type of the food.
+};
+
+/**
+ * @brief A recorded game: everything needed to re-simulate it.
+ */
+struct Episode
+{
+  BoardDimensions        boardSize;   ///< Board width and height.
+  uint32_t               seed;        ///< Seed of the board's food generator.
+  uint32_t               ticks;       ///< Number of recorded moves.
+  uint16_t               score;       ///< Final score.
+  std::vector<uint8_t>   actions;     ///< Moves packed four per byte, two bits each.
+  std::vector<FoodEvent> foodEvents;  ///< Food placements, if recorded.
+
+  /**
+   * @brief Appends a move to the episode.
+   *
+   * @param direction The direction played on the next tick.
+   */
+  void pushAction(Direction direction);
+
+  /**
+   * @brief Returns the move played on a tick.
+   *
+   * @param tick Zero-based tick index, lower than ticks.
+   * @return Direction The recorded direction.
+   */
+  auto getAction(uint32_t tick) const noexcept -> Direction;
+
+  /**
+   * @brief Clears the episode and starts a new one.
+   *
+   * The action and food event storage is kept, so restarting does not allocate.
+   *
+   * @param newBoardSize Board dimensions of the new episode.
+   * @param newSeed Seed of the new episode.
+   */
+  void restart(BoardDimensions newBoardSize, uint32_t newSeed) noexcept;
+};
+
+/**
+ * @brief Outcome of re-simulating an episode.
+ */
+struct ReplayResult
+{
+  uint32_t ticks;    ///< Moves played before the game ended or the actions ran out.
+  uint16_t score;    ///< Score reached by the replay.
+  bool     matches;  ///< True if the score and the recorded food events were reproduced.
+};
+
+/**
+ * @brief Appends finished episodes to a binary episode file.
+ *
+ * A single recorder may be shared by many games; writes are serialized.
+ */
+class EpisodeRecorder
+{
+public:
+  /**
+   * @brief Opens (and truncates) an episode file and writes its header.
+   *
+   * @param path Path of the file to write.
+   * @param recordFood Whether games should store food events in this file.
+   * @throws std::runtime_error If the file cannot be opened.
+   */
+  EpisodeRecorder(const std::filesystem::path& path, bool recordFood = false);
+  ~EpisodeRecorder() = default;
+
+  EpisodeRecorder(const EpisodeRecorder& other) = delete;
+  EpisodeRecorder(EpisodeRecorder&& other)      = delete;
+  auto operator=(const EpisodeRecorder& other)  = delete;
+  auto operator=(EpisodeRecorder&& other)       = delete;
+
+  /**
+   * @brief Appends an episode to the file.
+   *
+   * Food events are only written if the file records them.
+   *
+   * @param episode The finished episode.
+   */
+  void write(const Episode& episode);
+
+  /**
+   * @brief Flushes buffered episodes to disk.
+   */
+  void flush();
+
+  /**
+   * @brief Checks whether games should record food events.
+   */
+  auto recordsFood() const noexcept -> bool;
+
+  /**
+   * @brief Gets the number of episodes written so far.
+   */
+  auto getEpisodeCount() const noexcept -> uint64_t;
+
+private:
+  std::ofstream        file_;
+  std::mutex           mutex_;
+  std::vector<uint8_t> buffer_;
+  bool                 recordFood_;
+  uint64_t             episodeCount_;
+};
+
+/**
+ * @brief Reads every episode of an episode file.
+ *
+ * @param path Path of the file written by EpisodeRecorder.
+ * @return std::vector<Episode> The episodes, in recording order.
+ * @throws std::runtime_error If the file cannot be read or is not a valid episode file.
+ */
+auto readEpisodes(const std::filesystem::path& path) -> std::vector<Episode>;
+
+/**
+ * @brief Re-simulates an episode on a headless game.
+ *
+ * @param episode The episode to replay.
+ * @return ReplayResult The outcome of the replay.
+ */
+auto replayEpisode(const Episode& episode) -> ReplayResult;
+
+}  // namespace SnakeGame
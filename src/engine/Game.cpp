@@ -3,6 +3,7 @@
 #include "Board.hpp"
 #include "CommandSocket.hpp"
 #include "Definitions.hpp"
+#include "Episode.hpp"
 #include "SharedMemoryManager.hpp"
 #include "Snake.hpp"
 
@@ -10,28 +11,45 @@
 #include <array>
 #include <atomic>
 #include <chrono>
+#include <cstddef>
 #include <cstdint>
+#include <deque>
 #include <iostream>
 #include <memory>
 #include <mutex>
-#include <ratio>
-#include <thread>
+#include <utility>
 #include <vector>
 
 namespace SnakeGame
 {
 
-Game::Game(const BoardDimensions boardSize)
+namespace
+{
+
+/// Occupancy bit of every grid channel tracked by the game; the bit index is the channel index.
+constexpr auto OCCUPIED_BODY = static_cast<uint8_t>(1U << static_cast<uint8_t>(GridChannel::BODY));
+constexpr auto OCCUPIED_HEAD = static_cast<uint8_t>(1U << static_cast<uint8_t>(GridChannel::HEAD));
+constexpr auto OCCUPIED_FOOD = static_cast<uint8_t>(1U << static_cast<uint8_t>(GridChannel::FOOD));
+/// Occupancy bits of the cells taken by the snake.
+constexpr auto OCCUPIED_SNAKE = static_cast<uint8_t>(OCCUPIED_BODY | OCCUPIED_HEAD);
+/// Number of channels stored in the occupancy grid (walls are derived from the position).
+constexpr auto OCCUPANCY_CHANNELS = static_cast<size_t>(GridChannel::WALL);
+
+}  // namespace
+
+Game::Game(const BoardDimensions boardSize, const bool enableIpc)
   : snake_(nullptr), board_(std::make_unique<Board>(boardSize)), pendingCommand_(IpcCommands::NONE),
-    state_(GameState::MENU), score_(0), speed_(1), fruitPickedThisFrame_(false)
+    seedSource_(FoodGenerator::randomSeed()), state_(GameState::MENU), score_(0), speed_(1), tickCount_(0), seed_(0),
+    fruitPickedThisFrame_(false), recording_(false)
 {
-  shmManager_    = std::make_unique<SharedMemoryManager>();
-  commandSocket_ = std::make_unique<CommandSocket>();
-  if (shmManager_->isInitialized())
+  if (not enableIpc)
   {
-    shmManager_->startAsyncWriter();
+    return;
   }
 
+  shmManager_    = std::make_unique<SharedMemoryManager>();
+  commandSocket_ = std::make_unique<CommandSocket>();
+
   const auto started = commandSocket_->start([this](IpcCommands cmd, const std::vector<uint8_t>& payload) -> void
                                              { this->handleCommand(cmd, payload); });
 
@@ -42,67 +60,219 @@ Game::Game(const BoardDimensions boardSize)
   }
 }
 
+Game::~Game()
+{
+  finishEpisode();
+}
+
 void Game::run()
 {
-  using Clock      = std::chrono::steady_clock;
-  using DurationMs = std::chrono::duration<double, std::milli>;
+  using Clock = std::chrono::steady_clock;
 
-  auto   lastTime        = Clock::now();
-  double timeAccumulator = 0.0;
+  // Ticks are scheduled on absolute deadlines, one interval after the deadline of the previous tick, so neither the
+  // time spent simulating nor wake-up latency accumulates into drift.
+  auto lastDeadline = Clock::now();
 
+  // Viewers wait for the ready mark instead of sleeping, so it is set only once the first frame is out and the
+  // command socket is listening.
+  updateSharedMemory();
+  if (shmManager_ and commandSocket_)
+  {
+    shmManager_->markReady();
+  }
+
+  processSocketCommand();
   while (state_ != GameState::QUIT)
   {
-    const auto currentTime = Clock::now();
-    const auto elapsed     = DurationMs(currentTime - lastTime);
-    lastTime               = currentTime;
+    if (state_ != GameState::PLAYING)
+    {
+      updateSharedMemory();
+      waitForCommand(std::nullopt);
+      lastDeadline = Clock::now();
+    }
+    else
+    {
+      const auto interval = getTickInterval();
+      const auto deadline = lastDeadline + interval;
+      if (Clock::now() < deadline)
+      {
+        waitForCommand(deadline);
+      }
+      else
+      {
+        lastDeadline = runTick(deadline, interval);
+      }
+    }
 
     processSocketCommand();
+  }
+}
 
-    if (state_ == GameState::PLAYING)
-    {
-      timeAccumulator        += elapsed.count();
-      const auto targetDelay  = static_cast<double>(getDelayMs());
+void Game::setLateTickPolicy(const LateTickPolicy policy) noexcept
+{
+  lateTickPolicy_ = policy;
+}
 
-      if (timeAccumulator >= targetDelay)
-      {
-        auto currentDirection = snake_ ? snake_->getDirection() : Direction::UP;
-        if (pendingDirection_)
-        {
-          currentDirection = *pendingDirection_;
-          pendingDirection_.reset();
-        }
+auto Game::runTick(const std::chrono::steady_clock::time_point deadline, const std::chrono::nanoseconds interval)
+  -> std::chrono::steady_clock::time_point
+{
+  using Clock = std::chrono::steady_clock;
 
-        update(currentDirection);
+  const auto tickStart = Clock::now();
 
-        timeAccumulator -= targetDelay;
+  auto currentDirection = snake_ ? snake_->getDirection() : Direction::UP;
+  if (pendingDirection_)
+  {
+    currentDirection = *pendingDirection_;
+    pendingDirection_.reset();
+  }
 
-        if (timeAccumulator > targetDelay)
-        {
-          timeAccumulator = 0.0;
-        }
-        updateSharedMemory();
-      }
+  if (replay_)
+  {
+    if (tickCount_ < replay_->ticks)
+    {
+      currentDirection = replay_->getAction(tickCount_);
     }
     else
     {
-      timeAccumulator = 0.0;
-      updateSharedMemory();
-      std::this_thread::sleep_for(std::chrono::milliseconds(10));
+      state_ = GameState::GAME_OVER;
     }
-    std::this_thread::sleep_for(std::chrono::milliseconds(1));
   }
+
+  update(currentDirection);
+  updateSharedMemory();
+
+  const auto now      = Clock::now();
+  const auto duration = std::chrono::duration_cast<std::chrono::microseconds>(now - tickStart);
+  if (interval == std::chrono::nanoseconds::zero())
+  {
+    if (shmManager_)
+    {
+      shmManager_->recordTick(duration, false, 0);
+    }
+    return now;
+  }
+
+  // Deadlines after this one that have already passed; the policy decides how many of them are still simulated.
+  const auto nextDeadline = deadline + interval;
+  const auto overdue      = now >= nextDeadline ? ((now - nextDeadline) / interval) + 1 : 0;
+  const auto kept         = lateTickPolicy_ == LateTickPolicy::CATCH_UP ? MAX_CATCH_UP_TICKS : 1U;
+  const auto skipped      = overdue > kept ? overdue - kept : 0;
+
+  if (shmManager_)
+  {
+    shmManager_->recordTick(duration, overdue > 0, static_cast<uint64_t>(skipped));
+  }
+  return deadline + (skipped * interval);
+}
+
+void Game::waitForCommand(const std::optional<std::chrono::steady_clock::time_point> deadline)
+{
+  auto       lock     = std::unique_lock<std::mutex>(commandMutex_);
+  const auto received = [this]() -> bool { return commandSignaled_; };
+  if (deadline)
+  {
+    commandSignal_.wait_until(lock, *deadline, received);
+  }
+  else
+  {
+    commandSignal_.wait(lock, received);
+  }
+  commandSignaled_ = false;
+}
+
+void Game::signalCommand() noexcept
+{
+  {
+    const std::lock_guard<std::mutex> lock(commandMutex_);
+    commandSignaled_ = true;
+  }
+  commandSignal_.notify_one();
 }
 
 void Game::initialize()
 {
+  if (not replay_)
+  {
+    initialize(static_cast<uint32_t>(seedSource_()));
+    return;
+  }
+
+  if (board_->getWidth() != replay_->boardSize.first or board_->getHeight() != replay_->boardSize.second)
+  {
+    board_ = std::make_unique<Board>(replay_->boardSize);
+  }
+  initialize(replay_->seed);
+}
+
+void Game::initialize(const uint32_t seed)
+{
+  finishEpisode();
+
+  seed_ = seed;
+  board_->seed(seed);
+  clearOccupancy();
+
   const auto startPos = Coordinate{board_->getWidth() / 2, board_->getHeight() / 2};
-  snake_              = std::make_unique<Snake>(startPos);
+  if (snake_)
+  {
+    snake_->reset(startPos);
+  }
+  else
+  {
+    snake_ = std::make_unique<Snake>(startPos);
+  }
   board_->placeFood();
-  score_ = 0;
-  speed_ = 1;
-  state_ = GameState::PLAYING;
+  score_     = 0;
+  speed_     = 1;
+  tickCount_ = 0;
+  state_     = GameState::PLAYING;
+  pendingDirection_.reset();
+  fruitPickedThisFrame_ = false;
+
+  if (recorder_ and not replay_)
+  {
+    recording_ = true;
+    episode_.restart({board_->getWidth(), board_->getHeight()}, seed);
+    if (recorder_->recordsFood())
+    {
+      episode_.foodEvents.push_back({.tick = 0, .position = board_->getFoodPosition(), .type = board_->getFoodType()});
+    }
+  }
+
+  markOccupancy();
+}
+
+void Game::returnToMenu()
+{
+  finishEpisode();
+  clearOccupancy();
+
+  snake_.reset();
+  score_     = 0;
+  speed_     = 1;
+  tickCount_ = 0;
+  state_     = GameState::MENU;
   pendingDirection_.reset();
   fruitPickedThisFrame_ = false;
+  tickRate_.store(1, std::memory_order_relaxed);
+
+  markOccupancy();
+}
+
+void Game::finishEpisode()
+{
+  if (not recording_)
+  {
+    return;
+  }
+
+  recording_ = false;
+  if (episode_.ticks > 0)
+  {
+    episode_.score = score_;
+    recorder_->write(episode_);
+  }
 }
 
 auto Game::step(const Direction direction) -> StepResult
@@ -122,6 +292,98 @@ void Game::reset()
   initialize();
 }
 
+void Game::reset(const uint32_t seed)
+{
+  initialize(seed);
+}
+
+auto Game::getSeed() const noexcept -> uint32_t
+{
+  return seed_;
+}
+
+void Game::setRecorder(std::shared_ptr<EpisodeRecorder> recorder)
+{
+  finishEpisode();
+  recorder_ = std::move(recorder);
+}
+
+void Game::startReplay(Episode episode)
+{
+  finishEpisode();
+  if (board_->getWidth() != episode.boardSize.first or board_->getHeight() != episode.boardSize.second)
+  {
+    board_ = std::make_unique<Board>(episode.boardSize);
+    rebuildOccupancy();
+  }
+  replay_ = std::move(episode);
+  state_  = GameState::MENU;
+}
+
+auto Game::saveState() const -> GameSnapshot
+{
+  auto snapshot = GameSnapshot{};
+  saveState(snapshot);
+  return snapshot;
+}
+
+void Game::saveState(GameSnapshot& snapshot) const
+{
+  snapshot.boardSize      = {board_->getWidth(), board_->getHeight()};
+  snapshot.snakeDirection = Direction::RIGHT;
+  snapshot.snakeGrowing   = false;
+  snapshot.foodPosition   = board_->getFoodPosition();
+  snapshot.foodType       = board_->getFoodType();
+  snapshot.gameState      = state_;
+  snapshot.score          = score_;
+  snapshot.speed          = speed_;
+  snapshot.tickCount      = tickCount_;
+  snapshot.rngState       = board_->getGeneratorState();
+  snapshot.snakeBody.clear();
+
+  if (snake_)
+  {
+    const auto& body = snake_->getBody();
+    snapshot.snakeBody.assign(body.begin(), body.end());
+    snapshot.snakeDirection = snake_->getDirection();
+    snapshot.snakeGrowing   = snake_->isGrowing();
+  }
+}
+
+void Game::loadState(const GameSnapshot& snapshot)
+{
+  finishEpisode();
+  clearOccupancy();
+
+  if (board_->getWidth() != snapshot.boardSize.first or board_->getHeight() != snapshot.boardSize.second)
+  {
+    board_ = std::make_unique<Board>(snapshot.boardSize);
+  }
+  board_->setFood(snapshot.foodPosition, snapshot.foodType);
+  board_->setGeneratorState(snapshot.rngState);
+
+  if (snapshot.snakeBody.empty())
+  {
+    snake_.reset();
+  }
+  else
+  {
+    if (not snake_)
+    {
+      snake_ = std::make_unique<Snake>(snapshot.snakeBody.front());
+    }
+    snake_->restore(snapshot.snakeBody, snapshot.snakeDirection, snapshot.snakeGrowing);
+  }
+
+  state_                = snapshot.gameState;
+  score_                = snapshot.score;
+  speed_                = snapshot.speed;
+  tickCount_            = snapshot.tickCount;
+  fruitPickedThisFrame_ = false;
+  pendingDirection_.reset();
+  markOccupancy();
+}
+
 auto Game::getScore() const -> uint16_t
 {
   return score_;
@@ -134,11 +396,21 @@ void Game::update(const Direction direction)
     return;
   }
 
+  const auto previousHead = snake_->getHead();
+  const auto previousTail = snake_->getBody().back();
+  const auto grew         = snake_->isGrowing();
   snake_->move(direction);
+  trackMove(previousHead, previousTail, grew);
+  if (recording_)
+  {
+    episode_.pushAction(snake_->getDirection());
+  }
+  ++tickCount_;
   handleCollision();
 
   if (state_ != GameState::PLAYING)
   {
+    finishEpisode();
     return;
   }
 
@@ -146,8 +418,26 @@ void Game::update(const Direction direction)
   {
     fruitPickedThisFrame_ = true;
     snake_->grow();
-    score_ += 10;
-    board_->placeFood(snake_->getBody());
+    score_                                   += 10;
+    occupancy_[cellIndex(snake_->getHead())] &= ~OCCUPIED_FOOD;
+
+    const auto isSnake = [this](const Coordinate position) -> bool
+    { return (occupancy_[cellIndex(position)] & OCCUPIED_SNAKE) != 0; };
+    const auto freeCells = occupancy_.size() - snake_->getBody().size();
+    if (not board_->placeFood(isSnake, freeCells))
+    {
+      // The snake fills the whole board.
+      state_ = GameState::GAME_OVER;
+      finishEpisode();
+      return;
+    }
+    occupancy_[cellIndex(board_->getFoodPosition())] |= OCCUPIED_FOOD;
+
+    if (recording_ and recorder_->recordsFood())
+    {
+      episode_.foodEvents.push_back(
+        {.tick = tickCount_, .position = board_->getFoodPosition(), .type = board_->getFoodType()});
+    }
   }
 }
 
@@ -160,6 +450,14 @@ void Game::processSocketCommand() noexcept
     return;
   }
 
+  if (shmManager_)
+  {
+    const auto receivedAt = std::chrono::steady_clock::time_point(
+      std::chrono::nanoseconds(commandReceivedNs_.load(std::memory_order_relaxed)));
+    shmManager_->recordCommand(
+      std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::steady_clock::now() - receivedAt));
+  }
+
   switch (command)
   {
     case IpcCommands::START_GAME:
@@ -208,6 +506,10 @@ void Game::processSocketCommand() noexcept
       state_ = GameState::QUIT;
       break;
 
+    case IpcCommands::RETURN_TO_MENU:
+      returnToMenu();
+      break;
+
     case IpcCommands::CHANGE_BOARD_SIZE:
       if (state_ == GameState::MENU)
       {
@@ -217,11 +519,11 @@ void Game::processSocketCommand() noexcept
           newDimensions = pendingBoardSize_;
         }
 
-        constexpr uint8_t maxBoardDimension = 50;
-        if (newDimensions.first >= 5 and newDimensions.second >= 5 and newDimensions.first <= maxBoardDimension and
-            newDimensions.second <= maxBoardDimension)
+        if (newDimensions.first >= MIN_BOARD_DIMENSION and newDimensions.second >= MIN_BOARD_DIMENSION and
+            newDimensions.first <= MAX_BOARD_DIMENSION and newDimensions.second <= MAX_BOARD_DIMENSION)
         {
           board_ = std::make_unique<Board>(newDimensions);
+          rebuildOccupancy();
         }
       }
       else
@@ -230,6 +532,7 @@ void Game::processSocketCommand() noexcept
       }
       break;
 
+    case IpcCommands::SET_TICK_RATE:
     case IpcCommands::NONE:
       break;
   }
@@ -250,7 +553,8 @@ void Game::handleCollision() noexcept
     return;
   }
 
-  if (snake_->checkSelfCollision())
+  // The move already updated the occupancy grid, so the head shares its cell only with the segment it ran into.
+  if ((occupancy_[cellIndex(head)] & OCCUPIED_BODY) != 0)
   {
     state_ = GameState::GAME_OVER;
     return;
@@ -259,12 +563,32 @@ void Game::handleCollision() noexcept
 
 void Game::handleCommand(IpcCommands command, const std::vector<uint8_t>& payload) noexcept
 {
-  if (command == IpcCommands::CHANGE_BOARD_SIZE and payload.size() == 2)
+  if (command == IpcCommands::CHANGE_BOARD_SIZE and payload.size() == 4)
   {
     const std::lock_guard<std::mutex> lock(commandMutex_);
-    pendingBoardSize_ = {payload[0], payload[1]};
+    pendingBoardSize_ = {static_cast<uint16_t>(payload[0] | (payload[1] << 8U)),
+                         static_cast<uint16_t>(payload[2] | (payload[3] << 8U))};
   }
-  pendingCommand_.store(command, std::memory_order_release);
+  else if (command == IpcCommands::SET_TICK_RATE)
+  {
+    if (payload.size() == 1)
+    {
+      tickRate_.store(payload[0], std::memory_order_relaxed);
+      signalCommand();
+    }
+    return;
+  }
+
+  const auto receivedAt = std::chrono::steady_clock::now().time_since_epoch();
+  commandReceivedNs_.store(std::chrono::duration_cast<std::chrono::nanoseconds>(receivedAt).count(),
+                           std::memory_order_relaxed);
+
+  const auto previous = pendingCommand_.exchange(command, std::memory_order_release);
+  if (previous != IpcCommands::NONE and shmManager_)
+  {
+    shmManager_->recordOverwrittenCommand();
+  }
+  signalCommand();
 }
 
 auto Game::getDelayMs() const noexcept -> uint16_t
@@ -274,6 +598,16 @@ auto Game::getDelayMs() const noexcept -> uint16_t
   return static_cast<uint16_t>(delay);
 }
 
+auto Game::getTickInterval() const noexcept -> std::chrono::nanoseconds
+{
+  const auto tickRate = tickRate_.load(std::memory_order_relaxed);
+  if (tickRate == UNLIMITED_TICK_RATE)
+  {
+    return std::chrono::nanoseconds::zero();
+  }
+  return std::chrono::nanoseconds(std::chrono::milliseconds(getDelayMs())) / tickRate;
+}
+
 void Game::updateSharedMemory() noexcept
 {
   if (not shmManager_ or not shmManager_->isInitialized())
@@ -281,7 +615,7 @@ void Game::updateSharedMemory() noexcept
     return;
   }
 
-  auto sharedGameInfo = GameSharedData{
+  const auto sharedGameInfo = GameSharedData{
     .boardWidth     = board_->getWidth(),
     .boardHeight    = board_->getHeight(),
     .score          = score_,
@@ -289,38 +623,15 @@ void Game::updateSharedMemory() noexcept
     .gameState      = state_,
     .foodPosition   = board_->getFoodPosition(),
     .foodType       = board_->getFoodType(),
-    .snakeHead      = {0, 0},
-    .snakeLength    = 0,
+    .snakeHead      = snake_ ? snake_->getHead() : Coordinate{0, 0},
+    .snakeLength    = snake_ ? static_cast<uint32_t>(snake_->getBody().size()) : uint32_t{0},
+    .tickCount      = tickCount_,
     .neuralVector   = getNeuralInputs(),
     .snakeDirection = snake_ ? snake_->getDirection() : Direction::UP,
-    .snakeBody      = {}
   };
 
-  if (snake_ != nullptr)
-  {
-    const auto& body = snake_->getBody();
-
-    uint16_t i = 0;
-    for (const auto& segment : body)
-    {
-      if (i >= SNAKE_MAX_LENGTH)
-      {
-        break;
-      }
-      sharedGameInfo.snakeBody.at(i) = segment;
-      ++i;
-    }
-
-    sharedGameInfo.snakeHead   = snake_->getHead();
-    sharedGameInfo.snakeLength = static_cast<uint16_t>(body.size());
-  }
-  else
-  {
-    sharedGameInfo.snakeHead   = {0, 0};
-    sharedGameInfo.snakeLength = 0;
-  }
-
-  shmManager_->updateGameState(sharedGameInfo);
+  static const auto noBody = std::deque<Coordinate>{};
+  shmManager_->updateGameState(sharedGameInfo, snake_ ? snake_->getBody() : noBody);
 }
 
 auto Game::getNeuralInputs() const -> NeuralInputs
@@ -330,9 +641,8 @@ auto Game::getNeuralInputs() const -> NeuralInputs
     return {};
   }
 
-  const auto  head      = snake_->getHead();
-  const auto& snakeBody = snake_->getBody();
-  const auto  foodPos   = board_->getFoodPosition();
+  const auto head    = snake_->getHead();
+  const auto foodPos = board_->getFoodPosition();
 
   const auto findDistance = [&](const Direction currentDirection, const auto collisionCheck) -> float
   {
@@ -369,6 +679,9 @@ auto Game::getNeuralInputs() const -> NeuralInputs
     return 0.0F;
   };
 
+  const auto isSnake = [this](const Coordinate pos) -> bool
+  { return not board_->isWall(pos) and (occupancy_[cellIndex(pos)] & OCCUPIED_SNAKE) != 0; };
+
   return {
     findDistance(Direction::UP, [this](Coordinate pos) -> bool { return board_->isWall(pos); }),
     findDistance(Direction::DOWN, [this](Coordinate pos) -> bool { return board_->isWall(pos); }),
@@ -378,15 +691,173 @@ auto Game::getNeuralInputs() const -> NeuralInputs
     findDistance(Direction::DOWN, [foodPos](Coordinate pos) -> bool { return pos == foodPos; }),
     findDistance(Direction::LEFT, [foodPos](Coordinate pos) -> bool { return pos == foodPos; }),
     findDistance(Direction::RIGHT, [foodPos](Coordinate pos) -> bool { return pos == foodPos; }),
-    findDistance(Direction::UP,
-                 [&snakeBody](Coordinate pos) -> bool { return std::ranges::find(snakeBody, pos) != snakeBody.end(); }),
-    findDistance(Direction::DOWN,
-                 [&snakeBody](Coordinate pos) -> bool { return std::ranges::find(snakeBody, pos) != snakeBody.end(); }),
-    findDistance(Direction::LEFT,
-                 [&snakeBody](Coordinate pos) -> bool { return std::ranges::find(snakeBody, pos) != snakeBody.end(); }),
-    findDistance(Direction::RIGHT,
-                 [&snakeBody](Coordinate pos) -> bool { return std::ranges::find(snakeBody, pos) != snakeBody.end(); }),
+    findDistance(Direction::UP, isSnake),
+    findDistance(Direction::DOWN, isSnake),
+    findDistance(Direction::LEFT, isSnake),
+    findDistance(Direction::RIGHT, isSnake),
+  };
+}
+
+auto Game::getGridShape(const uint8_t size) const noexcept -> std::array<size_t, 3>
+{
+  if (size == 0)
+  {
+    return {GRID_CHANNELS, board_->getHeight(), board_->getWidth()};
+  }
+  return {GRID_CHANNELS, size, size};
+}
+
+template <typename T>
+void Game::writeGrid(T* const output, const uint8_t size)
+{
+  const auto width  = static_cast<size_t>(board_->getWidth());
+  const auto height = static_cast<size_t>(board_->getHeight());
+  if (occupancy_.size() != width * height)
+  {
+    rebuildOccupancy();
+  }
+
+  const auto [channels, rows, columns] = getGridShape(size);
+  const auto plane                     = rows * columns;
+  std::fill_n(output, channels * plane, T{0});
+
+  const auto writeCell = [output, plane](const uint8_t occupied, const size_t cell) -> void
+  {
+    for (size_t channel = 0; channel < OCCUPANCY_CHANNELS; ++channel)
+    {
+      if ((occupied & (1U << channel)) != 0)
+      {
+        output[(channel * plane) + cell] = T{1};
+      }
+    }
   };
+
+  if (size == 0)
+  {
+    for (size_t cell = 0; cell < plane; ++cell)
+    {
+      if (occupancy_[cell] != 0)
+      {
+        writeCell(occupancy_[cell], cell);
+      }
+    }
+    return;
+  }
+
+  const auto head   = snake_ ? snake_->getHead() : Coordinate{board_->getWidth() / 2, board_->getHeight() / 2};
+  const auto left   = static_cast<int32_t>(head.first) - (size / 2);
+  const auto top    = static_cast<int32_t>(head.second) - (size / 2);
+  auto*      walls  = output + (static_cast<size_t>(GridChannel::WALL) * plane);
+  const auto inside = [](const int32_t value, const size_t limit) -> bool
+  { return value >= 0 and static_cast<size_t>(value) < limit; };
+
+  for (size_t row = 0; row < rows; ++row)
+  {
+    const auto y = top + static_cast<int32_t>(row);
+    for (size_t column = 0; column < columns; ++column)
+    {
+      const auto x    = left + static_cast<int32_t>(column);
+      const auto cell = (row * columns) + column;
+      if (not inside(x, width) or not inside(y, height))
+      {
+        walls[cell] = T{1};
+        continue;
+      }
+      const auto occupied = occupancy_[(static_cast<size_t>(y) * width) + static_cast<size_t>(x)];
+      if (occupied != 0)
+      {
+        writeCell(occupied, cell);
+      }
+    }
+  }
+}
+
+template void Game::writeGrid<uint8_t>(uint8_t* output, uint8_t size);
+template void Game::writeGrid<float>(float* output, uint8_t size);
+
+auto Game::cellIndex(const Coordinate position) const noexcept -> size_t
+{
+  return (static_cast<size_t>(position.second) * board_->getWidth()) + position.first;
+}
+
+void Game::rebuildOccupancy()
+{
+  occupancy_.assign(static_cast<size_t>(board_->getWidth()) * board_->getHeight(), 0);
+  markOccupancy();
+}
+
+void Game::clearOccupancy() noexcept
+{
+  // Only the cells marked for the current snake and food are cleared, so loading a state costs as much as its snake.
+  if (occupancy_.size() != static_cast<size_t>(board_->getWidth()) * board_->getHeight())
+  {
+    return;
+  }
+
+  if (snake_)
+  {
+    for (const auto& segment : snake_->getBody())
+    {
+      if (not board_->isWall(segment))
+      {
+        occupancy_[cellIndex(segment)] = 0;
+      }
+    }
+  }
+
+  if (not board_->isWall(board_->getFoodPosition()))
+  {
+    occupancy_[cellIndex(board_->getFoodPosition())] = 0;
+  }
+}
+
+void Game::markOccupancy()
+{
+  const auto cells = static_cast<size_t>(board_->getWidth()) * board_->getHeight();
+  if (occupancy_.size() != cells)
+  {
+    occupancy_.assign(cells, 0);
+  }
+
+  if (snake_)
+  {
+    const auto& body = snake_->getBody();
+    for (size_t i = 0; i < body.size(); ++i)
+    {
+      if (not board_->isWall(body[i]))
+      {
+        occupancy_[cellIndex(body[i])] |= i == 0 ? OCCUPIED_HEAD : OCCUPIED_BODY;
+      }
+    }
+  }
+
+  if (not board_->isWall(board_->getFoodPosition()))
+  {
+    occupancy_[cellIndex(board_->getFoodPosition())] |= OCCUPIED_FOOD;
+  }
+}
+
+void Game::trackMove(const Coordinate previousHead, const Coordinate previousTail, const bool grew) noexcept
+{
+  // The previous head becomes the neck, and the tail leaves its cell unless the snake grew.
+  if (not board_->isWall(previousHead))
+  {
+    occupancy_[cellIndex(previousHead)] &= ~OCCUPIED_HEAD;
+    if (snake_->getBody().size() > 1)
+    {
+      occupancy_[cellIndex(previousHead)] |= OCCUPIED_BODY;
+    }
+  }
+  if (not grew and not board_->isWall(previousTail))
+  {
+    occupancy_[cellIndex(previousTail)] &= ~OCCUPIED_BODY;
+  }
+
+  const auto head = snake_->getHead();
+  if (not board_->isWall(head))
+  {
+    occupancy_[cellIndex(head)] |= OCCUPIED_HEAD;
+  }
 }
 
 }  // namespace SnakeGame
@@ -3,10 +3,15 @@
 #include "Board.hpp"
 #include "CommandSocket.hpp"
 #include "Definitions.hpp"
+#include "Episode.hpp"
 #include "SharedMemoryManager.hpp"
 #include "Snake.hpp"
 
+#include <array>
 #include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
 #include <cstdint>
 #include <memory>
 #include <mutex>
@@ -29,10 +34,19 @@ public:
   /**
    * @brief Constructs a new Game object.
    *
+   * Unless IPC is disabled, the game also opens the shared memory region and the
+   * command socket used by the Python interface. Headless games (e.g. for
+   * training) should disable it, since every instance would compete for them.
+   *
    * @param boardSize Dimensions of the game board (default: DEFAULT_BOARD_WIDTH x DEFAULT_BOARD_HEIGHT).
+   * @param enableIpc Whether to set up shared memory and the command socket (default: true).
+   */
+  Game(BoardDimensions boardSize = {DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT}, bool enableIpc = true);
+
+  /**
+   * @brief Writes the episode in progress to the recorder, if any.
    */
-  Game(BoardDimensions boardSize = {DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT});
-  ~Game() = default;
+  ~Game();
 
   Game(const Game& other)           = delete;
   Game(Game&& other)                = delete;
@@ -43,10 +57,21 @@ public:
    * @brief Starts the main game loop.
    *
    * This method runs indefinitely until the game is terminated. It handles
-   * timing, input processing, and game updates.
+   * timing, input processing, and game updates. Ticks run on absolute
+   * deadlines, and between them the loop sleeps until the next deadline or
+   * until a command arrives; outside PLAYING it sleeps until a command arrives.
    */
   void run();
 
+  /**
+   * @brief Sets what run() does with tick deadlines that passed while a tick was running.
+   *
+   * Overdue ticks show up in the lateTicks and skippedTicks engine stats.
+   *
+   * @param policy The late tick policy (default: LateTickPolicy::SKIP).
+   */
+  void setLateTickPolicy(LateTickPolicy policy) noexcept;
+
   /**
    * @brief Advances the game state by one step.
    *
@@ -61,10 +86,82 @@ public:
   /**
    * @brief Resets the game to its initial state.
    *
-   * Re-initializes the snake, board, and score.
+   * Re-initializes the snake, board, and score in place. The snake's body
+   * storage and the board are reused, so resetting does not allocate once the
+   * game has been initialized. The new episode gets a fresh random seed.
    */
   void reset();
 
+  /**
+   * @brief Resets the game and seeds the food generator with a given value.
+   *
+   * Playing the same moves after resetting with the same seed reproduces the
+   * same episode.
+   *
+   * @param seed Seed of the new episode.
+   */
+  void reset(uint32_t seed);
+
+  /**
+   * @brief Gets the seed of the current episode.
+   *
+   * @return uint32_t The value the food generator was seeded with on the last reset.
+   */
+  auto getSeed() const noexcept -> uint32_t;
+
+  /**
+   * @brief Records every following episode to an episode file.
+   *
+   * Recording starts with the next reset; the episode in progress, if it is
+   * being recorded, is written to the previous recorder first. Episodes are
+   * written when the game is over, when the game is reset, and when the game is
+   * destroyed. Episodes restored with loadState() are not recorded.
+   *
+   * @param recorder The recorder to write to, or nullptr to stop recording.
+   */
+  void setRecorder(std::shared_ptr<EpisodeRecorder> recorder);
+
+  /**
+   * @brief Plays a recorded episode instead of taking moves from the socket.
+   *
+   * Used by run(): the board is resized to the episode's dimensions, and every
+   * START_GAME or RESTART_GAME command restarts the recording from its first
+   * move. Move commands are ignored and the game is over once the recorded
+   * moves run out.
+   *
+   * @param episode The episode to play back.
+   */
+  void startReplay(Episode episode);
+
+  /**
+   * @brief Captures the complete state of the current episode.
+   *
+   * @return GameSnapshot A copy of the snake, food, random state, score and state.
+   */
+  auto saveState() const -> GameSnapshot;
+
+  /**
+   * @brief Captures the complete state of the current episode into an existing snapshot.
+   *
+   * The snapshot's body storage is reused, so saving into the same snapshot
+   * repeatedly does not allocate once it has held the longest snake. Together
+   * with loadState() this lets a controller look ahead from the current state.
+   *
+   * @param snapshot The snapshot to overwrite.
+   */
+  void saveState(GameSnapshot& snapshot) const;
+
+  /**
+   * @brief Restores an episode previously captured with saveState().
+   *
+   * The board is only reallocated if the snapshot has different dimensions, and
+   * the food generator continues from the saved random state, so the restored
+   * game places the same food as the original would have.
+   *
+   * @param snapshot The state to restore.
+   */
+  void loadState(const GameSnapshot& snapshot);
+
   /**
    * @brief Gets the current score.
    *
@@ -79,6 +176,32 @@ public:
    */
   auto getNeuralInputs() const -> NeuralInputs;
 
+  /**
+   * @brief Gets the shape of a grid observation.
+   *
+   * @param size Side of a grid centered on the head, or 0 for the whole board.
+   * @return std::array<size_t, 3> Channels, rows and columns.
+   */
+  auto getGridShape(uint8_t size) const noexcept -> std::array<size_t, 3>;
+
+  /**
+   * @brief Writes a one-hot occupancy grid observation.
+   *
+   * The output holds GRID_CHANNELS row-major planes, in GridChannel order. With
+   * size 0 the planes cover the whole board; otherwise they are a size x size
+   * window centered on the head (size should be odd), and cells outside the
+   * board are walls. The planes come from the occupancy grid the game keeps for
+   * collisions, food placement and the neural inputs, which every step updates
+   * from the moved head and tail and the placed food, so observing does not scan
+   * the snake.
+   *
+   * @tparam T Element type, uint8_t or float.
+   * @param output Buffer of getGridShape(size) elements.
+   * @param size Side of a grid centered on the head, or 0 for the whole board.
+   */
+  template <typename T>
+  void writeGrid(T* output, uint8_t size);
+
 private:
   std::unique_ptr<Snake>               snake_;
   std::unique_ptr<Board>               board_;
@@ -86,23 +209,52 @@ private:
   std::unique_ptr<CommandSocket>       commandSocket_;
   std::atomic<IpcCommands>             pendingCommand_;
   std::mutex                           commandMutex_;
+  std::condition_variable              commandSignal_;
+  bool                                 commandSignaled_{false};
+  LateTickPolicy                       lateTickPolicy_{LateTickPolicy::SKIP};
   std::optional<Direction>             pendingDirection_;
   BoardDimensions                      pendingBoardSize_{0, 0};
+  std::atomic<uint8_t>                 tickRate_{1};
+  std::atomic<int64_t>                 commandReceivedNs_{0};
+  FoodGenerator                        seedSource_;
+  std::shared_ptr<EpisodeRecorder>     recorder_;
+  Episode                              episode_{};
+  std::optional<Episode>               replay_;
+  std::vector<uint8_t>                 occupancy_;
 
   GameState state_;
   uint16_t  score_;
   uint8_t   speed_;
+  uint32_t  tickCount_;
+  uint32_t  seed_;
   bool      fruitPickedThisFrame_;
+  bool      recording_;
 
   void initialize();
+  void initialize(uint32_t seed);
+  void finishEpisode();
+  void returnToMenu();
+  auto cellIndex(Coordinate position) const noexcept -> size_t;
+  void rebuildOccupancy();
+  void clearOccupancy() noexcept;
+  void markOccupancy();
+  void trackMove(Coordinate previousHead, Coordinate previousTail, bool grew) noexcept;
   void update(Direction direction);
   void processSocketCommand() noexcept;
   void handleCollision() noexcept;
   void handleCommand(IpcCommands command, const std::vector<uint8_t>& payload) noexcept;
   void updateSharedMemory() noexcept;
   auto getDelayMs() const noexcept -> uint16_t;
+  auto getTickInterval() const noexcept -> std::chrono::nanoseconds;
+  auto runTick(std::chrono::steady_clock::time_point deadline, std::chrono::nanoseconds interval)
+    -> std::chrono::steady_clock::time_point;
+  void waitForCommand(std::optional<std::chrono::steady_clock::time_point> deadline);
+  void signalCommand() noexcept;
 };
 
+extern template void Game::writeGrid<uint8_t>(uint8_t* output, uint8_t size);
+extern template void Game::writeGrid<float>(float* output, uint8_t size);
+
 }  // namespace SnakeGame
 
 using Game = SnakeGame::Game;
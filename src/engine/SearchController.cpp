@@ -0,0 +1,341 @@
+#include "SearchController.hpp"
+
+#include "Definitions.hpp"
+#include "Game.hpp"
+
+#include <algorithm>
+#include <array>
+#include <chrono>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <cstdlib>
+#include <limits>
+#include <optional>
+#include <stdexcept>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+namespace SnakeGame
+{
+
+namespace
+{
+
+using Clock = std::chrono::steady_clock;
+
+/// Value of every eaten fruit.
+constexpr float FOOD_WEIGHT = 100.0F;
+/// Value of the reachable share of the free cells.
+constexpr float SPACE_WEIGHT = 20.0F;
+/// Penalty for states whose head reaches fewer free cells than the snake is long.
+constexpr float TRAPPED_PENALTY = 50.0F;
+/// Penalty per cell of Manhattan distance between the head and the food.
+constexpr float DISTANCE_WEIGHT = 1.0F;
+/// Value of a lost state; states that die later are preferred.
+constexpr float DEATH_VALUE = -1.0e6F;
+/// Value of every fruit eaten during a rollout.
+constexpr float ROLLOUT_FOOD_WEIGHT = 50.0F;
+/// Penalty for rollouts that end in a collision.
+constexpr float ROLLOUT_DEATH_PENALTY = 50.0F;
+/// Points scored per fruit.
+constexpr uint16_t FRUIT_SCORE = 10;
+
+constexpr auto DIRECTIONS = std::array<Direction, 4>{Direction::UP, Direction::DOWN, Direction::LEFT, Direction::RIGHT};
+
+auto isOpposite(const Direction first, const Direction second) noexcept -> bool
+{
+  return (first == Direction::UP and second == Direction::DOWN) or
+         (first == Direction::DOWN and second == Direction::UP) or
+         (first == Direction::LEFT and second == Direction::RIGHT) or
+         (first == Direction::RIGHT and second == Direction::LEFT);
+}
+
+auto sigmoid(const float value) noexcept -> float
+{
+  return 1.0F / (1.0F + std::exp(-value));
+}
+
+}  // namespace
+
+NetworkPolicy::NetworkPolicy(std::vector<float> genome, const size_t inputSize, const size_t hiddenSize,
+                             const size_t outputSize)
+  : weights_(std::move(genome)), inputSize_(inputSize), hiddenSize_(hiddenSize), outputSize_(outputSize),
+    hidden_(hiddenSize)
+{
+  if (inputSize_ != std::tuple_size_v<NeuralInputs> or outputSize_ != DIRECTIONS.size())
+  {
+    throw std::invalid_argument("Policy networks must map the game's neural inputs to one output per direction");
+  }
+  if (weights_.size() != (hiddenSize_ * (inputSize_ + 1)) + (outputSize_ * (hiddenSize_ + 1)))
+  {
+    throw std::invalid_argument("Genome size does not match the network shape");
+  }
+}
+
+auto NetworkPolicy::choose(const NeuralInputs& inputs) const -> Direction
+{
+  const auto* weights = weights_.data();
+  for (size_t node = 0; node < hiddenSize_; ++node)
+  {
+    auto sum = *weights++;
+    for (const auto input : inputs)
+    {
+      sum += *weights++ * input;
+    }
+    hidden_[node] = sigmoid(sum);
+  }
+
+  // The output sigmoid is monotonic, so the largest weighted sum wins.
+  auto best    = size_t{0};
+  auto bestSum = -std::numeric_limits<float>::infinity();
+  for (size_t node = 0; node < outputSize_; ++node)
+  {
+    auto sum = *weights++;
+    for (const auto hidden : hidden_)
+    {
+      sum += *weights++ * hidden;
+    }
+    if (sum > bestSum)
+    {
+      best    = node;
+      bestSum = sum;
+    }
+  }
+
+  return DIRECTIONS.at(best);
+}
+
+SearchController::SearchController(const SearchConfig config)
+  : config_(config), simulation_({DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT}, false),
+    stats_{.nodes = 0, .depth = 0, .elapsedMs = 0.0, .value = 0.0F}
+{
+  config_.beamWidth = std::max(config_.beamWidth, 1U);
+  beam_.resize(static_cast<size_t>(config_.beamWidth) * (DIRECTIONS.size() - 1));
+  candidates_.resize(beam_.size());
+}
+
+void SearchController::setPolicy(std::optional<NetworkPolicy> policy)
+{
+  policy_ = std::move(policy);
+}
+
+auto SearchController::decide(const GameSnapshot& state) -> Direction
+{
+  const auto start = Clock::now();
+  stats_           = {.nodes = 0, .depth = 0, .elapsedMs = 0.0, .value = 0.0F};
+
+  if (state.gameState != GameState::PLAYING or state.snakeBody.empty())
+  {
+    return state.snakeDirection;
+  }
+
+  const auto budgetSpent = [&]() -> bool
+  {
+    if (config_.nodeBudget != 0 and stats_.nodes >= config_.nodeBudget)
+    {
+      return true;
+    }
+    return config_.timeBudgetMs > 0.0 and
+           std::chrono::duration<double, std::milli>(Clock::now() - start).count() >= config_.timeBudgetMs;
+  };
+
+  beam_[0].state     = state;
+  beam_[0].firstMove = state.snakeDirection;
+  beam_[0].alive     = true;
+  beam_[0].value     = 0.0F;
+
+  auto beamSize = size_t{1};
+  auto bestMove = state.snakeDirection;
+
+  for (uint32_t depth = 1; depth <= config_.maxDepth; ++depth)
+  {
+    auto candidateCount = size_t{0};
+    auto complete       = true;
+
+    for (size_t i = 0; i < beamSize and complete; ++i)
+    {
+      const auto& parent = beam_[i];
+      if (not parent.alive)
+      {
+        continue;
+      }
+
+      for (const auto direction : DIRECTIONS)
+      {
+        if (isOpposite(direction, parent.state.snakeDirection))
+        {
+          continue;
+        }
+        // The first depth is always searched, so there is always a move to play.
+        if (depth > 1 and budgetSpent())
+        {
+          complete = false;
+          break;
+        }
+
+        simulation_.loadState(parent.state);
+        const auto result = simulation_.step(direction);
+        ++stats_.nodes;
+
+        auto& child     = candidates_[candidateCount++];
+        child.firstMove = depth == 1 ? direction : parent.firstMove;
+        child.alive     = not result.isGameOver;
+        simulation_.saveState(child.state);
+        child.value = evaluate(child.state, child.alive, depth);
+
+        if (child.alive and policy_ and config_.rolloutSteps > 0)
+        {
+          child.value += rollout(child.state);
+        }
+      }
+    }
+
+    if (not complete or candidateCount == 0)
+    {
+      break;
+    }
+
+    beamSize = std::min(candidateCount, static_cast<size_t>(config_.beamWidth));
+    std::partial_sort(candidates_.begin(), candidates_.begin() + static_cast<std::ptrdiff_t>(beamSize),
+                      candidates_.begin() + static_cast<std::ptrdiff_t>(candidateCount),
+                      [](const Node& first, const Node& second) -> bool { return first.value > second.value; });
+    std::swap(beam_, candidates_);
+
+    bestMove     = beam_[0].firstMove;
+    stats_.depth = depth;
+    stats_.value = beam_[0].value;
+    if (not beam_[0].alive)
+    {
+      break;
+    }
+  }
+
+  stats_.elapsedMs = std::chrono::duration<double, std::milli>(Clock::now() - start).count();
+  return bestMove;
+}
+
+auto SearchController::getConfig() const noexcept -> const SearchConfig&
+{
+  return config_;
+}
+
+auto SearchController::getLastStats() const noexcept -> const SearchStats&
+{
+  return stats_;
+}
+
+auto SearchController::evaluate(const GameSnapshot& state, const bool alive, const uint32_t depth) -> float
+{
+  if (not alive)
+  {
+    return DEATH_VALUE + static_cast<float>(depth);
+  }
+
+  const auto head      = state.snakeBody.front();
+  const auto distance  = std::abs(static_cast<int>(head.first) - static_cast<int>(state.foodPosition.first)) +
+                         std::abs(static_cast<int>(head.second) - static_cast<int>(state.foodPosition.second));
+  const auto cells     = static_cast<size_t>(state.boardSize.first) * state.boardSize.second;
+  const auto freeCells = cells > state.snakeBody.size() ? cells - state.snakeBody.size() : 1;
+  const auto reachable = reachableCells(state);
+
+  auto value  = static_cast<float>(state.score / FRUIT_SCORE) * FOOD_WEIGHT;
+  value      -= static_cast<float>(distance) * DISTANCE_WEIGHT;
+  value      += SPACE_WEIGHT * static_cast<float>(reachable) / static_cast<float>(freeCells);
+  if (reachable < state.snakeBody.size())
+  {
+    value -= TRAPPED_PENALTY;
+  }
+  return value;
+}
+
+auto SearchController::rollout(const GameSnapshot& state) -> float
+{
+  simulation_.loadState(state);
+
+  auto inputs = simulation_.getNeuralInputs();
+  auto fruits = 0U;
+  for (uint32_t step = 0; step < config_.rolloutSteps; ++step)
+  {
+    const auto result = simulation_.step(policy_->choose(inputs));
+    ++stats_.nodes;
+
+    if (result.isGameOver)
+    {
+      return (static_cast<float>(fruits) * ROLLOUT_FOOD_WEIGHT) - ROLLOUT_DEATH_PENALTY;
+    }
+    fruits += result.fruitPickedUp ? 1U : 0U;
+    inputs  = result.distances;
+  }
+  return static_cast<float>(fruits) * ROLLOUT_FOOD_WEIGHT;
+}
+
+auto SearchController::reachableCells(const GameSnapshot& state) -> uint32_t
+{
+  const auto width = static_cast<size_t>(state.boardSize.first);
+  const auto cells = width * state.boardSize.second;
+  const auto index = [width](const Coordinate position) -> size_t
+  { return (static_cast<size_t>(position.second) * width) + position.first; };
+  const auto onBoard = [&state](const Coordinate position) -> bool
+  { return position.first < state.boardSize.first and position.second < state.boardSize.second; };
+
+  const auto& body = state.snakeBody;
+  if (not onBoard(body.front()))
+  {
+    return 0;
+  }
+
+  blocked_.assign(cells, 0);
+  floodQueue_.resize(cells);
+
+  // The tail moves out of the way on the next step, so it does not block.
+  for (size_t i = 1; i + 1 < body.size(); ++i)
+  {
+    if (onBoard(body[i]))
+    {
+      blocked_[index(body[i])] = 1;
+    }
+  }
+
+  const auto head = index(body.front());
+  blocked_[head]  = 1;
+  floodQueue_[0]  = static_cast<uint32_t>(head);
+
+  auto count = size_t{1};
+  for (size_t read = 0; read < count; ++read)
+  {
+    const auto cell = static_cast<size_t>(floodQueue_[read]);
+    const auto x    = cell % width;
+
+    const auto visit = [&](const size_t next) -> void
+    {
+      if (blocked_[next] == 0)
+      {
+        blocked_[next]       = 1;
+        floodQueue_[count++] = static_cast<uint32_t>(next);
+      }
+    };
+
+    if (x > 0)
+    {
+      visit(cell - 1);
+    }
+    if (x + 1 < width)
+    {
+      visit(cell + 1);
+    }
+    if (cell >= width)
+    {
+      visit(cell - width);
+    }
+    if (cell + width < cells)
+    {
+      visit(cell + width);
+    }
+  }
+
+  return static_cast<uint32_t>(count - 1);
+}
+
+}  // namespace SnakeGame
@@ -0,0 +1,143 @@
+#pragma once
+
+#include "Definitions.hpp"
+#include "Game.hpp"
+
+#include <cstddef>
+#include <cstdint>
+#include <optional>
+#include <vector>
+
+namespace SnakeGame
+{
+
+/**
+ * @brief Feed-forward network used as the rollout policy of a search.
+ *
+ * Mirrors py.training.neural.Neural: one sigmoid hidden layer, with the bias
+ * stored as the first weight of every neuron. The weights are a flat genome as
+ * produced by Neural.to_genome().
+ */
+class NetworkPolicy
+{
+public:
+  /**
+   * @brief Constructs a policy from a flat genome.
+   *
+   * @param genome Hidden layer weights followed by output layer weights.
+   * @param inputSize Number of inputs (the neural inputs of the game).
+   * @param hiddenSize Number of hidden neurons.
+   * @param outputSize Number of outputs, one per direction.
+   * @throws std::invalid_argument If the genome size does not match the shape.
+   */
+  NetworkPolicy(std::vector<float> genome, size_t inputSize, size_t hiddenSize, size_t outputSize);
+
+  /**
+   * @brief Chooses the direction with the highest network output.
+   *
+   * @param inputs Neural inputs of the current state.
+   * @return Direction The chosen direction.
+   */
+  auto choose(const NeuralInputs& inputs) const -> Direction;
+
+private:
+  std::vector<float>         weights_;
+  size_t                     inputSize_;
+  size_t                     hiddenSize_;
+  size_t                     outputSize_;
+  mutable std::vector<float> hidden_;
+};
+
+/**
+ * @brief Budgets and shape of a search.
+ */
+struct SearchConfig
+{
+  uint32_t maxDepth     = 12;     ///< Moves searched ahead.
+  uint32_t beamWidth    = 32;     ///< States kept at every depth.
+  uint32_t nodeBudget   = 20000;  ///< Simulated steps per decision, rollouts included (0: unlimited).
+  double   timeBudgetMs = 0.0;    ///< Wall time per decision in milliseconds (0: unlimited).
+  uint32_t rolloutSteps = 0;      ///< Policy rollout length from every leaf (needs a policy).
+};
+
+/**
+ * @brief Statistics of the last search.
+ */
+struct SearchStats
+{
+  uint32_t nodes;      ///< Simulated steps, rollouts included.
+  uint32_t depth;      ///< Deepest fully searched depth.
+  double   elapsedMs;  ///< Wall time of the search.
+  float    value;      ///< Evaluation of the best state found.
+};
+
+/**
+ * @brief Chooses moves by beam search over simulated engine states.
+ *
+ * Every decision expands the current state move by move on a headless game,
+ * using saveState()/loadState() to branch, and keeps the beamWidth best states
+ * of every depth. States are scored on eaten food, distance to the food and the
+ * free space reachable from the head, optionally after a rollout of the network
+ * policy. The first move of the best state of the deepest complete depth is
+ * played. Snapshots are reused between decisions, so searching does not
+ * allocate once the buffers have grown.
+ */
+class SearchController
+{
+public:
+  /**
+   * @brief Constructs a controller.
+   *
+   * @param config Budgets and shape of the search.
+   */
+  explicit SearchController(SearchConfig config = {});
+
+  /**
+   * @brief Sets the rollout policy, or removes it with std::nullopt.
+   *
+   * @param policy The network to roll out from every leaf.
+   */
+  void setPolicy(std::optional<NetworkPolicy> policy);
+
+  /**
+   * @brief Searches from a state and returns the move to play.
+   *
+   * @param state The current game; food placed during the search follows its random state.
+   * @return Direction The chosen move, or the current direction if the game is not playing.
+   */
+  auto decide(const GameSnapshot& state) -> Direction;
+
+  /**
+   * @brief Gets the budgets and shape of the search.
+   */
+  auto getConfig() const noexcept -> const SearchConfig&;
+
+  /**
+   * @brief Gets the statistics of the last decision.
+   */
+  auto getLastStats() const noexcept -> const SearchStats&;
+
+private:
+  struct Node
+  {
+    GameSnapshot state;
+    Direction    firstMove;
+    float        value;
+    bool         alive;
+  };
+
+  SearchConfig                 config_;
+  std::optional<NetworkPolicy> policy_;
+  Game                         simulation_;
+  std::vector<Node>            beam_;
+  std::vector<Node>            candidates_;
+  std::vector<uint32_t>        floodQueue_;
+  std::vector<uint8_t>         blocked_;
+  SearchStats                  stats_;
+
+  auto evaluate(const GameSnapshot& state, bool alive, uint32_t depth) -> float;
+  auto rollout(const GameSnapshot& state) -> float;
+  auto reachableCells(const GameSnapshot& state) -> uint32_t;
+};
+
+}  // namespace SnakeGame
@@ -10,10 +10,10 @@
 #include <unistd.h>
 
 #include <algorithm>
-#include <array>
 #include <atomic>
 #include <cerrno>
 #include <chrono>
+#include <cstddef>
 #include <cstdint>
 #include <cstring>
 #include <iostream>
@@ -226,38 +226,50 @@ void CommandSocket::handleClient(const int32_t clientFd)
     return;
   }
 
-  if (commandByte > static_cast<uint8_t>(IpcCommands::CHANGE_BOARD_SIZE))
+  if (commandByte > static_cast<uint8_t>(IpcCommands::RETURN_TO_MENU))
   {
     std::cerr << "Invalid command: " << static_cast<int32_t>(commandByte) << '\n';
     return;
   }
 
-  const auto           command = static_cast<IpcCommands>(commandByte);
-  std::vector<uint8_t> payload;
+  const auto           command     = static_cast<IpcCommands>(commandByte);
+  const auto           payloadSize = getPayloadSize(command);
+  std::vector<uint8_t> payload(payloadSize);
 
-  if (command == IpcCommands::CHANGE_BOARD_SIZE)
+  if (payloadSize > 0)
   {
-    std::array<uint8_t, 2> buf{};
-
-    const size_t bytes = recv(clientFd, buf.data(), buf.size(), 0);
-    if (bytes != buf.size())
+    const auto bytes = recv(clientFd, payload.data(), payload.size(), MSG_WAITALL);
+    if (bytes != static_cast<ssize_t>(payload.size()))
     {
-      std::cerr << "Error during reading CHANGE_BOARD_SIZE command\n";
+      std::cerr << "Error during reading payload of command " << static_cast<int32_t>(commandByte) << '\n';
       constexpr auto    nackSize = sizeof(uint8_t);
       constexpr uint8_t nack     = 0;
-      send(clientFd, &nack, nackSize, 0);
+      send(clientFd, &nack, nackSize, MSG_NOSIGNAL);
       return;
     }
-    payload.assign(std::begin(buf), std::end(buf));
   }
 
   if (callback_)
   {
     callback_(command, payload);
   }
+  // A client that hung up must not take the engine down with SIGPIPE.
   constexpr auto    ackSize = sizeof(uint8_t);
   constexpr uint8_t ack     = 1;
-  send(clientFd, &ack, ackSize, 0);
+  send(clientFd, &ack, ackSize, MSG_NOSIGNAL);
+}
+
+auto CommandSocket::getPayloadSize(const IpcCommands command) noexcept -> size_t
+{
+  switch (command)
+  {
+    case IpcCommands::CHANGE_BOARD_SIZE:
+      return 2 * sizeof(uint16_t);
+    case IpcCommands::SET_TICK_RATE:
+      return 1;
+    default:
+      return 0;
+  }
 }
 
 void CommandSocket::copySocketPath(const std::span<char> destinationBuffer, const std::string& source) noexcept
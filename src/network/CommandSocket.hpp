@@ -3,6 +3,7 @@
 #include "Definitions.hpp"
 
 #include <atomic>
+#include <cstddef>
 #include <cstdint>
 #include <memory>
 #include <span>
@@ -70,6 +71,7 @@ private:
   void serverThreadFunction();
   void handleClient(int32_t clientFd);
 
+  static auto getPayloadSize(IpcCommands command) noexcept -> size_t;
   static void copySocketPath(std::span<char> destinationBuffer, const std::string& source) noexcept;
 };
 
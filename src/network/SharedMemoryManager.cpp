@@ -7,72 +7,176 @@
 #include <unistd.h>
 
 #include <algorithm>
+#include <array>
 #include <atomic>
 #include <cerrno>
 #include <chrono>
-#include <cstring>
-#include <memory>
-#include <mutex>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <new>
 #include <string>
-#include <thread>
 #include <utility>
 
 namespace SnakeGame
 {
 
+static_assert(std::atomic<uint64_t>::is_always_lock_free, "Engine stats must be lock-free to live in shared memory");
+
+namespace
+{
+
+/// Whether two states describe the same frame; the body follows from the other fields within a game.
+auto isSameFrame(const GameSharedData& first, const GameSharedData& second) noexcept -> bool
+{
+  return first.gameState == second.gameState and first.tickCount == second.tickCount and
+         first.boardWidth == second.boardWidth and first.boardHeight == second.boardHeight and
+         first.score == second.score and first.speed == second.speed and first.foodPosition == second.foodPosition and
+         first.foodType == second.foodType and first.snakeHead == second.snakeHead and
+         first.snakeLength == second.snakeLength and first.snakeDirection == second.snakeDirection;
+}
+
+/// Rounds a size up to a multiple of an alignment.
+constexpr auto alignUp(const size_t size, const size_t alignment) noexcept -> size_t
+{
+  return (size + alignment - 1) / alignment * alignment;
+}
+
+/// Offset of every SharedField in a frame slot.
+auto frameFieldOffsets() noexcept -> std::array<uint16_t, SHARED_FIELD_COUNT>
+{
+  const auto field = [](const size_t offset) -> uint16_t
+  { return static_cast<uint16_t>(offsetof(SharedFrame, data) + offset); };
+
+  return {
+    static_cast<uint16_t>(offsetof(SharedFrame, sequence)),
+    field(offsetof(GameSharedData, boardWidth)),
+    field(offsetof(GameSharedData, boardHeight)),
+    field(offsetof(GameSharedData, score)),
+    field(offsetof(GameSharedData, speed)),
+    field(offsetof(GameSharedData, gameState)),
+    field(offsetof(GameSharedData, foodPosition)),
+    field(offsetof(GameSharedData, foodType)),
+    field(offsetof(GameSharedData, snakeHead)),
+    field(offsetof(GameSharedData, snakeLength)),
+    field(offsetof(GameSharedData, tickCount)),
+    field(offsetof(GameSharedData, neuralVector)),
+    field(offsetof(GameSharedData, snakeDirection)),
+    static_cast<uint16_t>(sizeof(SharedFrame)),
+  };
+}
+
+}  // namespace
+
 SharedMemoryManager::SharedMemoryManager(std::string shmName)
-  : hasNewData_(false), shouldStopWriter_(false), shmName_(std::move(shmName)), shmFd_(-1), shmPtr_(nullptr),
+  : shmName_(std::move(shmName)), shmFd_(-1), controlPtr_(nullptr), framesPtr_(nullptr), framesMapped_(0),
     initialized_(initializeSharedMemory())
 {
 }
 
 SharedMemoryManager::~SharedMemoryManager()
 {
-  stopAsyncWriter();
   cleanupSharedMemory();
 }
 
-void SharedMemoryManager::startAsyncWriter()
+void SharedMemoryManager::updateGameState(const GameSharedData& data, const std::deque<Coordinate>& snakeBody) noexcept
 {
-  if (not initialized_ or writerThread_ != nullptr)
+  if (not initialized_)
+  {
+    return;
+  }
+
+  auto* header = getHeader();
+  if ((data.boardWidth != header->boardWidth or data.boardHeight != header->boardHeight) and
+      not layoutFrames({data.boardWidth, data.boardHeight}))
+  {
+    return;
+  }
+
+  // Idle loops republish the same state; keeping it out of the ring preserves the history of the last game.
+  const auto newest = header->version.load(std::memory_order_relaxed);
+  if (const auto* last = getFrame(newest);
+      newest != 0 and last->sequence.load(std::memory_order_relaxed) == newest and isSameFrame(last->data, data))
   {
     return;
   }
 
-  shouldStopWriter_ = false;
-  writerThread_     = std::make_unique<std::thread>(&SharedMemoryManager::writerThreadFunction, this);
+  // Version 0 marks a slot being written, so it is skipped when the counter wraps.
+  auto version = newest + 1;
+  if (version == 0)
+  {
+    version = 1;
+  }
+  auto* frame = getFrame(version);
+
+  frame->sequence.store(0, std::memory_order_relaxed);
+  std::atomic_thread_fence(std::memory_order_release);
+
+  frame->data       = data;
+  const auto length = std::min(snakeBody.size(), static_cast<size_t>(header->bodyCapacity));
+  std::copy_n(snakeBody.begin(), length, reinterpret_cast<Coordinate*>(frame + 1));
+
+  frame->sequence.store(version, std::memory_order_release);
+  header->version.store(version, std::memory_order_release);
+  getStats()->shmWrites.fetch_add(1, std::memory_order_relaxed);
 }
 
-void SharedMemoryManager::stopAsyncWriter()
+void SharedMemoryManager::recordTick(const std::chrono::microseconds duration, const bool late,
+                                     const uint64_t skipped) noexcept
 {
-  if (writerThread_ == nullptr)
+  auto* stats = getStats();
+  if (stats == nullptr)
   {
     return;
   }
 
-  shouldStopWriter_ = true;
+  const auto durationUs = static_cast<uint64_t>(std::max<int64_t>(duration.count(), 0));
+  const auto bucket = std::ranges::upper_bound(TICK_HISTOGRAM_BOUNDS_US, durationUs) - TICK_HISTOGRAM_BOUNDS_US.begin();
 
-  if (writerThread_->joinable())
+  stats->ticks.fetch_add(1, std::memory_order_relaxed);
+  stats->tickDurationHistogram.at(static_cast<size_t>(bucket)).fetch_add(1, std::memory_order_relaxed);
+  if (late)
   {
-    writerThread_->join();
+    stats->lateTicks.fetch_add(1, std::memory_order_relaxed);
+  }
+  if (skipped > 0)
+  {
+    stats->skippedTicks.fetch_add(skipped, std::memory_order_relaxed);
   }
-
-  writerThread_.reset();
 }
 
-void SharedMemoryManager::updateGameState(const GameSharedData& data) noexcept
+void SharedMemoryManager::recordCommand(const std::chrono::microseconds latency) noexcept
 {
-  if (not initialized_)
+  auto* stats = getStats();
+  if (stats == nullptr)
   {
     return;
   }
 
+  const auto latencyUs = static_cast<uint64_t>(std::max<int64_t>(latency.count(), 0));
+
+  stats->commandsProcessed.fetch_add(1, std::memory_order_relaxed);
+  stats->commandLatencyTotalUs.fetch_add(latencyUs, std::memory_order_relaxed);
+  if (latencyUs > stats->commandLatencyMaxUs.load(std::memory_order_relaxed))
+  {
+    stats->commandLatencyMaxUs.store(latencyUs, std::memory_order_relaxed);
+  }
+}
+
+void SharedMemoryManager::recordOverwrittenCommand() noexcept
+{
+  if (auto* stats = getStats(); stats != nullptr)
   {
-    const std::lock_guard<std::mutex> lock(bufferMutex_);
-    writeBuffer_ = data;
+    stats->commandsOverwritten.fetch_add(1, std::memory_order_relaxed);
   }
+}
 
-  hasNewData_.store(true, std::memory_order_release);
+void SharedMemoryManager::markReady() noexcept
+{
+  if (initialized_)
+  {
+    getHeader()->enginePid.store(static_cast<uint32_t>(getpid()), std::memory_order_release);
+  }
 }
 
 auto SharedMemoryManager::isInitialized() const noexcept -> bool
@@ -90,95 +194,144 @@ auto SharedMemoryManager::initializeSharedMemory() -> bool
     return false;
   }
 
-  if (ftruncate(shmFd_, static_cast<off_t>(SHARED_MEMORY_SIZE)) == -1)
+  // The header and stats get their own mapping, which stays valid while the frame ring is remapped.
+  const auto statsOffset = alignUp(sizeof(SharedMemoryHeader), alignof(EngineStats));
+  const auto controlSize = alignUp(statsOffset + sizeof(EngineStats), static_cast<size_t>(sysconf(_SC_PAGESIZE)));
+
+  if (ftruncate(shmFd_, static_cast<off_t>(controlSize)) == -1)
   {
-    close(shmFd_);
-    shm_unlink(shmName_.c_str());
+    cleanupSharedMemory();
     return false;
   }
 
-  shmPtr_ = mmap(nullptr, SHARED_MEMORY_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED, shmFd_, 0);
-  if (shmPtr_ == MAP_FAILED)
+  controlPtr_ = mmap(nullptr, controlSize, PROT_READ | PROT_WRITE, MAP_SHARED, shmFd_, 0);
+  if (controlPtr_ == MAP_FAILED)
   {
-    close(shmFd_);
-    shm_unlink(shmName_.c_str());
+    controlPtr_ = nullptr;
+    cleanupSharedMemory();
     return false;
   }
 
-  auto* shmData = static_cast<SharedMemoryData*>(shmPtr_);
-  new (shmData) SharedMemoryData();
+  auto* header         = new (controlPtr_) SharedMemoryHeader();
+  header->regionSize   = controlSize;
+  header->statsOffset  = static_cast<uint32_t>(statsOffset);
+  header->framesOffset = static_cast<uint32_t>(controlSize);
+  header->fieldOffsets = frameFieldOffsets();
+  new (static_cast<std::byte*>(controlPtr_) + statsOffset) EngineStats();
 
+  if (not layoutFrames({DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT}))
+  {
+    cleanupSharedMemory();
+    return false;
+  }
   return true;
 }
 
-void SharedMemoryManager::cleanupSharedMemory() noexcept
+auto SharedMemoryManager::getHeader() noexcept -> SharedMemoryHeader*
 {
-  if (shmPtr_ != nullptr and shmPtr_ != MAP_FAILED)
-  {
-    munmap(shmPtr_, SHARED_MEMORY_SIZE);
-    shmPtr_ = nullptr;
-  }
+  return static_cast<SharedMemoryHeader*>(controlPtr_);
+}
 
-  if (shmFd_ != -1)
+auto SharedMemoryManager::getStats() noexcept -> EngineStats*
+{
+  if (not initialized_ or controlPtr_ == nullptr)
   {
-    close(shmFd_);
-    shmFd_ = -1;
+    return nullptr;
   }
+  return reinterpret_cast<EngineStats*>(static_cast<std::byte*>(controlPtr_) + getHeader()->statsOffset);
+}
 
-  shm_unlink(shmName_.c_str());
+auto SharedMemoryManager::getFrame(const uint32_t version) noexcept -> SharedFrame*
+{
+  const auto* header = getHeader();
+  const auto  offset = static_cast<size_t>(version % header->frameCount) * header->frameSize;
+  return reinterpret_cast<SharedFrame*>(static_cast<std::byte*>(framesPtr_) + offset);
 }
 
-void SharedMemoryManager::writerThreadFunction()
+auto SharedMemoryManager::layoutFrames(const BoardDimensions boardSize) noexcept -> bool
 {
-  while (not shouldStopWriter_.load(std::memory_order_acquire))
+  const auto capacity  = static_cast<size_t>(boardSize.first) * boardSize.second;
+  const auto frameSize = alignUp(sizeof(SharedFrame) + (capacity * sizeof(Coordinate)), alignof(SharedFrame));
+  const auto frameCount =
+    std::clamp(SHARED_FRAME_RING_BUDGET / frameSize, size_t{SHARED_FRAME_HISTORY_MIN}, size_t{SHARED_FRAME_HISTORY});
+  if (not mapFrames(frameSize * frameCount))
   {
-    if (hasNewData_.load(std::memory_order_acquire))
-    {
-      GameSharedData dataToWrite{};
-      {
-        const std::lock_guard<std::mutex> lock(bufferMutex_);
-        dataToWrite = writeBuffer_;
-      }
-      hasNewData_.store(false, std::memory_order_release);
-      writeToSharedMemory(dataToWrite);
-    }
+    return false;
+  }
 
-    std::this_thread::sleep_for(std::chrono::microseconds(SHARED_MEMORY_WRITE_DELAY));
+  auto*      header     = getHeader();
+  const auto generation = header->layoutGeneration.load(std::memory_order_relaxed);
+  header->layoutGeneration.store(generation + 1, std::memory_order_relaxed);
+  std::atomic_thread_fence(std::memory_order_release);
+
+  header->frameCount   = static_cast<uint32_t>(frameCount);
+  header->frameSize    = static_cast<uint32_t>(frameSize);
+  header->bodyCapacity = static_cast<uint32_t>(capacity);
+  header->boardWidth   = boardSize.first;
+  header->boardHeight  = boardSize.second;
+  for (uint32_t slot = 0; slot < header->frameCount; ++slot)
+  {
+    new (getFrame(slot)) SharedFrame();
   }
+
+  header->layoutGeneration.store(generation + 2, std::memory_order_release);
+  return true;
 }
 
-void SharedMemoryManager::writeToSharedMemory(const GameSharedData& data) noexcept
+auto SharedMemoryManager::mapFrames(const size_t size) noexcept -> bool
 {
-  if (shmPtr_ == nullptr or shmPtr_ == MAP_FAILED)
+  if (size <= framesMapped_)
   {
-    return;
+    return true;
   }
 
-  auto* shmData = static_cast<SharedMemoryData*>(shmPtr_);
+  // The region never shrinks, so readers that mapped it earlier keep a valid mapping.
+  auto*      header     = getHeader();
+  const auto regionSize = static_cast<size_t>(header->framesOffset) + size;
+  if (regionSize > header->regionSize and ftruncate(shmFd_, static_cast<off_t>(regionSize)) == -1)
+  {
+    return false;
+  }
 
-  bool expected = false;
-  if (not shmData->isWriting.compare_exchange_strong(expected, true, std::memory_order_acquire))
+  auto* frames = mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_SHARED, shmFd_, header->framesOffset);
+  if (frames == MAP_FAILED)
   {
-    return;
+    return false;
   }
 
-  shmData->gameData.boardWidth     = data.boardWidth;
-  shmData->gameData.boardHeight    = data.boardHeight;
-  shmData->gameData.score          = data.score;
-  shmData->gameData.speed          = data.speed;
-  shmData->gameData.gameState      = data.gameState;
-  shmData->gameData.foodPosition   = data.foodPosition;
-  shmData->gameData.foodType       = data.foodType;
-  shmData->gameData.snakeHead      = data.snakeHead;
-  shmData->gameData.snakeLength    = data.snakeLength;
-  shmData->gameData.neuralVector   = data.neuralVector;
-  shmData->gameData.snakeDirection = data.snakeDirection;
+  if (framesPtr_ != nullptr)
+  {
+    munmap(framesPtr_, framesMapped_);
+  }
+  framesPtr_         = frames;
+  framesMapped_      = size;
+  header->regionSize = std::max<uint64_t>(header->regionSize, regionSize);
+  return true;
+}
 
-  const auto copyLength = std::min(data.snakeLength, SNAKE_MAX_LENGTH);
-  std::copy_n(data.snakeBody.begin(), copyLength, shmData->gameData.snakeBody.begin());
+void SharedMemoryManager::cleanupSharedMemory() noexcept
+{
+  if (framesPtr_ != nullptr)
+  {
+    munmap(framesPtr_, framesMapped_);
+    framesPtr_    = nullptr;
+    framesMapped_ = 0;
+  }
 
-  shmData->version.fetch_add(1, std::memory_order_release);
-  shmData->isWriting.store(false, std::memory_order_release);
+  if (controlPtr_ != nullptr)
+  {
+    getHeader()->enginePid.store(0, std::memory_order_release);
+    munmap(controlPtr_, getHeader()->framesOffset);
+    controlPtr_ = nullptr;
+  }
+
+  if (shmFd_ != -1)
+  {
+    close(shmFd_);
+    shmFd_ = -1;
+  }
+
+  shm_unlink(shmName_.c_str());
 }
 
 }  // namespace SnakeGame
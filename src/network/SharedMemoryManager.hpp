@@ -2,12 +2,11 @@
 
 #include "Definitions.hpp"
 
-#include <atomic>
+#include <chrono>
+#include <cstddef>
 #include <cstdint>
-#include <memory>
-#include <mutex>
+#include <deque>
 #include <string>
-#include <thread>
 
 namespace SnakeGame
 {
@@ -15,9 +14,12 @@ namespace SnakeGame
 /**
  * @brief Manages POSIX shared memory for game state communication.
  *
- * This class creates and manages a shared memory region, providing thread-safe
- * asynchronous writes to prevent blocking the main game loop. Uses double-buffering
- * and atomic synchronization to ensure data consistency.
+ * This class creates and manages a shared memory region that starts with a
+ * SharedMemoryHeader describing its layout, followed by the engine stats and a
+ * ring of the latest SHARED_FRAME_HISTORY frames sized for the current board.
+ * Every published game state is written into its own slot under a per-slot
+ * sequence number, so publishing never blocks on readers and readers slower
+ * than the game loop can still fetch every recent tick.
  */
 class SharedMemoryManager
 {
@@ -36,26 +38,43 @@ public:
   auto operator=(SharedMemoryManager&& other) -> SharedMemoryManager      = delete;
 
   /**
-   * @brief Starts the background writer thread.
+   * @brief Publishes a game state as the next frame of the ring.
    *
-   * The writer thread periodically flushes buffered game state to shared memory.
+   * Only the snake body is copied after the fixed fields, and a state equal to
+   * the newest frame is not published again. The slot's sequence is cleared
+   * while it is written, so readers skip a frame that is being replaced. A new
+   * board size lays the frame ring out again, growing the region if needed.
+   *
+   * @param data The new game state.
+   * @param snakeBody Body coordinates of the snake, head first.
    */
-  void startAsyncWriter();
+  void updateGameState(const GameSharedData& data, const std::deque<Coordinate>& snakeBody) noexcept;
 
   /**
-   * @brief Stops the background writer thread and waits for it to finish.
+   * @brief Records one simulated tick in the engine stats.
+   *
+   * @param duration Time spent updating the game and publishing its state.
+   * @param late Whether the next tick was already due when this one finished.
+   * @param skipped Overdue tick deadlines the game loop dropped after this tick.
    */
-  void stopAsyncWriter();
+  void recordTick(std::chrono::microseconds duration, bool late, uint64_t skipped) noexcept;
 
   /**
-   * @brief Updates the internal buffer with new game state data.
-   *
-   * This method is thread-safe and does not block. The data will be written
-   * to shared memory asynchronously by the writer thread.
+   * @brief Records a socket command applied by the game loop.
    *
-   * @param data The new game state to buffer.
+   * @param latency Time between receiving the command and applying it.
+   */
+  void recordCommand(std::chrono::microseconds latency) noexcept;
+
+  /**
+   * @brief Records a command that was replaced by a newer one before being applied.
+   */
+  void recordOverwrittenCommand() noexcept;
+
+  /**
+   * @brief Announces that the engine accepts commands by publishing its process ID in the header.
    */
-  void updateGameState(const GameSharedData& data) noexcept;
+  void markReady() noexcept;
 
   /**
    * @brief Checks if shared memory was successfully initialized.
@@ -66,21 +85,21 @@ public:
   auto isInitialized() const noexcept -> bool;
 
 private:
-  GameSharedData               writeBuffer_;
-  std::mutex                   bufferMutex_;
-  std::atomic<bool>            hasNewData_;
-  std::unique_ptr<std::thread> writerThread_;
-  std::atomic<bool>            shouldStopWriter_;
-  std::string                  shmName_;
+  std::string shmName_;
 
   int32_t shmFd_;
-  void*   shmPtr_;
+  void*   controlPtr_;
+  void*   framesPtr_;
+  size_t  framesMapped_;
   bool    initialized_;
 
   auto initializeSharedMemory() -> bool;
+  auto getHeader() noexcept -> SharedMemoryHeader*;
+  auto getStats() noexcept -> EngineStats*;
+  auto getFrame(uint32_t version) noexcept -> SharedFrame*;
+  auto layoutFrames(BoardDimensions boardSize) noexcept -> bool;
+  auto mapFrames(size_t size) noexcept -> bool;
   void cleanupSharedMemory() noexcept;
-  void writerThreadFunction();
-  void writeToSharedMemory(const GameSharedData& data) noexcept;
 };
 
 }  // namespace SnakeGame